@@ -2,6 +2,12 @@ import mysql.connector
 from mysql.connector import pooling, Error
 import threading
 
+# Size of the app's MySQL pool. get_connection returns None at once when the pool is empty, so it
+# must cover every thread that can hold a connection at the same time:
+#   UI thread (1) + RatingAggregateFlusher (1) + gui.workers.MAX_SERVICE_THREADS (4)
+#   + movie_detail_service.DETAIL_LOAD_THREADS (4) = 10
+MYSQL_POOL_SIZE = 10
+
 class MySQLConnectionManager:
     """Thread-safe singleton for MySQL connection pool management"""
     _instance = None
@@ -13,9 +19,16 @@ class MySQLConnectionManager:
             with cls._lock:
                 if cls._instance is None:
                     cls._instance = super(MySQLConnectionManager, cls).__new__(cls)
+                    cls._instance._shutdown_hooks = []
         return cls._instance
+
+    def register_shutdown_hook(self, hook):
+        """Registers a callable to run before the pool is shut down (e.g. to flush buffered writes)"""
+        with self._lock:
+            if hook not in self._shutdown_hooks:
+                self._shutdown_hooks.append(hook)
     
-    def initialize_pool(self, pool_name='myapp_pool', pool_size=10):
+    def initialize_pool(self, pool_name='myapp_pool', pool_size=MYSQL_POOL_SIZE):
         """Initialize MySQL connection pool (call once at app startup)"""
         if self._pool is not None:
             print("MySQL pool already initialized")
@@ -58,6 +71,14 @@ class MySQLConnectionManager:
     
     def shutdown_pool(self):
         """Closes all connections in pool (call on app shutdown)"""
+        # Hooks still need working connections, so run them before dropping the pool
+        with self._lock:
+            hooks = list(self._shutdown_hooks)
+        for hook in hooks:
+            try:
+                hook()
+            except Exception as e:
+                print(f"Error running MySQL shutdown hook: {e}")
         if self._pool:
             self._pool = None
             print("MySQL connection pool shutdown")
@@ -65,7 +86,7 @@ class MySQLConnectionManager:
 # Global singleton instance and convenience functions for backward compatibility
 _manager = MySQLConnectionManager()
 
-def initialize_mysql_pool(pool_size=10):
+def initialize_mysql_pool(pool_size=MYSQL_POOL_SIZE):
     """Initialize MySQL connection pool (convenience function)"""
     return _manager.initialize_pool(pool_size=pool_size)
 
@@ -0,0 +1,4 @@
+-- 001: Composite index backing the home page ordering (releaseDate DESC, tmdbID DESC).
+-- Lets keyset pagination seek directly to the boundary row instead of scanning and
+-- discarding every earlier row the way LIMIT ... OFFSET does.
+CREATE INDEX idx_movies_release_date ON Movies (releaseDate, tmdbID);
@@ -0,0 +1,7 @@
+-- 002: Indexed release year for sargable year filtering.
+-- Search filters used YEAR(m.releaseDate), which hides the column from every index.
+-- The generated column keeps itself in sync with releaseDate, and its index also
+-- serves GET_DISTINCT_YEARS with a loose index scan.
+ALTER TABLE Movies
+  ADD COLUMN releaseYear smallint GENERATED ALWAYS AS (YEAR(releaseDate)) STORED,
+  ADD INDEX idx_movies_release_year (releaseYear);
@@ -0,0 +1,8 @@
+-- 003: Indexed average rating for min_avg_rating filtering and "sort by rating".
+-- The generated column is recomputed by MySQL whenever totalRatings/countRatings change,
+-- replacing the per-row CASE expression that no index could serve.
+ALTER TABLE Movies
+  ADD COLUMN avgRating double GENERATED ALWAYS AS (
+    CASE WHEN countRatings > 0 THEN totalRatings / countRatings ELSE 0 END
+  ) STORED NOT NULL,
+  ADD INDEX idx_movies_avg_rating (avgRating, tmdbID);
@@ -0,0 +1,67 @@
+# database/migrations/004_cast_crew_name_search.py
+"""Backfills name_norm/name_tokens on MovieCastLink and MovieCrewLink and applies the index manifest.
+
+New cast/crew documents get these fields on write; this script covers documents created
+before that. Safe to re-run: only documents missing name_norm are touched unless --all is given.
+
+Usage:
+    python -m database.migrations.004_cast_crew_name_search [--all] [--batch-size N]
+"""
+
+import argparse
+import sys
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from database.db_mongo_connection import MongoConnectionManager
+from database.mongo_indexes import ensure_indexes
+from database.repositories.cast_crew_repository import person_name_fields
+
+COLLECTIONS = ("MovieCastLink", "MovieCrewLink")
+
+
+def backfill_collection(collection, batch_size, rewrite_all=False):
+    """Sets the derived name fields on every document that lacks them; returns the number updated."""
+    query = {} if rewrite_all else {"name_norm": {"$exists": False}}
+    updated = 0
+    batch = []
+    for doc in collection.find(query, {"name": 1}):
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": person_name_fields(doc.get("name"))}))
+        if len(batch) >= batch_size:
+            updated += collection.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        updated += collection.bulk_write(batch, ordered=False).modified_count
+    return updated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill normalized cast/crew name fields and their indexes.")
+    parser.add_argument("--all", action="store_true", help="recompute the fields on every document")
+    parser.add_argument("--batch-size", type=int, default=1000, help="documents per bulk write (default 1000)")
+    args = parser.parse_args(argv)
+
+    mongo_manager = MongoConnectionManager()
+    db = mongo_manager.get_database()
+    if db is None:
+        print("MongoDB connection not available.")
+        return 1
+
+    try:
+        for name in COLLECTIONS:
+            collection = db[name]
+            updated = backfill_collection(collection, max(1, args.batch_size), rewrite_all=args.all)
+            print(f"{name}: updated {updated} documents")
+        # Also creates the name_norm/name_tokens indexes
+        ensure_indexes(db)
+    except PyMongoError as e:
+        print(f"Error backfilling cast/crew name fields: {e}")
+        return 1
+    finally:
+        mongo_manager.close_connection()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# database/migrations/005_embedded_movie_credits.py
+"""Builds the embedded MovieCredits collection (one document per movie) from MovieCastLink/MovieCrewLink.
+
+The linked collections are left untouched and stay the source of truth: while the embedded layout
+is active, CastCrewRepository writes every change to both layouts. So the layout can be switched
+back with CastCrewRepository().set_layout(...), and the migration is safe to re-run: it rebuilds
+the whole collection from the linked collections ($group) and swaps it in atomically with $out,
+which keeps the existing indexes. Movies without linked credits get no document (read as empty),
+and anything written to MovieCredits directly (bypassing CastCrewRepository) is dropped by a re-run.
+Run 004_cast_crew_name_search first so the embedded credits carry name_norm/name_tokens.
+
+Usage:
+    python -m database.migrations.005_embedded_movie_credits
+"""
+
+import sys
+
+from pymongo.errors import PyMongoError
+
+from database.db_mongo_connection import MongoConnectionManager
+from database.mongo_indexes import ensure_indexes, manifest_for_layout
+from database.repositories.embedded_credits_repository import MOVIE_CREDITS_COLLECTION
+
+
+CAST_FIELDS = ("name", "character", "name_norm", "name_tokens")
+CREW_FIELDS = ("name", "job", "department", "name_norm", "name_tokens")
+
+
+def _credit_rows(kind, credit_fields):
+    """Projects link documents to sortable rows tagged with their kind."""
+    return {"$project": {
+        "_id": 0, "tmdbID": 1, "order": 1, "link_id": "$_id", "kind": {"$literal": kind},
+        **{field: 1 for field in credit_fields},
+    }}
+
+
+def _credit_array(kind, credit_fields):
+    """Picks one kind's rows out of the grouped credits, keeping only the embedded fields."""
+    return {"$map": {
+        "input": {"$filter": {"input": "$credits", "cond": {"$eq": ["$$this.kind", kind]}}},
+        "in": {field: f"$$this.{field}" for field in credit_fields},
+    }}
+
+
+def embed_pipeline():
+    """Builds every movie's cast[]/crew[] document from both link collections and replaces MovieCredits with them ($out)."""
+    return [
+        _credit_rows("cast", CAST_FIELDS),
+        {"$unionWith": {"coll": "MovieCrewLink", "pipeline": [_credit_rows("crew", CREW_FIELDS)]}},
+        {"$sort": {"tmdbID": 1, "order": 1, "link_id": 1}},  # Keep each movie's credits in billing order
+        {"$group": {"_id": "$tmdbID", "credits": {"$push": "$$ROOT"}}},
+        {"$project": {
+            "tmdbID": "$_id",
+            "cast": _credit_array("cast", CAST_FIELDS),
+            "crew": _credit_array("crew", CREW_FIELDS),
+        }},
+        {"$out": MOVIE_CREDITS_COLLECTION},
+    ]
+
+
+def main(argv=None):
+    mongo_manager = MongoConnectionManager()
+    db = mongo_manager.get_database()
+    if db is None:
+        print("MongoDB connection not available.")
+        return 1
+
+    try:
+        db["MovieCastLink"].aggregate(embed_pipeline(), allowDiskUse=True)
+        ensure_indexes(db, manifest_for_layout(embedded=True))
+        print(f"{MOVIE_CREDITS_COLLECTION}: {db[MOVIE_CREDITS_COLLECTION].estimated_document_count()} movie documents")
+    except PyMongoError as e:
+        print(f"Error building embedded movie credits: {e}")
+        return 1
+    finally:
+        mongo_manager.close_connection()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
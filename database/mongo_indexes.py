@@ -0,0 +1,195 @@
+# database/mongo_indexes.py
+"""Index manifest for the MongoDB collections, with idempotent bootstrap and verification.
+
+Run it (or the migrations that call it) after deploying, not from the app: creating indexes
+on Atlas can take a while.
+
+Usage:
+    python -m database.mongo_indexes              # apply the manifest, then verify
+    python -m database.mongo_indexes --verify     # only report missing/unused indexes and collection scans
+    python -m database.mongo_indexes --embedded   # also cover MovieCredits (embedded credits layout)
+"""
+
+import argparse
+import sys
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+# Every index the repositories rely on, per collection: name -> key list (see manifest_for_layout).
+# The names are MongoDB's default names, so indexes created by hand are recognized.
+INDEX_MANIFEST = {
+    "MovieCastLink": {
+        "tmdbID_1": [("tmdbID", ASCENDING)],
+        "tmdbID_1_name_1": [("tmdbID", ASCENDING), ("name", ASCENDING)],
+        "name_norm_1": [("name_norm", ASCENDING)],
+        "name_tokens_1": [("name_tokens", ASCENDING)],
+    },
+    "MovieCrewLink": {
+        "tmdbID_1": [("tmdbID", ASCENDING)],
+        "tmdbID_1_job_1": [("tmdbID", ASCENDING), ("job", ASCENDING)],
+        "tmdbID_1_name_1": [("tmdbID", ASCENDING), ("name", ASCENDING)],
+        "name_norm_1": [("name_norm", ASCENDING)],
+        "name_tokens_1": [("name_tokens", ASCENDING)],
+    },
+    # Embedded layout (one document per movie, _id = tmdbID); only the name searches need extra indexes
+    "MovieCredits": {
+        "cast.name_tokens_1": [("cast.name_tokens", ASCENDING)],
+        "cast.name_norm_1": [("cast.name_norm", ASCENDING)],
+        "crew.name_tokens_1": [("crew.name_tokens", ASCENDING)],
+        "crew.name_norm_1": [("crew.name_norm", ASCENDING)],
+    },
+}
+
+# Collections that only the embedded credits layout uses
+EMBEDDED_LAYOUT_COLLECTIONS = ("MovieCredits",)
+
+# Representative filters of the repository queries; each must be answered from an index
+PROBE_QUERIES = {
+    "MovieCastLink": [
+        {"tmdbID": 0},                                     # get_cast_for_movie, delete_all_cast_for_movie
+        {"tmdbID": 0, "name": ""},                         # add/update/delete_cast_member
+        {"name_tokens": {"$regex": "^a"}},                 # find_tmdbids_by_cast (token mode)
+        {"name_norm": {"$regex": "^a"}},                   # find_tmdbids_by_cast (prefix mode)
+    ],
+    "MovieCrewLink": [
+        {"tmdbID": 0},                                     # get_crew_for_movie, delete_all_crew_for_movie
+        {"tmdbID": 0, "job": "Director"},                  # get_director_for_movie
+        {"tmdbID": 0, "name": "", "job": ""},              # add/update/delete_crew_member
+        {"name_tokens": {"$regex": "^a"}},                 # find_tmdbids_by_crew (token mode)
+        {"name_norm": {"$regex": "^a"}},                   # find_tmdbids_by_crew (prefix mode)
+    ],
+    "MovieCredits": [
+        {"_id": 0},                                                           # reads of the embedded layout
+        {"cast": {"$elemMatch": {"$and": [{"name_tokens": {"$regex": "^a"}}]}}},  # cast search (token mode)
+        {"crew": {"$elemMatch": {"$and": [{"name_tokens": {"$regex": "^a"}}]}}},  # crew search (token mode)
+    ],
+}
+
+
+def manifest_for_layout(embedded=False):
+    """Returns the part of INDEX_MANIFEST in use: MovieCredits only with the embedded credits layout.
+
+    The linked collections are always included, since the embedded layout writes them too.
+    """
+    return {
+        collection_name: indexes for collection_name, indexes in INDEX_MANIFEST.items()
+        if embedded or collection_name not in EMBEDDED_LAYOUT_COLLECTIONS
+    }
+
+
+def ensure_indexes(db, manifest=None):
+    """Creates every manifest index that does not exist yet (safe to re-run).
+
+    Returns:
+        dict: collection name -> {'created': [...], 'existing': [...], 'errors': [...]}
+    """
+    manifest = manifest or manifest_for_layout()
+    report = {}
+    for collection_name, indexes in manifest.items():
+        collection = db[collection_name]
+        entry = {"created": [], "existing": [], "errors": []}
+        try:
+            existing = set(collection.index_information())
+        except PyMongoError as e:
+            entry["errors"].append(str(e))
+            report[collection_name] = entry
+            continue
+        to_create = [IndexModel(keys, name=name) for name, keys in indexes.items() if name not in existing]
+        entry["existing"] = [name for name in indexes if name in existing]
+        if to_create:
+            try:
+                entry["created"] = collection.create_indexes(to_create)
+            except PyMongoError as e:
+                entry["errors"].append(str(e))
+        report[collection_name] = entry
+        print(f"DEBUG: ensure_indexes {collection_name}: created {entry['created']}, existing {entry['existing']}")
+    return report
+
+
+def _plan_stages(plan):
+    """Yields every stage name in an explain() plan tree."""
+    if not isinstance(plan, dict):
+        return
+    if "stage" in plan:
+        yield plan["stage"]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from _plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _plan_stages(child)
+
+
+def verify_indexes(db, manifest=None, probes=None):
+    """Reports manifest indexes that are missing, indexes that were never used, and probe queries that scan.
+
+    Unused indexes come from $indexStats (usage since the server last restarted); collection
+    scans come from explain() of the probe queries, so they are caught without production traffic.
+
+    Returns:
+        dict: collection name -> {'missing': [...], 'unused': [...], 'unexpected': [...], 'collscans': [...]}
+    """
+    manifest = manifest or manifest_for_layout()
+    probes = probes or PROBE_QUERIES
+    report = {}
+    for collection_name, indexes in manifest.items():
+        collection = db[collection_name]
+        entry = {"missing": [], "unused": [], "unexpected": [], "collscans": [], "errors": []}
+        try:
+            existing = set(collection.index_information())
+            entry["missing"] = [name for name in indexes if name not in existing]
+            entry["unexpected"] = sorted(name for name in existing if name not in indexes and name != "_id_")
+
+            for stats in collection.aggregate([{"$indexStats": {}}]):
+                if stats["name"] != "_id_" and stats.get("accesses", {}).get("ops", 0) == 0:
+                    entry["unused"].append(stats["name"])
+            entry["unused"].sort()
+
+            for query in probes.get(collection_name, []):
+                explain = collection.find(query).explain()
+                winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+                if "COLLSCAN" in set(_plan_stages(winning_plan)):
+                    entry["collscans"].append(query)
+        except PyMongoError as e:
+            entry["errors"].append(str(e))
+        report[collection_name] = entry
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply and verify the MongoDB index manifest.")
+    parser.add_argument("--verify", action="store_true", help="only verify, do not create missing indexes")
+    parser.add_argument("--embedded", action="store_true", help="include MovieCredits (embedded credits layout)")
+    args = parser.parse_args(argv)
+    manifest = manifest_for_layout(embedded=args.embedded)
+
+    from database.db_mongo_connection import MongoConnectionManager
+    mongo_manager = MongoConnectionManager()
+    db = mongo_manager.get_database()
+    if db is None:
+        print("MongoDB connection not available.")
+        return 1
+
+    try:
+        if not args.verify:
+            for collection_name, entry in ensure_indexes(db, manifest).items():
+                print(f"{collection_name}: created {entry['created'] or 'none'}"
+                      + (f", errors: {entry['errors']}" if entry["errors"] else ""))
+
+        problems = False
+        for collection_name, entry in verify_indexes(db, manifest).items():
+            print(f"{collection_name}:")
+            print(f"  missing:     {entry['missing'] or 'none'}")
+            print(f"  unused:      {entry['unused'] or 'none'} (since last server restart)")
+            print(f"  unexpected:  {entry['unexpected'] or 'none'}")
+            print(f"  collscans:   {entry['collscans'] or 'none'}")
+            if entry["errors"]:
+                print(f"  errors:      {entry['errors']}")
+            problems = problems or bool(entry["missing"] or entry["collscans"] or entry["errors"])
+    finally:
+        mongo_manager.close_connection()
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
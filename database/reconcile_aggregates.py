@@ -0,0 +1,50 @@
+# database/reconcile_aggregates.py
+"""Recomputes Movies.totalRatings/countRatings from Ratings and reports (or repairs) drift.
+
+Usage:
+    python -m database.reconcile_aggregates [--dry-run] [--chunk-size N] [--report drift.json]
+"""
+
+import argparse
+import json
+import sys
+
+from database.db_connection import MySQLConnectionManager
+from database.services.rating_service import RatingService
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconcile movie rating aggregates with the Ratings table.")
+    parser.add_argument("--dry-run", action="store_true", help="report drift without writing")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="movies per chunk/transaction (default 1000)")
+    parser.add_argument("--report", help="write the full per-movie drift report to this JSON file")
+    parser.add_argument("--show", type=int, default=20, help="number of drifted movies to print (default 20)")
+    args = parser.parse_args(argv)
+
+    mysql_manager = MySQLConnectionManager()
+    if not mysql_manager.initialize_pool(pool_size=2):
+        return 1
+
+    try:
+        result = RatingService().reconcile_aggregates(chunk_size=args.chunk_size, dry_run=args.dry_run)
+    finally:
+        mysql_manager.shutdown_pool()
+
+    print(result["message"])
+    drift = result.get("drift", [])
+    if result.get("success"):
+        print(f"Count drift: {result['count_drift']} ratings, total drift: {result['total_drift']:.2f}")
+    for row in sorted(drift, key=lambda r: abs(r['stored_count'] - r['actual_count']), reverse=True)[:args.show]:
+        print(f"  {row['tmdbID']:>8}  count {row['stored_count']} -> {row['actual_count']}, "
+              f"total {row['stored_total']:.1f} -> {row['actual_total']:.1f}  {row['title']}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, default=str)
+        print(f"Drift report written to {args.report}")
+
+    return 0 if result.get("success") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
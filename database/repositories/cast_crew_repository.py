@@ -1,7 +1,28 @@
 # database/repositories/cast_crew_repository.py
 from database.db_mongo_connection import MongoConnectionManager
-from pymongo.errors import PyMongoError
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+from database.repositories.person_names import (
+    NAME_SEARCH_TOKEN, NAME_SEARCH_PREFIX, NAME_SEARCH_CONTAINS,
+    normalize_person_name, person_name_fields, name_search_filter
+)
+from database.repositories.embedded_credits_repository import EmbeddedCreditsRepository, MOVIE_CREDITS_COLLECTION
+from database.repositories.person_name_index import PersonNameIndex
 import threading
+import time
+
+# The name index only sees writes made through this process; once it is older than this many
+# seconds, searches go back to MongoDB while a fresh copy loads in the background
+NAME_INDEX_MAX_AGE = 10 * 60
+
+# Billing order of linked credits: each link document stores its list position in "order".
+# Documents written before the field existed have none and sort first, then by _id (insertion order).
+CREDIT_ORDER_SORT = [("order", 1), ("_id", 1)]
+
+# Cast/crew storage layouts, see CastCrewRepository.set_layout
+CREDITS_LAYOUT_LINKED = "linked"      # one document per credit in MovieCastLink/MovieCrewLink (default)
+CREDITS_LAYOUT_EMBEDDED = "embedded"  # one MovieCredits document per movie with cast[]/crew[] arrays
+
 
 class CastCrewRepository:
     _instance = None
@@ -13,8 +34,123 @@ class CastCrewRepository:
                 if cls._instance is None:
                     cls._instance = super(CastCrewRepository, cls).__new__(cls)
                     cls._instance.mongo_manager = MongoConnectionManager()
+                    cls._instance.layout = CREDITS_LAYOUT_LINKED
+                    cls._instance.embedded = EmbeddedCreditsRepository()
+                    # Optional in-memory name indexes, see enable_name_index
+                    cls._instance.cast_index = None
+                    cls._instance.crew_index = None
+                    cls._instance._index_lock = threading.Lock()
+                    cls._instance._index_journal = None
+                    cls._instance._index_loaded_at = None
+                    cls._instance._index_reloading = False
+                    cls._instance.name_index_max_age = NAME_INDEX_MAX_AGE
         return cls._instance
 
+    def set_layout(self, layout):
+        """Selects the cast/crew storage layout (CREDITS_LAYOUT_LINKED or CREDITS_LAYOUT_EMBEDDED).
+
+        The embedded layout reads from the MovieCredits collection built by
+        database/migrations/005_embedded_movie_credits.py; run it before switching.
+        While it is active, writes go to the linked collections as well (see _store), so they
+        stay current: switching back to linked, or re-running the migration, loses nothing.
+        """
+        if layout not in (CREDITS_LAYOUT_LINKED, CREDITS_LAYOUT_EMBEDDED):
+            raise ValueError(f"Unknown credits layout: {layout}")
+        self.layout = layout
+        print(f"DEBUG: CastCrewRepository layout set to '{layout}'")
+        if self.cast_index is not None:
+            self.enable_name_index()  # Rebuild from the newly selected layout
+
+    def _iter_index_credits(self, kind):
+        """Streams {'tmdbID', 'name'[, 'job']} for every cast or crew credit in the current layout."""
+        db = self.mongo_manager.get_database()
+        if db is None:
+            raise PyMongoError("MongoDB connection not available")
+        fields = {"tmdbID": 1, "name": 1, "job": 1, "_id": 0} if kind == "crew" else {"tmdbID": 1, "name": 1, "_id": 0}
+        if self.layout == CREDITS_LAYOUT_EMBEDDED:
+            return db[MOVIE_CREDITS_COLLECTION].aggregate([
+                {"$unwind": f"${kind}"},
+                {"$project": {"_id": 0, "tmdbID": "$_id", "name": f"${kind}.name",
+                              **({"job": f"${kind}.job"} if kind == "crew" else {})}},
+            ], allowDiskUse=True)
+        collection = db["MovieCrewLink"] if kind == "crew" else db["MovieCastLink"]
+        return collection.find({}, fields, batch_size=10000)
+
+    def enable_name_index(self):
+        """Loads every cast/crew name into in-memory indexes that then answer find_tmdbids_by_cast/crew.
+
+        The indexes are built off to the side and swapped in when complete, so searches keep using
+        MongoDB until then; writes made through this repository during the load are replayed on top.
+        Afterwards the add/update/delete/replace methods keep them in step. Credits changed by other
+        clients are not seen, so an index older than name_index_max_age seconds is not used: searches
+        go to MongoDB until the background reload started by _name_index swaps in a fresh one.
+        Substring ('contains') searches always go to MongoDB.
+
+        Returns:
+            bool: True if the indexes were loaded
+        """
+        with self._index_lock:
+            self._index_journal = []
+        try:
+            cast_index = PersonNameIndex()
+            crew_index = PersonNameIndex(with_job=True)
+            cast_index.load(self._iter_index_credits("cast"))
+            crew_index.load(self._iter_index_credits("crew"))
+        except PyMongoError as e:
+            print(f"Error loading cast/crew name index: {e}")
+            with self._index_lock:
+                self._index_journal = None
+            return False
+
+        with self._index_lock:
+            for kind, op, args in self._index_journal:
+                index = cast_index if kind == "cast" else crew_index
+                getattr(index, op)(*args)
+            self._index_journal = None
+            self.cast_index, self.crew_index = cast_index, crew_index
+            self._index_loaded_at = time.monotonic()
+        print(f"DEBUG: Loaded cast/crew name index ({len(cast_index)} cast and {len(crew_index)} crew entries)")
+        return True
+
+    def disable_name_index(self):
+        """Drops the in-memory name indexes; searches go back to MongoDB."""
+        with self._index_lock:
+            self.cast_index = None
+            self.crew_index = None
+            self._index_loaded_at = None
+
+    def _name_index(self, kind):
+        """Returns the loaded cast or crew name index, or None if there is none or it is too old to trust.
+
+        A stale index triggers one background reload; enable_name_index swaps it in when done.
+        """
+        with self._index_lock:
+            index = self.cast_index if kind == "cast" else self.crew_index
+            if index is None or time.monotonic() - self._index_loaded_at <= self.name_index_max_age:
+                return index
+            start_reload = not self._index_reloading
+            self._index_reloading = True
+        if start_reload:
+            threading.Thread(target=self._reload_name_index, name="name-index-reloader", daemon=True).start()
+        return None
+
+    def _reload_name_index(self):
+        try:
+            self.enable_name_index()
+        finally:
+            with self._index_lock:
+                self._index_reloading = False
+
+    def _sync_index(self, kind, op, tmdb_id, name, job=None):
+        """Applies a credit change ('add' or 'remove') to the loaded name index, or journals it during a load."""
+        args = (tmdb_id, name, job) if kind == "crew" else (tmdb_id, name)
+        with self._index_lock:
+            if self._index_journal is not None:
+                self._index_journal.append((kind, op, args))
+            index = self.cast_index if kind == "cast" else self.crew_index
+        if index is not None:
+            getattr(index, op)(*args)
+
     def _get_cast_collection(self):
         """Helper to get cast collection for each operation."""
         db = self.mongo_manager.get_database()
@@ -27,13 +163,15 @@ class CastCrewRepository:
 
     def get_cast_for_movie(self, tmdb_id):
         """Fetches the cast for a specific movie from MongoDB."""
+        if self.layout == CREDITS_LAYOUT_EMBEDDED:
+            return self.embedded.get_cast_for_movie(tmdb_id)
         cast_collection = self._get_cast_collection()
         if cast_collection is None:
             print("MongoDB connection not available for Cast collection.")
             return []
 
         try:
-            cursor = cast_collection.find({"tmdbID": tmdb_id})
+            cursor = cast_collection.find({"tmdbID": tmdb_id}).sort(CREDIT_ORDER_SORT)
             cast_list = list(cursor)
             for person in cast_list:
                 person.pop('_id', None)
@@ -47,13 +185,15 @@ class CastCrewRepository:
 
     def get_crew_for_movie(self, tmdb_id):
         """Fetches the crew for a specific movie from MongoDB."""
+        if self.layout == CREDITS_LAYOUT_EMBEDDED:
+            return self.embedded.get_crew_for_movie(tmdb_id)
         crew_collection = self._get_crew_collection()
         if crew_collection is None:
             print("MongoDB connection not available for Crew collection.")
             return []
 
         try:
-            cursor = crew_collection.find({"tmdbID": tmdb_id})
+            cursor = crew_collection.find({"tmdbID": tmdb_id}).sort(CREDIT_ORDER_SORT)
             crew_list = list(cursor)
             for person in crew_list:
                 person.pop('_id', None)
@@ -67,13 +207,15 @@ class CastCrewRepository:
 
     def get_director_for_movie(self, tmdb_id):
         """Fetches the director for a specific movie from MongoDB."""
+        if self.layout == CREDITS_LAYOUT_EMBEDDED:
+            return self.embedded.get_director_for_movie(tmdb_id)
         crew_collection = self._get_crew_collection()
         if crew_collection is None:
             print("MongoDB connection not available for Crew collection.")
             return None
 
         try:
-            director_doc = crew_collection.find_one({"tmdbID": tmdb_id, "job": "Director"})
+            director_doc = crew_collection.find_one({"tmdbID": tmdb_id, "job": "Director"}, sort=CREDIT_ORDER_SORT)
             if director_doc:
                 director_doc.pop('_id', None)
             return director_doc
@@ -83,49 +225,294 @@ class CastCrewRepository:
         except Exception as e:
             print(f"Unexpected error fetching director for movie {tmdb_id}: {e}")
             return None
-        
-    def find_tmdbids_by_cast(self, cast_name):
+
+    def get_directors_for_movies(self, tmdb_ids):
+        """Fetches the director of many movies with one $in query, grouped server-side.
+
+        Returns:
+            dict: tmdbID -> director name (movies without a director are left out)
+        """
+        ids = list(dict.fromkeys(tmdb_ids or []))
+        if not ids:
+            return {}
+        if self.layout == CREDITS_LAYOUT_EMBEDDED:
+            return self.embedded.get_directors_for_movies(ids)
+        crew_collection = self._get_crew_collection()
+        if crew_collection is None:
+            print("MongoDB connection not available for Crew collection.")
+            return {}
+
+        try:
+            pipeline = [
+                {"$match": {"tmdbID": {"$in": ids}, "job": "Director"}},
+                {"$sort": {"tmdbID": 1, "order": 1, "_id": 1}},
+                {"$group": {"_id": "$tmdbID", "name": {"$first": "$name"}}},
+            ]
+            return {doc["_id"]: doc["name"] for doc in crew_collection.aggregate(pipeline)}
+        except PyMongoError as e:
+            print(f"Error fetching directors for {len(ids)} movies from MongoDB: {e}")
+            return {}
+
+    def get_top_cast_for_movies(self, tmdb_ids, n=3):
+        """Fetches the first n cast members of many movies with one $in query, grouped server-side.
+
+        Returns:
+            dict: tmdbID -> list of {'name', 'character'} in stored (billing) order
+        """
+        ids = list(dict.fromkeys(tmdb_ids or []))
+        if not ids or n <= 0:
+            return {}
+        if self.layout == CREDITS_LAYOUT_EMBEDDED:
+            return self.embedded.get_top_cast_for_movies(ids, n)
+        cast_collection = self._get_cast_collection()
+        if cast_collection is None:
+            print("MongoDB connection not available for Cast collection.")
+            return {}
+
+        try:
+            pipeline = [
+                {"$match": {"tmdbID": {"$in": ids}}},
+                {"$sort": {"tmdbID": 1, "order": 1, "_id": 1}},
+                {"$group": {"_id": "$tmdbID", "cast": {"$push": {"name": "$name", "character": "$character"}}}},
+                {"$project": {"cast": {"$slice": ["$cast", n]}}},
+            ]
+            return {doc["_id"]: doc["cast"] for doc in cast_collection.aggregate(pipeline)}
+        except PyMongoError as e:
+            print(f"Error fetching top cast for {len(ids)} movies from MongoDB: {e}")
+            return {}
+
+    def _linked_credits_summary_source(self, tmdb_id, cast_limit=None, include_crew=True):
+        """Linked-layout counterpart of EmbeddedCreditsRepository.credits_summary_source."""
+        cast_stages = [{"$match": {"tmdbID": tmdb_id}}, {"$sort": {"order": 1, "_id": 1}}]  # Billing order
+        if cast_limit is not None:
+            cast_stages.append({"$limit": cast_limit})
+        cast_stages.append({"$project": {"_id": 0, "kind": {"$literal": "cast"}, "name": 1, "character": 1}})
+
+        crew_match = {"tmdbID": tmdb_id} if include_crew else {"tmdbID": tmdb_id, "job": "Director"}
+        crew_pipeline = [
+            {"$match": crew_match},
+            {"$sort": {"order": 1, "_id": 1}},
+            {"$project": {"_id": 0, "kind": {"$literal": "crew"}, "name": 1, "job": 1, "department": 1}},
+        ]
+        stages = cast_stages + [{"$unionWith": {"coll": "MovieCrewLink", "pipeline": crew_pipeline}}]
+        return self._get_cast_collection(), stages
+
+    def get_credits_summary(self, tmdb_id, cast_limit=None, include_crew=True):
+        """Fetches the director, the first cast_limit cast members and the crew grouped by department in one aggregation.
+
+        Cast and crew rows are combined server-side ($unionWith, or the movie's MovieCredits document in
+        the embedded layout) and split with $facet, so a page costs one round trip and only the fields
+        shown are transferred (no _id, no search fields).
+
+        Args:
+            tmdb_id (int): The tmdbID of the movie
+            cast_limit (int): Maximum number of cast members to return, or None for all of them
+            include_crew (bool): Also return the grouped crew; with False only the director is read from the crew
+
+        Returns:
+            dict: {'director': dict or None, 'cast': [{'name', 'character'}], 'crew_by_department': {dept: {job: [names]}}},
+                or None on error
+        """
+        if self.layout == CREDITS_LAYOUT_EMBEDDED:
+            collection, stages = self.embedded.credits_summary_source(tmdb_id, cast_limit, include_crew)
+        else:
+            collection, stages = self._linked_credits_summary_source(tmdb_id, cast_limit, include_crew)
+        if collection is None:
+            print("MongoDB connection not available for cast/crew collections.")
+            return None
+
+        crew_facet = [
+            {"$match": {"kind": "crew"}},
+            {"$group": {"_id": {"department": "$department", "job": "$job"}, "names": {"$push": "$name"}}},
+            {"$project": {"_id": 0, "department": "$_id.department", "job": "$_id.job", "names": 1}},
+            {"$sort": {"department": 1, "job": 1}},
+        ] if include_crew else [{"$limit": 0}]
+        stages.append({"$facet": {
+            "cast": [{"$match": {"kind": "cast"}}, {"$project": {"kind": 0}}],
+            "director": [{"$match": {"kind": "crew", "job": "Director"}}, {"$limit": 1}, {"$project": {"kind": 0}}],
+            "crew": crew_facet,
+        }})
+
+        try:
+            result = next(collection.aggregate(stages), {})
+        except PyMongoError as e:
+            print(f"Error fetching credits summary for movie {tmdb_id} from MongoDB: {e}")
+            return None
+
+        crew_by_department = {}
+        for group in result.get("crew", []):
+            dept = group.get("department") or "Other"
+            job = group.get("job") or "N/A"
+            crew_by_department.setdefault(dept, {}).setdefault(job, []).extend(group.get("names", []))
+        director = result.get("director") or [None]
+        return {"director": director[0], "cast": result.get("cast", []), "crew_by_department": crew_by_department}
+
+    def find_tmdbids_by_cast(self, cast_name, mode=NAME_SEARCH_TOKEN):
         """
-        Returns a list of tmdbID (movie IDs) for all movies with a cast member whose name matches (case-insensitive, partial OK).
+        Returns a list of tmdbID (movie IDs) for all movies with a cast member whose name matches.
+
+        Matching is case- and accent-insensitive. In token mode (default) every word of the query
+        must start a word of the name ("tom han" finds "Tom Hanks"); prefix mode matches the start of
+        the full name; contains mode is the old unindexed substring search.
         """
+        cast_index = self._name_index("cast") if mode != NAME_SEARCH_CONTAINS else None
+        if cast_index is not None:
+            return cast_index.find_tmdbids(cast_name, mode)
+        if self.layout == CREDITS_LAYOUT_EMBEDDED:
+            return self.embedded.find_tmdbids_by_cast(cast_name, mode=mode)
         cast_collection = self._get_cast_collection()
         if cast_collection is None:
             print("MongoDB connection not available for Cast collection.")
             return []
         try:
-            cursor = cast_collection.find({"name": {"$regex": cast_name, "$options": "i"}})
-            tmdbids = set()
-            for doc in cursor:
-                tmdbid = doc.get('tmdbID')
-                if tmdbid is not None:
-                    tmdbids.add(tmdbid)
-            return list(tmdbids)
+            query = name_search_filter(cast_name, mode)
+            if query is None:
+                return []
+            # distinct returns just the IDs instead of streaming whole documents back
+            return cast_collection.distinct("tmdbID", query)
         except Exception as e:
             print(f"Error finding cast by name: {e}")
             return []
 
-    def find_tmdbids_by_crew(self, crew_name, job=None):
+    def find_tmdbids_by_crew(self, crew_name, job=None, mode=NAME_SEARCH_TOKEN):
         """
-        Returns a list of tmdbID (movie IDs) for all movies with a crew member whose name matches (case-insensitive, partial OK).
+        Returns a list of tmdbID (movie IDs) for all movies with a crew member whose name matches,
+        optionally restricted to a job. See find_tmdbids_by_cast for the matching modes.
         """
+        crew_index = self._name_index("crew") if mode != NAME_SEARCH_CONTAINS else None
+        if crew_index is not None:
+            return crew_index.find_tmdbids(crew_name, mode, job=job)
+        if self.layout == CREDITS_LAYOUT_EMBEDDED:
+            return self.embedded.find_tmdbids_by_crew(crew_name, job=job, mode=mode)
         crew_collection = self._get_crew_collection()
         if crew_collection is None:
             print("MongoDB connection not available for Crew collection.")
             return []
         try:
-            cursor = crew_collection.find({"name": {"$regex": crew_name, "$options": "i"}})
-            tmdbids = set()
-            for doc in cursor:
-                tmdbid = doc.get('tmdbID')
-                if tmdbid is not None:
-                    tmdbids.add(tmdbid)
-            return list(tmdbids)
+            query = name_search_filter(crew_name, mode)
+            if query is None:
+                return []
+            if job:
+                query = {"$and": [query, {"job": job}]}
+            return crew_collection.distinct("tmdbID", query)
         except Exception as e:
             print(f"Error finding crew by name: {e}")
             return []
             
+    def _store(self, method_name):
+        """Returns the implementation of a write method for the current layout.
+
+        In the embedded layout the write is applied to the linked collections first and then
+        to MovieCredits, returning the embedded result. The linked collections remain the
+        source migration 005 rebuilds MovieCredits from, so they must never fall behind.
+        A write the linked layout rejects (False/None) is not applied to MovieCredits either.
+        """
+        linked_write = getattr(self, "_linked_" + method_name)
+        if self.layout != CREDITS_LAYOUT_EMBEDDED:
+            return linked_write
+        embedded_write = getattr(self.embedded, method_name)
+
+        def write_both(*args, **kwargs):
+            linked_result = linked_write(*args, **kwargs)
+            if not linked_result:
+                return linked_result
+            return embedded_write(*args, **kwargs)
+        return write_both
+
     def add_cast_member(self, tmdb_id, name, character):
-        """Inserts a new cast member into MongoDB."""
+        """Inserts a new cast member, or updates the character of an existing one."""
+        success = self._store("add_cast_member")(tmdb_id, name, character)
+        if success:
+            self._sync_index("cast", "add", tmdb_id, name)
+        return success
+
+    def add_crew_member(self, tmdb_id, name, job, department):
+        """Inserts a new crew member, or updates the department of an existing (name, job) credit."""
+        success = self._store("add_crew_member")(tmdb_id, name, job, department)
+        if success:
+            self._sync_index("crew", "add", tmdb_id, name, job)
+        return success
+
+    def _sync_replace_results(self, kind, tmdb_id, results):
+        # A 'deleted' result can be a legacy duplicate of a credit that is kept, which must stay indexed
+        kept = {(r["name"], r.get("job")) for r in results or [] if r["action"] != "deleted"}
+        for result in results or []:
+            if not result["success"]:
+                continue
+            if result["action"] == "inserted":
+                self._sync_index(kind, "add", tmdb_id, result["name"], result.get("job"))
+            elif result["action"] == "deleted" and (result["name"], result.get("job")) not in kept:
+                self._sync_index(kind, "remove", tmdb_id, result["name"], result.get("job"))
+
+    def replace_cast_for_movie(self, tmdb_id, cast):
+        """Makes the movie's stored cast match the given list of {'name', 'character'} dicts.
+
+        Returns:
+            list: Per-credit results (see _replace_credits), or None if the write could not be attempted
+        """
+        results = self._store("replace_cast_for_movie")(tmdb_id, cast)
+        self._sync_replace_results("cast", tmdb_id, results)
+        return results
+
+    def replace_crew_for_movie(self, tmdb_id, crew):
+        """Makes the movie's stored crew match the given list of {'name', 'job', 'department'} dicts.
+
+        Returns:
+            list: Per-credit results (see _replace_credits), or None if the write could not be attempted
+        """
+        results = self._store("replace_crew_for_movie")(tmdb_id, crew)
+        self._sync_replace_results("crew", tmdb_id, results)
+        return results
+
+    def update_crew_member(self, tmdb_id, name, old_job, new_department, new_job=None):
+        """Updates the department (and optionally the job) for an existing crew member."""
+        success = self._store("update_crew_member")(tmdb_id, name, old_job, new_department, new_job=new_job)
+        if success and new_job is not None and new_job != old_job:
+            self._sync_index("crew", "remove", tmdb_id, name, old_job)
+            self._sync_index("crew", "add", tmdb_id, name, new_job)
+        return success
+
+    def delete_cast_member(self, tmdb_id, name):
+        """Deletes a cast member for a specific movie identified by name."""
+        success = self._store("delete_cast_member")(tmdb_id, name)
+        if success:
+            self._sync_index("cast", "remove", tmdb_id, name)
+        return success
+
+    def delete_crew_member(self, tmdb_id, name, job):
+        """Deletes a crew member for a specific movie based on name and job."""
+        success = self._store("delete_crew_member")(tmdb_id, name, job)
+        if success:
+            self._sync_index("crew", "remove", tmdb_id, name, job)
+        return success
+
+    def delete_all_cast_for_movie(self, tmdb_id):
+        """Deletes all cast members for a specific movie from MongoDB."""
+        # The index needs the names being removed, so read them first (only when it is in use)
+        removed = self.get_cast_for_movie(tmdb_id) if self.cast_index is not None else []
+        success = self._store("delete_all_cast_for_movie")(tmdb_id)
+        if success:
+            for person in removed:
+                self._sync_index("cast", "remove", tmdb_id, person.get("name"))
+        return success
+
+    def delete_all_crew_for_movie(self, tmdb_id):
+        """Deletes all crew members for a specific movie from MongoDB."""
+        removed = self.get_crew_for_movie(tmdb_id) if self.crew_index is not None else []
+        success = self._store("delete_all_crew_for_movie")(tmdb_id)
+        if success:
+            for person in removed:
+                self._sync_index("crew", "remove", tmdb_id, person.get("name"), person.get("job"))
+        return success
+
+    @staticmethod
+    def _next_credit_order(collection, tmdb_id):
+        """Returns the "order" that puts a new credit after the movie's existing ones."""
+        last = collection.find_one({"tmdbID": tmdb_id}, {"order": 1}, sort=[("order", -1), ("_id", -1)])
+        return last.get("order", -1) + 1 if last else 0
+
+    def _linked_add_cast_member(self, tmdb_id, name, character):
+        """Linked-layout implementation of add_cast_member."""
         cast_collection = self._get_cast_collection()
         if cast_collection is None:
             print("MongoDB connection not available for Cast collection.")
@@ -142,15 +529,16 @@ class CastCrewRepository:
                 return result.modified_count > 0
             
             result = cast_collection.insert_one({
-                "tmdbID": tmdb_id, "name": name, "character": character
+                "tmdbID": tmdb_id, "name": name, "character": character,
+                "order": self._next_credit_order(cast_collection, tmdb_id), **person_name_fields(name)
             })
             return result.inserted_id is not None
         except PyMongoError as e:
             print(f"Error adding/updating cast member: {e}")
             return False
 
-    def add_crew_member(self, tmdb_id, name, job, department):
-        """Inserts a new crew member into MongoDB."""
+    def _linked_add_crew_member(self, tmdb_id, name, job, department):
+        """Linked-layout implementation of add_crew_member."""
         crew_collection = self._get_crew_collection()
         if crew_collection is None:
             print("MongoDB connection not available for Crew collection.")
@@ -167,15 +555,102 @@ class CastCrewRepository:
                 return result.modified_count > 0
 
             result = crew_collection.insert_one({
-                "tmdbID": tmdb_id, "name": name, "job": job, "department": department
+                "tmdbID": tmdb_id, "name": name, "job": job, "department": department,
+                "order": self._next_credit_order(crew_collection, tmdb_id), **person_name_fields(name)
             })
             return result.inserted_id is not None
         except PyMongoError as e:
             print(f"Error adding/updating crew member: {e}")
             return False
 
+    def _replace_credits(self, collection, tmdb_id, desired, key_fields, value_fields):
+        """Diffs a movie's stored credits against the desired list and applies it in one unordered bulk_write.
+
+        Credits are matched on key_fields; matches whose value_fields or list position ("order")
+        differ are updated, unmatched stored credits are deleted and new ones inserted. Each
+        returned result carries the key fields, the 'action' taken ('inserted', 'updated',
+        'deleted' or 'unchanged') and 'success'.
+        """
+        projection = {field: 1 for field in key_fields + value_fields + ("name_norm", "order")}
+        existing = {}
+        ops, results = [], []
+        for doc in collection.find({"tmdbID": tmdb_id}, projection).sort(CREDIT_ORDER_SORT):
+            key = tuple(doc.get(field) for field in key_fields)
+            if key in existing:
+                # Legacy duplicate of the same credit: drop the extra copy
+                ops.append(DeleteOne({"_id": doc["_id"]}))
+                results.append({**dict(zip(key_fields, key)), "action": "deleted", "success": True})
+            else:
+                existing[key] = doc
+
+        wanted = {}
+        for item in desired:
+            wanted[tuple(item[field] for field in key_fields)] = item  # Later entries win
+
+        for order, (key, item) in enumerate(wanted.items()):
+            values = {field: item[field] for field in value_fields}
+            values["order"] = order
+            doc = existing.pop(key, None)
+            if doc is None:
+                ops.append(InsertOne({"tmdbID": tmdb_id, **dict(zip(key_fields, key)), **values,
+                                      **person_name_fields(item["name"])}))
+                results.append({**dict(zip(key_fields, key)), "action": "inserted", "success": True})
+                continue
+            changes = {field: value for field, value in values.items() if doc.get(field) != value}
+            if "name_norm" not in doc:
+                changes.update(person_name_fields(item["name"]))
+            if changes:
+                ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": changes}))
+                results.append({**dict(zip(key_fields, key)), "action": "updated", "success": True})
+            else:
+                results.append({**dict(zip(key_fields, key)), "action": "unchanged", "success": True})
+
+        for key, doc in existing.items():
+            ops.append(DeleteOne({"_id": doc["_id"]}))
+            results.append({**dict(zip(key_fields, key)), "action": "deleted", "success": True})
+
+        if not ops:
+            return results
+        # Results that issued an operation, in the same order as ops, so write errors map back by index
+        op_results = [r for r in results if r["action"] != "unchanged"]
+        try:
+            collection.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                op_results[error["index"]]["success"] = False
+                op_results[error["index"]]["message"] = error.get("errmsg", "Write failed")
+        return results
+
+    def _linked_replace_cast_for_movie(self, tmdb_id, cast):
+        """Linked-layout implementation of replace_cast_for_movie."""
+        cast_collection = self._get_cast_collection()
+        if cast_collection is None:
+            print("MongoDB connection not available for Cast collection.")
+            return None
+        try:
+            return self._replace_credits(cast_collection, tmdb_id, cast, ("name",), ("character",))
+        except PyMongoError as e:
+            print(f"Error replacing cast for movie {tmdb_id}: {e}")
+            return None
+
+    def _linked_replace_crew_for_movie(self, tmdb_id, crew):
+        """Linked-layout implementation of replace_crew_for_movie."""
+        crew_collection = self._get_crew_collection()
+        if crew_collection is None:
+            print("MongoDB connection not available for Crew collection.")
+            return None
+        try:
+            return self._replace_credits(crew_collection, tmdb_id, crew, ("name", "job"), ("department",))
+        except PyMongoError as e:
+            print(f"Error replacing crew for movie {tmdb_id}: {e}")
+            return None
+
     def update_cast_member(self, tmdb_id, name, new_character):
         """Updates the character for an existing cast member identified by name."""
+        return self._store("update_cast_member")(tmdb_id, name, new_character)
+
+    def _linked_update_cast_member(self, tmdb_id, name, new_character):
+        """Linked-layout implementation of update_cast_member."""
         cast_collection = self._get_cast_collection()
         if cast_collection is None:
             print("MongoDB connection not available for Cast collection.")
@@ -191,8 +666,8 @@ class CastCrewRepository:
             print(f"Error updating cast member: {e}")
             return False
 
-    def update_crew_member(self, tmdb_id, name, old_job, new_department, new_job=None):
-        """Updates the department (and optionally the job) for an existing crew member."""
+    def _linked_update_crew_member(self, tmdb_id, name, old_job, new_department, new_job=None):
+        """Linked-layout implementation of update_crew_member."""
         crew_collection = self._get_crew_collection()
         if crew_collection is None:
             print("MongoDB connection not available for Crew collection.")
@@ -212,8 +687,8 @@ class CastCrewRepository:
             print(f"Error updating crew member: {e}")
             return False
 
-    def delete_cast_member(self, tmdb_id, name):
-        """Deletes a cast member for a specific movie identified by name."""
+    def _linked_delete_cast_member(self, tmdb_id, name):
+        """Linked-layout implementation of delete_cast_member."""
         cast_collection = self._get_cast_collection()
         if cast_collection is None:
             print("MongoDB connection not available for Cast collection.")
@@ -226,8 +701,8 @@ class CastCrewRepository:
             print(f"Error deleting cast member: {e}")
             return False
 
-    def delete_crew_member(self, tmdb_id, name, job):
-        """Deletes a crew member for a specific movie based on name and job."""
+    def _linked_delete_crew_member(self, tmdb_id, name, job):
+        """Linked-layout implementation of delete_crew_member."""
         crew_collection = self._get_crew_collection()
         if crew_collection is None:
             print("MongoDB connection not available for Crew collection.")
@@ -248,8 +723,8 @@ class CastCrewRepository:
         """Alias for get_crew_for_movie, kept for consistency if needed."""
         return self.get_crew_for_movie(tmdb_id)
     
-    def delete_all_cast_for_movie(self, tmdb_id):
-        """Deletes all cast members for a specific movie from MongoDB."""
+    def _linked_delete_all_cast_for_movie(self, tmdb_id):
+        """Linked-layout implementation of delete_all_cast_for_movie."""
         cast_collection = self._get_cast_collection()
         if cast_collection is None:
             print("MongoDB connection not available for Cast collection.")
@@ -264,8 +739,8 @@ class CastCrewRepository:
             print(f"Error deleting all cast for movie {tmdb_id} from MongoDB: {e}")
             return False
 
-    def delete_all_crew_for_movie(self, tmdb_id):
-        """Deletes all crew members for a specific movie from MongoDB."""
+    def _linked_delete_all_crew_for_movie(self, tmdb_id):
+        """Linked-layout implementation of delete_all_crew_for_movie."""
         crew_collection = self._get_crew_collection()
         if crew_collection is None:
             print("MongoDB connection not available for Crew collection.")
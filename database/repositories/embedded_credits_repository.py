@@ -0,0 +1,341 @@
+# database/repositories/embedded_credits_repository.py
+from database.db_mongo_connection import MongoConnectionManager
+from pymongo.errors import PyMongoError
+from database.repositories.person_names import NAME_SEARCH_TOKEN, person_name_fields, name_search_filter
+import threading
+
+# Collection holding one document per movie: {_id: tmdbID, tmdbID, cast: [...], crew: [...]}
+MOVIE_CREDITS_COLLECTION = "MovieCredits"
+
+# Derived search fields stored on each embedded credit but not returned to callers
+_DERIVED_FIELDS = ("name_norm", "name_tokens")
+
+
+class EmbeddedCreditsRepository:
+    """Cast/crew storage with all credits of a movie embedded in a single MovieCredits document.
+
+    Exposes the same methods and return values as CastCrewRepository, which delegates here when
+    its layout is set to 'embedded'. Reading a movie's credits is a single find_one by _id.
+    CastCrewRepository applies every write to the linked collections too (see its _store), so
+    the layout can be switched back without re-migrating; calling the write methods here
+    directly bypasses that and leaves the linked collections stale.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(EmbeddedCreditsRepository, cls).__new__(cls)
+                    cls._instance.mongo_manager = MongoConnectionManager()
+        return cls._instance
+
+    def _get_credits_collection(self):
+        """Helper to get the embedded credits collection for each operation."""
+        db = self.mongo_manager.get_database()
+        return db[MOVIE_CREDITS_COLLECTION] if db is not None else None
+
+    @staticmethod
+    def _public(tmdb_id, credit):
+        """Returns an embedded credit shaped like a MovieCastLink/MovieCrewLink document."""
+        person = {k: v for k, v in credit.items() if k not in _DERIVED_FIELDS}
+        person["tmdbID"] = tmdb_id
+        return person
+
+    def _get_credits(self, tmdb_id, array_field):
+        collection = self._get_credits_collection()
+        if collection is None:
+            print("MongoDB connection not available for MovieCredits collection.")
+            return []
+        try:
+            doc = collection.find_one({"_id": tmdb_id}, {array_field: 1})
+            return [self._public(tmdb_id, c) for c in (doc or {}).get(array_field, [])]
+        except PyMongoError as e:
+            print(f"Error fetching {array_field} for movie {tmdb_id} from MongoDB: {e}")
+            return []
+
+    def get_cast_for_movie(self, tmdb_id):
+        """Fetches the cast for a specific movie with one find_one."""
+        return self._get_credits(tmdb_id, "cast")
+
+    def get_crew_for_movie(self, tmdb_id):
+        """Fetches the crew for a specific movie with one find_one."""
+        return self._get_credits(tmdb_id, "crew")
+
+    def get_director_for_movie(self, tmdb_id):
+        """Fetches the director for a specific movie, projecting only the matching crew entry."""
+        collection = self._get_credits_collection()
+        if collection is None:
+            print("MongoDB connection not available for MovieCredits collection.")
+            return None
+        try:
+            doc = collection.find_one({"_id": tmdb_id}, {"crew": {"$elemMatch": {"job": "Director"}}})
+            crew = (doc or {}).get("crew", [])
+            return self._public(tmdb_id, crew[0]) if crew else None
+        except PyMongoError as e:
+            print(f"Error fetching director for movie {tmdb_id} from MongoDB: {e}")
+            return None
+
+    def get_directors_for_movies(self, tmdb_ids):
+        """Fetches the director name of many movies with one $in query."""
+        collection = self._get_credits_collection()
+        if collection is None:
+            print("MongoDB connection not available for MovieCredits collection.")
+            return {}
+        try:
+            directors = {"$filter": {"input": {"$ifNull": ["$crew", []]},
+                                     "cond": {"$eq": ["$$this.job", "Director"]}}}
+            pipeline = [
+                {"$match": {"_id": {"$in": list(tmdb_ids)}}},
+                {"$project": {"name": {"$arrayElemAt": [directors, 0]}}},
+                {"$project": {"name": "$name.name"}},
+            ]
+            return {doc["_id"]: doc["name"] for doc in collection.aggregate(pipeline) if doc.get("name")}
+        except PyMongoError as e:
+            print(f"Error fetching directors for {len(tmdb_ids)} movies from MongoDB: {e}")
+            return {}
+
+    def get_top_cast_for_movies(self, tmdb_ids, n=3):
+        """Fetches the first n cast members of many movies with one $in query."""
+        collection = self._get_credits_collection()
+        if collection is None:
+            print("MongoDB connection not available for MovieCredits collection.")
+            return {}
+        try:
+            pipeline = [
+                {"$match": {"_id": {"$in": list(tmdb_ids)}}},
+                {"$project": {"cast": {"$map": {
+                    "input": {"$slice": [{"$ifNull": ["$cast", []]}, n]},
+                    "in": {"name": "$$this.name", "character": "$$this.character"}
+                }}}},
+            ]
+            return {doc["_id"]: doc["cast"] for doc in collection.aggregate(pipeline) if doc["cast"]}
+        except PyMongoError as e:
+            print(f"Error fetching top cast for {len(tmdb_ids)} movies from MongoDB: {e}")
+            return {}
+
+    def credits_summary_source(self, tmdb_id, cast_limit=None, include_crew=True):
+        """Returns (collection, stages) that emit one flat row per credit for CastCrewRepository.get_credits_summary.
+
+        Rows look like {'kind': 'cast', 'name', 'character'} or {'kind': 'crew', 'name', 'job', 'department'};
+        the cast is cut to cast_limit and, without include_crew, only the director is emitted from the crew.
+        """
+        cast = {"$ifNull": ["$cast", []]}
+        if cast_limit is not None:
+            cast = {"$slice": [cast, cast_limit]}
+        crew = {"$ifNull": ["$crew", []]}
+        if not include_crew:
+            crew = {"$filter": {"input": crew, "cond": {"$eq": ["$$this.job", "Director"]}}}
+        stages = [
+            {"$match": {"_id": tmdb_id}},
+            {"$project": {"_id": 0, "rows": {"$concatArrays": [
+                {"$map": {"input": cast, "in": {"kind": "cast", "name": "$$this.name", "character": "$$this.character"}}},
+                {"$map": {"input": crew, "in": {"kind": "crew", "name": "$$this.name", "job": "$$this.job",
+                                                "department": "$$this.department"}}},
+            ]}}},
+            {"$unwind": "$rows"},
+            {"$replaceRoot": {"newRoot": "$rows"}},
+        ]
+        return self._get_credits_collection(), stages
+
+    def _find_tmdbids(self, array_field, name, mode, job=None):
+        collection = self._get_credits_collection()
+        if collection is None:
+            print("MongoDB connection not available for MovieCredits collection.")
+            return []
+        try:
+            inner = name_search_filter(name, mode)
+            if inner is None:
+                return []
+            if job:
+                inner = {"$and": [inner, {"job": job}]}
+            # $elemMatch keeps every condition on the same credit ("tom hanks" must not match Tom X + Y Hanks)
+            return collection.distinct("_id", {array_field: {"$elemMatch": inner}})
+        except PyMongoError as e:
+            print(f"Error finding {array_field} by name: {e}")
+            return []
+
+    def find_tmdbids_by_cast(self, cast_name, mode=NAME_SEARCH_TOKEN):
+        return self._find_tmdbids("cast", cast_name, mode)
+
+    def find_tmdbids_by_crew(self, crew_name, job=None, mode=NAME_SEARCH_TOKEN):
+        return self._find_tmdbids("crew", crew_name, mode, job=job)
+
+    def add_cast_member(self, tmdb_id, name, character):
+        """Updates the character of an existing cast member, or appends a new one (creating the movie document)."""
+        collection = self._get_credits_collection()
+        if collection is None:
+            print("MongoDB connection not available for MovieCredits collection.")
+            return False
+        try:
+            result = collection.update_one(
+                {"_id": tmdb_id, "cast.name": name},
+                {"$set": {"cast.$.character": character}}
+            )
+            if result.matched_count:
+                return result.modified_count > 0
+            result = collection.update_one(
+                {"_id": tmdb_id},
+                {"$push": {"cast": {"name": name, "character": character, **person_name_fields(name)}},
+                 "$setOnInsert": {"tmdbID": tmdb_id}},
+                upsert=True
+            )
+            return result.modified_count > 0 or result.upserted_id is not None
+        except PyMongoError as e:
+            print(f"Error adding/updating cast member: {e}")
+            return False
+
+    def add_crew_member(self, tmdb_id, name, job, department):
+        """Updates the department of an existing (name, job) crew credit, or appends a new one."""
+        collection = self._get_credits_collection()
+        if collection is None:
+            print("MongoDB connection not available for MovieCredits collection.")
+            return False
+        try:
+            result = collection.update_one(
+                {"_id": tmdb_id, "crew": {"$elemMatch": {"name": name, "job": job}}},
+                {"$set": {"crew.$.department": department}}
+            )
+            if result.matched_count:
+                return result.modified_count > 0
+            result = collection.update_one(
+                {"_id": tmdb_id},
+                {"$push": {"crew": {"name": name, "job": job, "department": department, **person_name_fields(name)}},
+                 "$setOnInsert": {"tmdbID": tmdb_id}},
+                upsert=True
+            )
+            return result.modified_count > 0 or result.upserted_id is not None
+        except PyMongoError as e:
+            print(f"Error adding/updating crew member: {e}")
+            return False
+
+    def update_cast_member(self, tmdb_id, name, new_character):
+        collection = self._get_credits_collection()
+        if collection is None:
+            print("MongoDB connection not available for MovieCredits collection.")
+            return False
+        try:
+            result = collection.update_one(
+                {"_id": tmdb_id, "cast.name": name},
+                {"$set": {"cast.$.character": new_character}}
+            )
+            return result.modified_count == 1
+        except PyMongoError as e:
+            print(f"Error updating cast member: {e}")
+            return False
+
+    def update_crew_member(self, tmdb_id, name, old_job, new_department, new_job=None):
+        collection = self._get_credits_collection()
+        if collection is None:
+            print("MongoDB connection not available for MovieCredits collection.")
+            return False
+        try:
+            update_doc = {"$set": {"crew.$.department": new_department}}
+            if new_job is not None:
+                update_doc["$set"]["crew.$.job"] = new_job
+            result = collection.update_one(
+                {"_id": tmdb_id, "crew": {"$elemMatch": {"name": name, "job": old_job}}},
+                update_doc
+            )
+            return result.modified_count == 1
+        except PyMongoError as e:
+            print(f"Error updating crew member: {e}")
+            return False
+
+    def delete_cast_member(self, tmdb_id, name):
+        collection = self._get_credits_collection()
+        if collection is None:
+            print("MongoDB connection not available for MovieCredits collection.")
+            return False
+        try:
+            result = collection.update_one({"_id": tmdb_id}, {"$pull": {"cast": {"name": name}}})
+            return result.modified_count == 1
+        except PyMongoError as e:
+            print(f"Error deleting cast member: {e}")
+            return False
+
+    def delete_crew_member(self, tmdb_id, name, job):
+        collection = self._get_credits_collection()
+        if collection is None:
+            print("MongoDB connection not available for MovieCredits collection.")
+            return False
+        try:
+            result = collection.update_one({"_id": tmdb_id}, {"$pull": {"crew": {"name": name, "job": job}}})
+            return result.modified_count == 1
+        except PyMongoError as e:
+            print(f"Error deleting crew member: {e}")
+            return False
+
+    def _clear_credits(self, tmdb_id, array_field):
+        collection = self._get_credits_collection()
+        if collection is None:
+            print("MongoDB connection not available for MovieCredits collection.")
+            return False
+        try:
+            collection.update_one({"_id": tmdb_id}, {"$set": {array_field: []}})
+            print(f"DEBUG: Cleared embedded {array_field} for tmdbID {tmdb_id}.")
+            return True
+        except PyMongoError as e:
+            print(f"Error deleting all {array_field} for movie {tmdb_id} from MongoDB: {e}")
+            return False
+
+    def delete_all_cast_for_movie(self, tmdb_id):
+        return self._clear_credits(tmdb_id, "cast")
+
+    def delete_all_crew_for_movie(self, tmdb_id):
+        return self._clear_credits(tmdb_id, "crew")
+
+    def _replace_credits(self, tmdb_id, array_field, desired, key_fields, value_fields):
+        """Diffs the embedded array against the desired credits and writes the new array in one update.
+
+        The array order is the billing order, so a credit that only moved counts as updated.
+        Returns per-credit results in the same shape as CastCrewRepository._replace_credits.
+        """
+        collection = self._get_credits_collection()
+        if collection is None:
+            print("MongoDB connection not available for MovieCredits collection.")
+            return None
+        try:
+            doc = collection.find_one({"_id": tmdb_id}, {array_field: 1}) or {}
+            stored, stored_positions = {}, {}
+            for position, credit in enumerate(doc.get(array_field, [])):
+                key = tuple(credit.get(f) for f in key_fields)
+                stored.setdefault(key, credit)
+                stored_positions.setdefault(key, position)
+
+            wanted = {}
+            for item in desired:
+                wanted[tuple(item[f] for f in key_fields)] = item
+
+            new_array, results = [], []
+            for position, (key, item) in enumerate(wanted.items()):
+                entry = {**dict(zip(key_fields, key)), **{f: item[f] for f in value_fields}, **person_name_fields(item["name"])}
+                new_array.append(entry)
+                old = stored.pop(key, None)
+                if old is None:
+                    action = "inserted"
+                elif any(old.get(f) != item[f] for f in value_fields) or stored_positions[key] != position:
+                    action = "updated"  # Changed, or moved in the billing order
+                else:
+                    action = "unchanged"
+                results.append({**dict(zip(key_fields, key)), "action": action, "success": True})
+            for key in stored:
+                results.append({**dict(zip(key_fields, key)), "action": "deleted", "success": True})
+
+            if any(r["action"] != "unchanged" for r in results) or len(doc.get(array_field, [])) != len(new_array):
+                collection.update_one(
+                    {"_id": tmdb_id},
+                    {"$set": {array_field: new_array}, "$setOnInsert": {"tmdbID": tmdb_id}},
+                    upsert=True
+                )
+            return results
+        except PyMongoError as e:
+            print(f"Error replacing {array_field} for movie {tmdb_id}: {e}")
+            return None
+
+    def replace_cast_for_movie(self, tmdb_id, cast):
+        return self._replace_credits(tmdb_id, "cast", cast, ("name",), ("character",))
+
+    def replace_crew_for_movie(self, tmdb_id, crew):
+        return self._replace_credits(tmdb_id, "crew", crew, ("name", "job"), ("department",))
@@ -2,18 +2,67 @@
 
 from database.db_connection import MySQLConnectionManager
 from database.sql_queries import (
-    GET_MOVIES_PAGINATED, COUNT_ALL_MOVIES, GET_MOVIE_BY_ID,
+    GET_MOVIES_PAGINATED, GET_MOVIES_KEYSET, COUNT_ALL_MOVIES, GET_MOVIE_BY_ID, GET_MOVIES_BY_IDS,
     SEARCH_MOVIES_BY_TITLE, GET_DISTINCT_YEARS,
     SEARCH_MOVIES_BY_TITLE_FULLTEXT, SEARCH_MOVIES_BY_TITLE_FULLTEXT_BOOLEAN, SEARCH_MOVIES_BY_GENRES,
+    SEARCH_MOVIES_BY_TITLE_FULLTEXT_WITH_COUNT, SEARCH_MOVIES_BY_GENRES_WITH_COUNT, SEARCH_MOVIE_TITLES,
     COUNT_MOVIES_BY_GENRES, INSERT_MOVIE, INSERT_MOVIE_GENRE, CHECK_GENRE_EXISTS, INSERT_GENRE,
     LIST_ALL_GENRES, GET_NEXT_GENRE_ID, GET_NEXT_TMDB_ID, UPDATE_MOVIE,
     DELETE_MOVIE_GENRES, DELETE_MOVIE,
     GET_RATING_COUNT_FOR_MOVIE, GET_REVIEW_COUNT_FOR_MOVIE,
     DELETE_MOVIE_RATINGS, DELETE_MOVIE_REVIEWS,
-    UPDATE_MOVIE_AGGREGATES 
+    UPDATE_MOVIE_AGGREGATES,
+    CREATE_TEMP_FILTER_IDS, CLEAR_TEMP_FILTER_IDS, INSERT_TEMP_FILTER_IDS, TEMP_FILTER_IDS_CONDITION
 )
+import logging
 import threading
 
+logger = logging.getLogger(__name__)
+
+# Sort options accepted by the listing and search methods.
+# Both orders end on tmdbID DESC so pages are stable, and both are served by an index
+# (idx_movies_release_date / idx_movies_avg_rating).
+SORT_BY_RELEASE_DATE = "release_date"
+SORT_BY_RATING = "rating"
+_SORT_COLUMNS = {
+    SORT_BY_RELEASE_DATE: "m.releaseDate",
+    SORT_BY_RATING: "m.avgRating",
+}
+
+
+# tmdbID filters longer than this are loaded into a temporary table and joined instead of being
+# sent as an IN (%s, ...) list; long lists blow up statement size and parse time
+ID_FILTER_TEMP_TABLE_THRESHOLD = 500
+# Rows per INSERT when loading the temporary table, keeping each packet small
+ID_FILTER_INSERT_BATCH_SIZE = 1000
+# IDs per IN (%s, ...) list in get_movies_by_ids; longer lists are fetched in several queries
+GET_MOVIES_BY_IDS_CHUNK_SIZE = ID_FILTER_TEMP_TABLE_THRESHOLD
+
+# Columns get_movies_by_ids may select (identifiers cannot be query parameters, so they are whitelisted)
+MOVIE_COLUMNS = (
+    "tmdbID", "title", "link", "runtime", "poster", "overview", "releaseDate",
+    "totalRatings", "countRatings", "releaseYear", "avgRating",
+)
+
+
+def _sort_column(sort_by):
+    """Returns the primary sort column for sort_by, defaulting to release date."""
+    return _SORT_COLUMNS.get(sort_by or SORT_BY_RELEASE_DATE, _SORT_COLUMNS[SORT_BY_RELEASE_DATE])
+
+
+def _order_by(sort_by):
+    """Returns the ORDER BY list (without the keyword) for sort_by."""
+    return f"{_sort_column(sort_by)} DESC, m.tmdbID DESC"
+
+
+def uses_fulltext_title_search(search_term, genres=None, year=None, min_avg_rating=None, allowed_tmdbids=None):
+    """True if search_movies_with_count matches search_term with FULLTEXT (whole words, by relevance)
+    rather than LIKE '%term%': only plain title searches of four or more characters do."""
+    search_term = (search_term or "").strip()
+    return bool(search_term and len(search_term) >= 4 and not genres and not year
+                and min_avg_rating is None and allowed_tmdbids is None)
+
+
 class MovieRepository:
     _instance = None
     _lock = threading.Lock()
@@ -84,15 +133,15 @@ class MovieRepository:
             cursor.close()
             self.db_manager.close_connection(connection)
 
-    def get_movies_paginated(self, page_number, movies_per_page):
-        """Fetches a specific page of movies."""
+    def get_movies_paginated(self, page_number, movies_per_page, sort_by=None):
+        """Fetches a specific page of movies, newest first or by average rating (sort_by='rating')."""
         connection = self.db_manager.get_connection()
         if not connection:
             return [], 0 # Return empty list and 0 total count on connection failure
         cursor = connection.cursor(dictionary=True)
         try:
             offset = (page_number - 1) * movies_per_page
-            cursor.execute(GET_MOVIES_PAGINATED, (movies_per_page, offset))
+            cursor.execute(GET_MOVIES_PAGINATED.format(order_by=_order_by(sort_by)), (movies_per_page, offset))
             movies = cursor.fetchall()
             return movies
         except Exception as e:
@@ -102,6 +151,75 @@ class MovieRepository:
             cursor.close()
             self.db_manager.close_connection(connection)
 
+    def get_movies_keyset(self, cursor_key=None, movies_per_page=20, direction="next", sort_by=None):
+        """Fetches a page of movies using keyset (seek) pagination.
+
+        Unlike OFFSET paging, the query seeks straight past the boundary row using the
+        (sort key, tmdbID) ordering, so later pages cost the same as the first one.
+
+        Args:
+            cursor_key (tuple): (sort key, tmdbID) of the boundary row, or None for the first page.
+                The sort key is releaseDate, or avgRating when sort_by is 'rating'.
+                For 'next' this is the last row of the current page, for 'prev' the first row.
+            movies_per_page (int): Number of movies per page
+            direction (str): 'next' for rows after the boundary, 'prev' for rows before it
+            sort_by (str): 'release_date' (default) or 'rating'
+
+        Returns:
+            tuple: (movies in display order, bool whether more rows exist in that direction)
+        """
+        connection = self.db_manager.get_connection()
+        if not connection:
+            return [], False
+        cursor = connection.cursor(dictionary=True)
+        try:
+            backwards = direction == "prev"
+            where_clauses = []
+            params = []
+            sort_column = _sort_column(sort_by)
+            if cursor_key is not None and sort_by == SORT_BY_RATING:
+                # avgRating is NOT NULL, so a plain row comparison is enough
+                avg_rating, tmdb_id = cursor_key
+                op = ">" if backwards else "<"
+                where_clauses.append(f"(m.avgRating {op} %s OR (m.avgRating = %s AND m.tmdbID {op} %s))")
+                params.extend([float(avg_rating), float(avg_rating), tmdb_id])
+            elif cursor_key is not None:
+                release_date, tmdb_id = cursor_key
+                # MySQL sorts NULL release dates last in DESC order, so they need their own branch
+                if release_date is None:
+                    if backwards:
+                        where_clauses.append("(m.releaseDate IS NOT NULL OR m.tmdbID > %s)")
+                    else:
+                        where_clauses.append("m.releaseDate IS NULL AND m.tmdbID < %s")
+                    params.append(tmdb_id)
+                elif backwards:
+                    where_clauses.append("(m.releaseDate > %s OR (m.releaseDate = %s AND m.tmdbID > %s))")
+                    params.extend([release_date, release_date, tmdb_id])
+                else:
+                    where_clauses.append(
+                        "(m.releaseDate < %s OR (m.releaseDate = %s AND m.tmdbID < %s) OR m.releaseDate IS NULL)"
+                    )
+                    params.extend([release_date, release_date, tmdb_id])
+            where_section = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+            query = GET_MOVIES_KEYSET.format(
+                where_section=where_section, sort_column=sort_column, order="ASC" if backwards else "DESC"
+            )
+            # Fetch one extra row to find out whether another page exists
+            params.append(movies_per_page + 1)
+            cursor.execute(query, tuple(params))
+            movies = cursor.fetchall()
+            has_more = len(movies) > movies_per_page
+            movies = movies[:movies_per_page]
+            if backwards:
+                movies.reverse()
+            return movies, has_more
+        except Exception as e:
+            print(f"Error fetching movies with keyset pagination: {e}")
+            return [], False
+        finally:
+            cursor.close()
+            self.db_manager.close_connection(connection)
+
     def count_all_movies(self):
         """Counts the total number of movies in the database."""
         connection = self.db_manager.get_connection()
@@ -136,6 +254,51 @@ class MovieRepository:
             cursor.close()
             self.db_manager.close_connection(connection)
             
+    def get_movies_by_ids(self, tmdb_ids, columns=None):
+        """Fetches several movies by TMDB ID on one connection instead of one get_movie_by_id call each.
+
+        IDs are sent GET_MOVIES_BY_IDS_CHUNK_SIZE at a time, so any number of IDs can be passed.
+
+        Args:
+            tmdb_ids (iterable): TMDB IDs; duplicates are fetched once
+            columns (iterable): Names from MOVIE_COLUMNS to select (tmdbID is always included);
+                None selects every column
+
+        Returns:
+            dict: tmdbID -> movie row, in the order of tmdb_ids; IDs that do not exist are missing
+            (None on error)
+        """
+        tmdb_ids = list(dict.fromkeys(tmdb_ids or []))
+        if columns is None:
+            select_list = "m.*"
+        else:
+            unknown = [c for c in columns if c not in MOVIE_COLUMNS]
+            if unknown:
+                raise ValueError(f"Unknown movie columns: {unknown}")
+            select_list = ", ".join(f"m.{c}" for c in dict.fromkeys(["tmdbID", *columns]))
+        if not tmdb_ids:
+            return {}
+        connection = self.db_manager.get_connection()
+        if not connection:
+            return None
+        cursor = connection.cursor(dictionary=True)
+        try:
+            rows_by_id = {}
+            for start in range(0, len(tmdb_ids), GET_MOVIES_BY_IDS_CHUNK_SIZE):
+                chunk = tmdb_ids[start:start + GET_MOVIES_BY_IDS_CHUNK_SIZE]
+                query = GET_MOVIES_BY_IDS.format(columns=select_list, placeholders=','.join(['%s'] * len(chunk)))
+                cursor.execute(query, chunk)
+                for row in cursor.fetchall():
+                    rows_by_id[row['tmdbID']] = row
+            # MySQL returns each chunk in index order; rebuild the caller's order
+            return {tmdb_id: rows_by_id[tmdb_id] for tmdb_id in tmdb_ids if tmdb_id in rows_by_id}
+        except Exception as e:
+            print(f"Error fetching movies by IDs: {e}")
+            return None
+        finally:
+            cursor.close()
+            self.db_manager.close_connection(connection)
+
     def get_movie_stats(self, tmdb_id):
         """Get stats about a movie's ratings and reviews.
         
@@ -329,6 +492,62 @@ class MovieRepository:
 #     return results
 
 
+    def _load_filter_ids(self, cursor, tmdb_ids):
+        """Loads tmdb_ids into the session's tmp_filter_tmdbids table in batches.
+
+        Returns:
+            bool: True if the table holds exactly these IDs, False if it could not be used
+        """
+        try:
+            cursor.execute(CREATE_TEMP_FILTER_IDS)
+            cursor.execute(CLEAR_TEMP_FILTER_IDS)
+            for start in range(0, len(tmdb_ids), ID_FILTER_INSERT_BATCH_SIZE):
+                batch = tmdb_ids[start:start + ID_FILTER_INSERT_BATCH_SIZE]
+                cursor.executemany(INSERT_TEMP_FILTER_IDS, [(int(tmdb_id),) for tmdb_id in batch])
+            return True
+        except Exception as e:
+            # e.g. missing CREATE TEMPORARY TABLES privilege; the caller falls back to an IN list
+            print(f"Error loading tmdbID filter table, using an IN list instead: {e}")
+            return False
+
+    def _append_search_filters(self, where_clauses, params, search_term=None, year=None, min_avg_rating=None, allowed_tmdbids=None, cursor=None):
+        """Appends the title, year, rating and tmdbID filters shared by every search query.
+
+        Genre handling differs between the query shapes, so callers add it themselves.
+        With a cursor, tmdbID filters above ID_FILTER_TEMP_TABLE_THRESHOLD are loaded into a
+        temporary table on the cursor's connection and joined, rather than inlined as an IN list.
+
+        Returns:
+            bool: False if allowed_tmdbids is an empty list (nothing can match), True otherwise
+        """
+        if search_term:
+            where_clauses.append("m.title LIKE %s")
+            params.append(f"%{search_term}%")
+        if year:
+            if isinstance(year, (list, tuple)) and len(year) == 2:
+                min_year, max_year = map(int, year)
+                where_clauses.append("m.releaseYear BETWEEN %s AND %s")
+                params.extend([min_year, max_year])
+            else:
+                where_clauses.append("m.releaseYear = %s")
+                params.append(int(year))
+        if min_avg_rating is not None:
+            where_clauses.append("m.avgRating >= %s")
+            params.append(float(min_avg_rating))
+        if allowed_tmdbids is not None:
+            if not allowed_tmdbids:
+                return False
+            allowed_tmdbids = list(allowed_tmdbids)
+            if (cursor is not None and len(allowed_tmdbids) > ID_FILTER_TEMP_TABLE_THRESHOLD
+                    and self._load_filter_ids(cursor, allowed_tmdbids)):
+                print(f"DEBUG: Filtering on {len(allowed_tmdbids)} tmdbIDs through a temporary table")
+                where_clauses.append(TEMP_FILTER_IDS_CONDITION)
+                return True
+            tmdbid_placeholders = ','.join(['%s'] * len(allowed_tmdbids))
+            where_clauses.append(f"m.tmdbID IN ({tmdbid_placeholders})")
+            params.extend(allowed_tmdbids)
+        return True
+
     def count_search_results(self, search_term=None, genres=None, allowed_tmdbids=None, year=None, min_avg_rating=None):
         """Counts the total number of movies matching the search criteria."""
 
@@ -337,7 +556,8 @@ class MovieRepository:
             return 0
         cursor = connection.cursor(dictionary=True)
         try:
-            use_fulltext = (search_term and len(search_term) >= 4 and not genres and not year and min_avg_rating is None)
+            use_fulltext = (search_term and len(search_term) >= 4 and not genres and not year
+                            and min_avg_rating is None and allowed_tmdbids is None)
             if use_fulltext:
                 query = """
                 SELECT COUNT(DISTINCT m.tmdbID) as total 
@@ -353,31 +573,12 @@ class MovieRepository:
                 if genres is not None and isinstance(genres, list) and len(genres) > 0:
                     query += " JOIN Movie_Genre mg ON m.tmdbID = mg.tmdbID JOIN Genre g ON mg.genreID = g.genreID"
                 where_clauses = []
-                if search_term:
-                    where_clauses.append("m.title LIKE %s")
-                    params.append(f"%{search_term}%")
                 if genres is not None and isinstance(genres, list) and len(genres) > 0:
                     placeholders = ','.join(['%s'] * len(genres))
                     where_clauses.append(f"g.genreName IN ({placeholders})")
                     params.extend(genres)
-                if year:
-                    if isinstance(year, (list, tuple)) and len(year) == 2:
-                        min_year, max_year = year
-                        where_clauses.append("YEAR(m.releaseDate) BETWEEN %s AND %s")
-                        params.extend([min_year, max_year])
-                    else:
-                        where_clauses.append("YEAR(m.releaseDate) = %s")
-                        params.append(int(year))
-                if min_avg_rating is not None:
-                    where_clauses.append("(CASE WHEN m.countRatings > 0 THEN m.totalRatings / m.countRatings ELSE 0 END) >= %s")
-                    params.append(float(min_avg_rating))
-                if allowed_tmdbids is not None:
-                    if allowed_tmdbids:
-                        placeholders = ','.join(['%s'] * len(allowed_tmdbids))
-                        where_clauses.append(f"m.tmdbID IN ({placeholders})")
-                        params.extend(allowed_tmdbids)
-                    else:
-                        return 0  # No matches
+                if not self._append_search_filters(where_clauses, params, search_term, year, min_avg_rating, allowed_tmdbids, cursor=cursor):
+                    return 0  # No matches
                 if where_clauses:
                     query += " WHERE " + " AND ".join(where_clauses)
             cursor.execute(query, tuple(params))
@@ -390,10 +591,11 @@ class MovieRepository:
             cursor.close()
             self.db_manager.close_connection(connection)
 
-    def search_movies(self, search_term=None, genres=None, allowed_tmdbids=None, year=None, min_avg_rating=None, offset=0, limit=None):
+    def search_movies(self, search_term=None, genres=None, allowed_tmdbids=None, year=None, min_avg_rating=None, offset=0, limit=None, sort_by=None):
         """
         Searches movies by optional title, genre list, year, and min rating filters with pagination.
         If genres is None, ignores genre filter (returns all).
+        sort_by='rating' orders by average rating instead of release date (or FULLTEXT relevance).
         """
         # Normalize empty strings to None
         if search_term is not None:
@@ -418,6 +620,11 @@ class MovieRepository:
             if use_fulltext:
                 cursor.execute(SEARCH_MOVIES_BY_TITLE_FULLTEXT, (search_term, search_term))
                 all_results = cursor.fetchall()
+                if sort_by == SORT_BY_RATING:
+                    all_results.sort(
+                        key=lambda m: ((m['totalRatings'] or 0) / m['countRatings'] if m['countRatings'] else 0, m['tmdbID']),
+                        reverse=True
+                    )
                 limit = limit if limit else 20
                 start = offset
                 end = offset + limit
@@ -432,33 +639,14 @@ class MovieRepository:
                 where_clauses = [f"g.genreName IN ({placeholders})"]
                 query_params = list(genres)
                 # Additional filters
-                if search_term:
-                    where_clauses.append("m.title LIKE %s")
-                    query_params.append(f"%{search_term}%")
-                if year:
-                    if isinstance(year, (list, tuple)) and len(year) == 2:
-                        min_year, max_year = map(int, year)
-                        where_clauses.append("YEAR(m.releaseDate) BETWEEN %s AND %s")
-                        query_params.extend([min_year, max_year])
-                    else:
-                        where_clauses.append("YEAR(m.releaseDate) = %s")
-                        query_params.append(int(year))
-                if min_avg_rating is not None:
-                    where_clauses.append("(CASE WHEN m.countRatings > 0 THEN m.totalRatings / m.countRatings ELSE 0 END) >= %s")
-                    query_params.append(float(min_avg_rating))
-                if allowed_tmdbids is not None:
-                    if allowed_tmdbids:
-                        tmdbid_placeholders = ','.join(['%s'] * len(allowed_tmdbids))
-                        where_clauses.append(f"m.tmdbID IN ({tmdbid_placeholders})")
-                        query_params.extend(allowed_tmdbids)
-                    else:
-                        return []
+                if not self._append_search_filters(where_clauses, query_params, search_term, year, min_avg_rating, allowed_tmdbids, cursor=cursor):
+                    return []
                 where_section = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
                 query_params.append(len(genres))
                 limit = max(1, int(limit)) if limit else 20
                 offset = max(0, int(offset)) if offset else 0
                 query_params.extend([limit, offset])
-                query = base_sql.format(where_section=where_section)
+                query = base_sql.format(where_section=where_section, order_by=_order_by(sort_by))
                 cursor.execute(query, tuple(query_params))
                 print(f"DEBUG: Multi-genre AND SQL: {query}")
                 return cursor.fetchall()
@@ -466,39 +654,20 @@ class MovieRepository:
             # Single-genre or fallback logic
             query = (
                 "SELECT DISTINCT m.tmdbID, m.title, m.poster, m.overview, m.releaseDate, "
-                "m.runtime, m.totalRatings, m.countRatings FROM Movies m"
+                "m.runtime, m.totalRatings, m.countRatings, m.avgRating FROM Movies m"
             )
             params = []
             if genres:  # For single genre as a string or single-item list
                 query += " JOIN Movie_Genre mg ON m.tmdbID = mg.tmdbID JOIN Genre g ON mg.genreID = g.genreID"
             where_clauses = []
-            if search_term:
-                where_clauses.append("m.title LIKE %s")
-                params.append(f"%{search_term}%")
             if genres:
                 where_clauses.append("g.genreName = %s")
                 params.append(genres[0] if isinstance(genres, list) else genres)
-            if year:
-                if isinstance(year, (list, tuple)) and len(year) == 2:
-                    min_year, max_year = map(int, year)
-                    where_clauses.append("YEAR(m.releaseDate) BETWEEN %s AND %s")
-                    params.extend([min_year, max_year])
-                else:
-                    where_clauses.append("YEAR(m.releaseDate) = %s")
-                    params.append(int(year))
-            if min_avg_rating is not None:
-                where_clauses.append("(CASE WHEN m.countRatings > 0 THEN m.totalRatings / m.countRatings ELSE 0 END) >= %s")
-                params.append(float(min_avg_rating))
-            if allowed_tmdbids is not None:
-                if allowed_tmdbids:
-                    tmdbid_placeholders = ','.join(['%s'] * len(allowed_tmdbids))
-                    where_clauses.append(f"m.tmdbID IN ({tmdbid_placeholders})")
-                    params.extend(allowed_tmdbids)
-                else:
-                    return []
+            if not self._append_search_filters(where_clauses, params, search_term, year, min_avg_rating, allowed_tmdbids, cursor=cursor):
+                return []
             if where_clauses:
                 query += " WHERE " + " AND ".join(where_clauses)
-            query += " ORDER BY m.releaseDate DESC, m.tmdbID DESC"
+            query += " ORDER BY " + _order_by(sort_by)
             limit = max(1, int(limit)) if limit else 20
             offset = max(0, int(offset)) if offset else 0
             query += " LIMIT %s OFFSET %s"
@@ -514,12 +683,142 @@ class MovieRepository:
             cursor.close()
             self.db_manager.close_connection(connection)
 
+    def search_movies_with_count(self, search_term=None, genres=None, allowed_tmdbids=None, year=None, min_avg_rating=None, offset=0, limit=None, sort_by=None):
+        """Searches movies and counts all matches in a single statement.
+
+        Takes the same filters as search_movies, but each branch (FULLTEXT, multi-genre AND
+        and fallback) adds a COUNT(*) OVER() column, so one query and one pool checkout
+        return both the requested page and the total number of matches.
+
+        Returns:
+            tuple: (list of movies for the page, total number of matching movies).
+                The total is 0 when the page is empty, including when offset is past the last match.
+        """
+        # Normalize empty strings to None
+        if search_term is not None:
+            search_term = search_term.strip()
+            if search_term == "":
+                search_term = None
+
+        if not search_term and not genres and not year and min_avg_rating is None and not allowed_tmdbids:
+            print("DEBUG: No search criteria provided, returning empty result set.")
+            return [], 0
+
+        limit = max(1, int(limit)) if limit else 20
+        offset = max(0, int(offset)) if offset else 0
+
+        connection = self.db_manager.get_connection()
+        if not connection:
+            print("DEBUG: Failed to get database connection.")
+            return [], 0
+
+        cursor = connection.cursor(dictionary=True)
+        try:
+            use_fulltext = uses_fulltext_title_search(search_term, genres, year, min_avg_rating, allowed_tmdbids)
+            if use_fulltext:
+                order_by = _order_by(sort_by) if sort_by == SORT_BY_RATING else "relevance_score DESC, m.releaseDate DESC"
+                query = SEARCH_MOVIES_BY_TITLE_FULLTEXT_WITH_COUNT.format(order_by=order_by)
+                cursor.execute(query, (search_term, search_term, limit, offset))
+            elif genres is not None and isinstance(genres, list) and len(genres) > 1:
+                # Multi-genre AND logic: the window count runs after GROUP BY/HAVING, so it counts movies
+                placeholders = ','.join(['%s'] * len(genres))
+                where_clauses = [f"g.genreName IN ({placeholders})"]
+                params = list(genres)
+                if not self._append_search_filters(where_clauses, params, search_term, year, min_avg_rating, allowed_tmdbids, cursor=cursor):
+                    return [], 0
+                params.extend([len(genres), limit, offset])
+                query = SEARCH_MOVIES_BY_GENRES_WITH_COUNT.format(
+                    where_section="WHERE " + " AND ".join(where_clauses), order_by=_order_by(sort_by)
+                )
+                cursor.execute(query, tuple(params))
+            else:
+                # Single-genre or fallback logic. GROUP BY replaces DISTINCT here because the
+                # window count is evaluated before DISTINCT but after GROUP BY.
+                query = (
+                    "SELECT m.tmdbID, m.title, m.poster, m.overview, m.releaseDate, "
+                    "m.runtime, m.totalRatings, m.countRatings, COUNT(*) OVER() AS total_count FROM Movies m"
+                )
+                params = []
+                where_clauses = []
+                if genres:
+                    query += " JOIN Movie_Genre mg ON m.tmdbID = mg.tmdbID JOIN Genre g ON mg.genreID = g.genreID"
+                    where_clauses.append("g.genreName = %s")
+                    params.append(genres[0] if isinstance(genres, list) else genres)
+                if not self._append_search_filters(where_clauses, params, search_term, year, min_avg_rating, allowed_tmdbids, cursor=cursor):
+                    return [], 0
+                if where_clauses:
+                    query += " WHERE " + " AND ".join(where_clauses)
+                if genres:
+                    query += " GROUP BY m.tmdbID"
+                query += " ORDER BY " + _order_by(sort_by) + " LIMIT %s OFFSET %s"
+                params.extend([limit, offset])
+                cursor.execute(query, tuple(params))
+
+            movies = cursor.fetchall()
+            total = int(movies[0]['total_count']) if movies else 0
+            for movie in movies:
+                movie.pop('total_count', None)
+            print(f"DEBUG: Combined search returned {len(movies)} movies of {total} total matches.")
+            return movies, total
+        except Exception as e:
+            print(f"Error searching movies with count: {e}")
+            return [], 0
+        finally:
+            cursor.close()
+            self.db_manager.close_connection(connection)
+
+    def search_movie_titles(self, search_term=None, genres=None, allowed_tmdbids=None, year=None, min_avg_rating=None, sort_by=None, limit=None):
+        """Returns the tmdbID and title of every movie matching the filters, in search order.
+
+        Titles are always matched with LIKE '%term%' (never FULLTEXT); genres, year, rating,
+        tmdbID filters and the order are as in search_movies_with_count. At most limit rows.
+
+        Returns:
+            list: [{'tmdbID', 'title'}], or None on error
+        """
+        search_term = (search_term or "").strip() or None
+        connection = self.db_manager.get_connection()
+        if not connection:
+            return None
+        cursor = connection.cursor(dictionary=True)
+        try:
+            where_clauses = []
+            params = []
+            genre_join = group_section = ""
+            if genres:
+                genres = genres if isinstance(genres, list) else [genres]
+                genre_join = "JOIN Movie_Genre mg ON m.tmdbID = mg.tmdbID JOIN Genre g ON mg.genreID = g.genreID"
+                where_clauses.append(f"g.genreName IN ({','.join(['%s'] * len(genres))})")
+                params.extend(genres)
+            if not self._append_search_filters(where_clauses, params, search_term, year, min_avg_rating, allowed_tmdbids, cursor=cursor):
+                return []
+            if genres:
+                group_section = "GROUP BY m.tmdbID HAVING COUNT(DISTINCT g.genreName) = %s"
+                params.append(len(genres))
+            params.append(max(1, int(limit)) if limit else 1000)
+            query = SEARCH_MOVIE_TITLES.format(
+                genre_join=genre_join,
+                where_section="WHERE " + " AND ".join(where_clauses) if where_clauses else "",
+                group_section=group_section,
+                order_by=_order_by(sort_by)
+            )
+            cursor.execute(query, tuple(params))
+            titles = cursor.fetchall()
+            logger.debug("Title search for '%s' returned %d movies", search_term, len(titles))
+            return titles
+        except Exception as e:
+            print(f"Error searching movie titles: {e}")
+            return None
+        finally:
+            cursor.close()
+            self.db_manager.close_connection(connection)
 
     def get_available_years(self):
         """Returns a list of years actually present in Movies.releaseDate, descending.
 
         This uses the `GET_DISTINCT_YEARS` query so the dropdown reflects only
         years that exist in the database (no artificial continuous ranges).
+        The query reads the indexed releaseYear column, so it is answered from the index.
         """
         connection = self.db_manager.get_connection()
         if not connection:
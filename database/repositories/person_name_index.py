@@ -0,0 +1,141 @@
+# database/repositories/person_name_index.py
+"""In-memory inverted index of cast/crew names for CastCrewRepository.find_tmdbids_by_cast/crew."""
+from array import array
+from bisect import bisect_left, insort
+from database.repositories.person_names import NAME_SEARCH_PREFIX, normalize_person_name
+import threading
+
+
+class PersonNameIndex:
+    """Maps normalized name tokens to the movies a person is credited in, for one credit collection.
+
+    Every distinct credit key (name, or name + job for crew) becomes an entry holding a sorted
+    array('i') of tmdbIDs. Tokens and full names are kept in sorted lists, so a prefix query is
+    two bisects and a multi-word query intersects the entry postings of each word. Matching follows
+    name_search_filter: in token mode all query words must prefix words of the same name.
+    """
+
+    def __init__(self, with_job=False):
+        self.with_job = with_job
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._entry_ids = {}           # (name, job) -> entry id
+        self._entry_keys = []          # entry id -> (name, job)
+        self._entry_movies = []        # entry id -> sorted array('i') of tmdbIDs
+        self._token_entries = {}       # token -> array('i') of entry ids (ascending, ids only grow)
+        self._tokens = []              # sorted distinct tokens, for prefix ranges
+        self._name_entries = {}        # name_norm -> array('i') of entry ids
+        self._names = []               # sorted distinct name_norm values
+
+    def __len__(self):
+        return len(self._entry_keys)
+
+    def _key(self, name, job=None):
+        return (name, job if self.with_job else None)
+
+    def _entry(self, name, job=None, keep_sorted=True):
+        """Returns the entry id for a credit key, creating and indexing it if needed.
+
+        With keep_sorted=False new tokens and names are appended unsorted; load() sorts them once
+        at the end instead of paying an insort per value.
+        """
+        key = self._key(name, job)
+        entry_id = self._entry_ids.get(key)
+        if entry_id is not None:
+            return entry_id
+        entry_id = len(self._entry_keys)
+        self._entry_ids[key] = entry_id
+        self._entry_keys.append(key)
+        self._entry_movies.append(array('i'))
+        name_norm = normalize_person_name(name)
+        for token in set(name_norm.split()):
+            if token not in self._token_entries:
+                self._token_entries[token] = array('i')
+                if keep_sorted:
+                    insort(self._tokens, token)
+                else:
+                    self._tokens.append(token)
+            self._token_entries[token].append(entry_id)
+        if name_norm not in self._name_entries:
+            self._name_entries[name_norm] = array('i')
+            if keep_sorted:
+                insort(self._names, name_norm)
+            else:
+                self._names.append(name_norm)
+        self._name_entries[name_norm].append(entry_id)
+        return entry_id
+
+    def load(self, credits):
+        """Replaces the index contents with the given iterable of {'tmdbID', 'name'[, 'job']} documents."""
+        with self._lock:
+            self._reset()
+            pending = {}
+            for doc in credits:
+                if doc.get("name") and doc.get("tmdbID") is not None:
+                    entry_id = self._entry(doc["name"], doc.get("job"), keep_sorted=False)
+                    pending.setdefault(entry_id, set()).add(int(doc["tmdbID"]))
+            self._tokens.sort()
+            self._names.sort()
+            for entry_id, movies in pending.items():
+                self._entry_movies[entry_id] = array('i', sorted(movies))
+        return len(self._entry_keys)
+
+    def add(self, tmdb_id, name, job=None):
+        """Records that name (with job, for crew) is credited in the movie."""
+        if not name:
+            return
+        with self._lock:
+            movies = self._entry_movies[self._entry(name, job)]
+            pos = bisect_left(movies, tmdb_id)
+            if pos == len(movies) or movies[pos] != tmdb_id:
+                movies.insert(pos, tmdb_id)
+
+    def remove(self, tmdb_id, name, job=None):
+        """Removes the credit of name (with job, for crew) from the movie."""
+        with self._lock:
+            entry_id = self._entry_ids.get(self._key(name, job))
+            if entry_id is None:
+                return
+            movies = self._entry_movies[entry_id]
+            pos = bisect_left(movies, tmdb_id)
+            if pos < len(movies) and movies[pos] == tmdb_id:
+                del movies[pos]
+
+    @staticmethod
+    def _prefix_range(sorted_values, prefix):
+        start = bisect_left(sorted_values, prefix)
+        end = bisect_left(sorted_values, prefix + "\U0010ffff")
+        return sorted_values[start:end]
+
+    def _entries_with_prefix(self, values, postings, prefix):
+        entries = set()
+        for value in self._prefix_range(values, prefix):
+            entries.update(postings[value])
+        return entries
+
+    def find_tmdbids(self, query, mode, job=None):
+        """Returns the sorted tmdbIDs matching a token or prefix name query (see person_names)."""
+        query_norm = normalize_person_name(query)
+        if not query_norm:
+            return []
+        with self._lock:
+            if mode == NAME_SEARCH_PREFIX:
+                entries = self._entries_with_prefix(self._names, self._name_entries, query_norm)
+            else:
+                entries = None
+                # Longest (most selective) word first keeps the intermediate sets small
+                for token in sorted(set(query_norm.split()), key=len, reverse=True):
+                    matched = self._entries_with_prefix(self._tokens, self._token_entries, token)
+                    entries = matched if entries is None else entries & matched
+                    if not entries:
+                        return []
+            if job and self.with_job:
+                entries = {e for e in entries if self._entry_keys[e][1] == job}
+            if len(entries) == 1:
+                return list(self._entry_movies[next(iter(entries))])
+            movies = set()
+            for entry_id in entries:
+                movies.update(self._entry_movies[entry_id])
+        return sorted(movies)
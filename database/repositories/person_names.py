@@ -0,0 +1,38 @@
+# database/repositories/person_names.py
+"""Normalized person-name fields and search filters shared by the cast/crew storage layouts."""
+import re
+import unicodedata
+
+# Name search modes for find_tmdbids_by_cast / find_tmdbids_by_crew
+NAME_SEARCH_TOKEN = "token"        # every query word is a prefix of a word in the name (indexed, default)
+NAME_SEARCH_PREFIX = "prefix"      # the whole name starts with the query (indexed)
+NAME_SEARCH_CONTAINS = "contains"  # case-insensitive substring anywhere (legacy, full collection scan)
+
+
+def normalize_person_name(name):
+    """Lower-cases and accent-folds a person's name for indexed search ("Penélope Cruz" -> "penelope cruz")."""
+    if not name:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(name))
+    folded = "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+    # Punctuation separates words ("Jean-Luc" -> "jean luc"), whitespace is collapsed
+    return " ".join(re.sub(r"[^\w]+", " ", folded).split())
+
+
+def person_name_fields(name):
+    """Returns the derived search fields stored alongside 'name' on every cast/crew document."""
+    name_norm = normalize_person_name(name)
+    return {"name_norm": name_norm, "name_tokens": name_norm.split()}
+
+
+def name_search_filter(query, mode):
+    """Builds the MongoDB filter for a name search in the given mode, or None if the query is empty."""
+    if mode == NAME_SEARCH_CONTAINS:
+        return {"name": {"$regex": re.escape(query.strip()), "$options": "i"}} if query and query.strip() else None
+    query_norm = normalize_person_name(query)
+    if not query_norm:
+        return None
+    if mode == NAME_SEARCH_PREFIX:
+        # Anchored, case-sensitive regex on the lower-cased field can walk the name_norm index
+        return {"name_norm": {"$regex": "^" + re.escape(query_norm)}}
+    return {"$and": [{"name_tokens": {"$regex": "^" + re.escape(token)}} for token in query_norm.split()]}
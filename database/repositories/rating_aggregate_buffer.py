@@ -0,0 +1,186 @@
+# database/repositories/rating_aggregate_buffer.py
+
+from database.db_connection import MySQLConnectionManager
+from database.sql_queries import UPDATE_MOVIE_AGGREGATES_BATCH
+from decimal import Decimal
+import threading
+import time
+
+
+class RatingAggregateBuffer:
+    """Thread-safe singleton write-behind buffer for Movies.totalRatings/countRatings.
+
+    Rating rows are committed immediately by RatingRepository; only the per-movie aggregate
+    deltas are buffered here. Deltas for the same movie coalesce in memory, so a burst of
+    ratings on one popular title becomes a single row update instead of one per rating.
+    Buffered deltas are flushed in batched UPDATE ... CASE statements when the oldest pending
+    delta reaches max_staleness seconds, when max_pending movies are buffered, or on shutdown_pool.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(RatingAggregateBuffer, cls).__new__(cls)
+                    cls._instance.db_manager = MySQLConnectionManager()
+                    cls._instance._pending = {}        # tmdbID -> [delta_total (Decimal), delta_count]
+                    cls._instance._oldest_pending = None
+                    cls._instance._pending_lock = threading.Lock()
+                    cls._instance._flush_lock = threading.Lock()
+                    cls._instance._wake = threading.Event()
+                    cls._instance._stop = threading.Event()
+                    cls._instance._thread = None
+                    cls._instance.max_staleness = 2.0   # seconds an aggregate may lag behind the Ratings table
+                    cls._instance.max_pending = 500     # buffered movies that trigger an early flush
+                    cls._instance.batch_size = 200      # movies per UPDATE statement
+        return cls._instance
+
+    def start(self, max_staleness=None, max_pending=None):
+        """Starts the background flusher (idempotent) and registers the flush-on-shutdown hook."""
+        if max_staleness is not None:
+            self.max_staleness = max(0.05, float(max_staleness))
+        if max_pending is not None:
+            self.max_pending = max(1, int(max_pending))
+        self.db_manager.register_shutdown_hook(self.stop)
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="RatingAggregateFlusher", daemon=True)
+            self._thread.start()
+        print(f"DEBUG: RatingAggregateBuffer started (max_staleness={self.max_staleness}s, max_pending={self.max_pending})")
+
+    def stop(self):
+        """Stops the background flusher and flushes everything still buffered."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._stop.set()
+            self._wake.set()
+            thread.join(timeout=max(5.0, self.max_staleness * 2))
+        return self.flush()
+
+    def is_running(self):
+        """Returns True while the background flusher thread is alive."""
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def add(self, tmdb_id, delta_total, delta_count):
+        """Buffers an aggregate delta for a movie whose rating change is already committed."""
+        if delta_total == 0 and delta_count == 0:
+            return
+        delta_total = Decimal(str(delta_total))  # Summed exactly, like the decimal(2,1) ratings
+        with self._pending_lock:
+            entry = self._pending.setdefault(tmdb_id, [Decimal(0), 0])
+            entry[0] += delta_total
+            entry[1] += delta_count
+            if self._oldest_pending is None:
+                self._oldest_pending = time.monotonic()
+            size = len(self._pending)
+        if size >= self.max_pending:
+            self._wake.set()
+        if not self.is_running():
+            # No flusher (e.g. stopped during shutdown): apply right away rather than lose the delta
+            self.flush()
+
+    def pending_count(self):
+        """Returns the number of movies with buffered deltas."""
+        with self._pending_lock:
+            return len(self._pending)
+
+    def _run(self):
+        """Flusher loop: sleeps until the oldest delta is due or the size threshold wakes it."""
+        while not self._stop.is_set():
+            with self._pending_lock:
+                oldest = self._oldest_pending
+                size = len(self._pending)
+            if oldest is None:
+                timeout = self.max_staleness
+            elif size >= self.max_pending:
+                timeout = 0
+            else:
+                timeout = max(0.0, oldest + self.max_staleness - time.monotonic())
+            if timeout > 0:
+                self._wake.wait(timeout)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            with self._pending_lock:
+                due = self._pending and (
+                    len(self._pending) >= self.max_pending
+                    or time.monotonic() - self._oldest_pending >= self.max_staleness
+                )
+            if due and self.flush() == 0 and self.pending_count():
+                # Database unavailable: back off instead of spinning on the requeued deltas
+                self._stop.wait(self.max_staleness)
+
+    def flush(self):
+        """Writes all buffered deltas to Movies in batched statements.
+
+        Batches that fail are merged back into the buffer so no delta is lost.
+
+        Returns:
+            int: Number of movies whose aggregates were written
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                if not self._pending:
+                    return 0
+                pending = self._pending
+                self._pending = {}
+                self._oldest_pending = None
+
+            # Lock Movies rows in a consistent order so concurrent flushes/writers cannot deadlock
+            tmdb_ids = sorted(pending)
+            flushed = 0
+            for start in range(0, len(tmdb_ids), self.batch_size):
+                batch = tmdb_ids[start:start + self.batch_size]
+                if self._write_batch(batch, pending):
+                    flushed += len(batch)
+                else:
+                    self._requeue({tmdb_id: pending[tmdb_id] for tmdb_id in batch})
+            print(f"DEBUG: RatingAggregateBuffer flushed aggregates for {flushed} of {len(tmdb_ids)} movies")
+            return flushed
+
+    def _write_batch(self, tmdb_ids, pending):
+        """Applies the deltas of one batch of movies in a single UPDATE ... CASE statement."""
+        connection = self.db_manager.get_connection()
+        if not connection:
+            return False
+        cursor = connection.cursor()
+        try:
+            case_sql = " ".join(["WHEN %s THEN %s"] * len(tmdb_ids))
+            query = UPDATE_MOVIE_AGGREGATES_BATCH.format(
+                total_cases=case_sql,
+                count_cases=case_sql,
+                id_placeholders=",".join(["%s"] * len(tmdb_ids))
+            )
+            params = []
+            for tmdb_id in tmdb_ids:
+                params.extend([tmdb_id, pending[tmdb_id][0]])
+            for tmdb_id in tmdb_ids:
+                params.extend([tmdb_id, pending[tmdb_id][1]])
+            params.extend(tmdb_ids)
+            cursor.execute(query, tuple(params))
+            connection.commit()
+            return True
+        except Exception as e:
+            print(f"Error flushing buffered rating aggregates: {e}")
+            connection.rollback()
+            return False
+        finally:
+            cursor.close()
+            self.db_manager.close_connection(connection)
+
+    def _requeue(self, deltas):
+        """Merges deltas from a failed flush back into the buffer for the next attempt."""
+        with self._pending_lock:
+            for tmdb_id, (delta_total, delta_count) in deltas.items():
+                entry = self._pending.setdefault(tmdb_id, [Decimal(0), 0])
+                entry[0] += delta_total
+                entry[1] += delta_count
+            if self._oldest_pending is None:
+                self._oldest_pending = time.monotonic()
@@ -4,10 +4,29 @@ from database.sql_queries import (
     GET_USER_RATINGS_AND_REVIEWS_UNIFIED, INSERT_RATING, UPDATE_RATING, DELETE_RATING,
     GET_RATING_BY_USER_AND_MOVIE, GET_RATINGS_FOR_MOVIE,
     GET_SUM_AND_COUNT_RATINGS_FOR_MOVIE, GET_USER_RATINGS,
-    UPDATE_MOVIE_AGGREGATES_ATOMIC  # Add this import
+    UPDATE_MOVIE_AGGREGATES_ATOMIC, UPDATE_MOVIE_AGGREGATES_DELTA, GET_RATING_FOR_UPDATE,
+    GET_MOVIE_ID_CHUNK_END, FIND_AGGREGATE_DRIFT_IN_RANGE, REPAIR_AGGREGATE_DRIFT_IN_RANGE,
+    GET_RATINGS_FOR_UPDATE_BY_KEYS, GET_EXISTING_MOVIE_IDS, GET_EXISTING_USER_IDS,
+    RECOMPUTE_MOVIE_AGGREGATES_FOR_IDS, UPDATE_MOVIE_AGGREGATES_BATCH,
+    GET_USER_RATING_AND_REVIEW_FOR_MOVIE
 )
+from database.repositories.rating_aggregate_buffer import RatingAggregateBuffer
+from decimal import Decimal, ROUND_HALF_UP
 import threading
 
+# How rating writes maintain Movies.totalRatings/countRatings
+AGGREGATE_MODE_DELTA = "delta"          # add the old->new difference (cost independent of rating count)
+AGGREGATE_MODE_RECOMPUTE = "recompute"  # re-run SUM/COUNT over all of the movie's ratings (fallback)
+AGGREGATE_MODE_WRITE_BEHIND = "write_behind"  # buffer deltas in-process, flush in batches (bounded staleness)
+
+
+def _stored_rating(rating):
+    """Returns rating as the Decimal Ratings.rating (decimal(2,1)) will store, so aggregate deltas match the rows.
+
+    MySQL rounds half away from zero on the decimal value (2.25 -> 2.3), unlike round() on a binary float.
+    """
+    return Decimal(str(rating)).quantize(Decimal("0.1"), rounding=ROUND_HALF_UP)
+
 class RatingRepository:
     _instance = None
     _lock = threading.Lock()
@@ -18,8 +37,63 @@ class RatingRepository:
                 if cls._instance is None:
                     cls._instance = super(RatingRepository, cls).__new__(cls)
                     cls._instance.db_manager = MySQLConnectionManager()
+                    cls._instance.aggregate_mode = AGGREGATE_MODE_DELTA
         return cls._instance
 
+    def set_aggregate_mode(self, mode, max_staleness=None, max_pending=None):
+        """Selects how Movies.totalRatings/countRatings are maintained on rating writes.
+
+        Args:
+            mode (str): AGGREGATE_MODE_DELTA (default) applies the old->new difference of the write,
+                AGGREGATE_MODE_RECOMPUTE re-runs SUM/COUNT over all of the movie's ratings,
+                AGGREGATE_MODE_WRITE_BEHIND commits the rating row immediately and buffers the
+                delta in RatingAggregateBuffer, so aggregates may lag by up to max_staleness seconds.
+            max_staleness (float): Write-behind only, longest time a delta may stay buffered
+            max_pending (int): Write-behind only, number of buffered movies that forces a flush
+        """
+        if mode not in (AGGREGATE_MODE_DELTA, AGGREGATE_MODE_RECOMPUTE, AGGREGATE_MODE_WRITE_BEHIND):
+            raise ValueError(f"Unknown aggregate mode: {mode}")
+        buffer = RatingAggregateBuffer()
+        if mode == AGGREGATE_MODE_WRITE_BEHIND:
+            buffer.start(max_staleness=max_staleness, max_pending=max_pending)
+        elif self.aggregate_mode == AGGREGATE_MODE_WRITE_BEHIND:
+            # Leaving write-behind: apply whatever is still buffered before writes go direct again
+            buffer.stop()
+        self.aggregate_mode = mode
+        print(f"DEBUG: RatingRepository aggregate mode set to '{mode}'")
+
+    def _lock_existing_rating(self, cursor, user_id, tmdb_id):
+        """Returns the user's current rating for the movie (None if absent), locking the row for the transaction."""
+        cursor.execute(GET_RATING_FOR_UPDATE, (user_id, tmdb_id))
+        row = cursor.fetchone()
+        return _stored_rating(row[0]) if row and row[0] is not None else None
+
+    def _apply_aggregate_change(self, cursor, tmdb_id, old_rating, new_rating):
+        """Updates the movie's aggregates inside the caller's transaction.
+
+        old_rating/new_rating are None when the rating did not exist before/after the write.
+
+        Returns:
+            tuple or None: In write-behind mode, the (tmdb_id, delta_total, delta_count) to hand to
+                _defer_aggregate_change once the transaction has committed; None otherwise
+        """
+        if self.aggregate_mode == AGGREGATE_MODE_RECOMPUTE:
+            cursor.execute(UPDATE_MOVIE_AGGREGATES_ATOMIC, (tmdb_id, tmdb_id, tmdb_id))
+            return None
+        delta_total = (new_rating or Decimal(0)) - (old_rating or Decimal(0))
+        delta_count = (new_rating is not None) - (old_rating is not None)
+        if delta_total == 0 and delta_count == 0:
+            return None  # Same value re-submitted, aggregates are unchanged
+        if self.aggregate_mode == AGGREGATE_MODE_WRITE_BEHIND:
+            return tmdb_id, delta_total, delta_count
+        cursor.execute(UPDATE_MOVIE_AGGREGATES_DELTA, (delta_total, delta_count, tmdb_id))
+        return None
+
+    def _defer_aggregate_change(self, deferred):
+        """Buffers a committed write's aggregate delta (write-behind mode)."""
+        if deferred is not None:
+            RatingAggregateBuffer().add(*deferred)
+
     def create_rating(self, user_id, tmdb_id, rating):
         """Inserts a new rating or updates if it exists, with atomic aggregate update."""
         connection = self.db_manager.get_connection()
@@ -30,15 +104,22 @@ class RatingRepository:
         try:
             # Start transaction
             connection.start_transaction()
-            
-            # 1. Insert/update the rating
+
+            # 1. Read (and lock) the previous value so the delta is exact under concurrency
+            old_rating = None
+            if self.aggregate_mode != AGGREGATE_MODE_RECOMPUTE:
+                old_rating = self._lock_existing_rating(cursor, user_id, tmdb_id)
+
+            # 2. Insert/update the rating
+            rating = _stored_rating(rating)
             cursor.execute(INSERT_RATING, (user_id, tmdb_id, rating))
-            
-            # 2. Recalculate and update aggregates atomically
-            cursor.execute(UPDATE_MOVIE_AGGREGATES_ATOMIC, (tmdb_id, tmdb_id, tmdb_id))
-            
-            # Commit both operations together
+
+            # 3. Update aggregates in the same transaction
+            deferred = self._apply_aggregate_change(cursor, tmdb_id, old_rating, rating)
+
+            # Commit all operations together
             connection.commit()
+            self._defer_aggregate_change(deferred)
             return True
             
         except Exception as e:
@@ -59,20 +140,29 @@ class RatingRepository:
         try:
             # Start transaction
             connection.start_transaction()
-            
+
+            old_rating = None
+            if self.aggregate_mode != AGGREGATE_MODE_RECOMPUTE:
+                old_rating = self._lock_existing_rating(cursor, user_id, tmdb_id)
+                if old_rating is None:
+                    connection.rollback()
+                    return False
+
             # 1. Update the rating
+            new_rating = _stored_rating(new_rating)
             cursor.execute(UPDATE_RATING, (new_rating, user_id, tmdb_id))
             
             # Check if update was successful
-            if cursor.rowcount == 0:
+            if cursor.rowcount == 0 and self.aggregate_mode == AGGREGATE_MODE_RECOMPUTE:
                 connection.rollback()
                 return False
             
-            # 2. Recalculate and update aggregates atomically
-            cursor.execute(UPDATE_MOVIE_AGGREGATES_ATOMIC, (tmdb_id, tmdb_id, tmdb_id))
+            # 2. Update aggregates in the same transaction
+            deferred = self._apply_aggregate_change(cursor, tmdb_id, old_rating, new_rating)
             
             # Commit both operations together
             connection.commit()
+            self._defer_aggregate_change(deferred)
             return True
             
         except Exception as e:
@@ -93,6 +183,10 @@ class RatingRepository:
         try:
             # Start transaction
             connection.start_transaction()
+
+            old_rating = None
+            if self.aggregate_mode != AGGREGATE_MODE_RECOMPUTE:
+                old_rating = self._lock_existing_rating(cursor, user_id, tmdb_id)
             
             # 1. Delete the rating
             cursor.execute(DELETE_RATING, (user_id, tmdb_id))
@@ -102,11 +196,12 @@ class RatingRepository:
                 connection.rollback()
                 return False
             
-            # 2. Recalculate and update aggregates atomically
-            cursor.execute(UPDATE_MOVIE_AGGREGATES_ATOMIC, (tmdb_id, tmdb_id, tmdb_id))
+            # 2. Update aggregates in the same transaction
+            deferred = self._apply_aggregate_change(cursor, tmdb_id, old_rating, None)
             
             # Commit both operations together
             connection.commit()
+            self._defer_aggregate_change(deferred)
             return True
             
         except Exception as e:
@@ -117,6 +212,94 @@ class RatingRepository:
             cursor.close()
             self.db_manager.close_connection(connection)
 
+    def upsert_ratings_batch(self, rows):
+        """Inserts or updates a batch of ratings and updates the affected movies' aggregates once.
+
+        Rows whose userID or tmdbID does not exist are rejected up front rather than failing the
+        batch on a foreign key. Later rows for the same (userID, tmdbID) win. The upsert is a single
+        executemany, followed by one aggregate update for all movies in the batch (batched deltas,
+        a set-based recompute, or buffered deltas, depending on the aggregate mode).
+
+        Args:
+            rows (list): (userID, tmdbID, rating) tuples, already range-checked
+
+        Returns:
+            tuple: (number of ratings written, list of rejected rows), or (None, rows) on error
+        """
+        if not rows:
+            return 0, []
+        connection = self.db_manager.get_connection()
+        if not connection:
+            return None, rows
+
+        cursor = connection.cursor()
+        try:
+            connection.start_transaction()
+
+            # Last occurrence of a key wins, matching what sequential upserts would leave behind
+            latest = {}
+            for user_id, tmdb_id, rating in rows:
+                latest[(user_id, tmdb_id)] = _stored_rating(rating)
+
+            movie_ids = sorted({tmdb_id for _, tmdb_id in latest})
+            user_ids = sorted({user_id for user_id, _ in latest})
+            cursor.execute(GET_EXISTING_MOVIE_IDS.format(id_placeholders=",".join(["%s"] * len(movie_ids))), tuple(movie_ids))
+            known_movies = {row[0] for row in cursor.fetchall()}
+            cursor.execute(GET_EXISTING_USER_IDS.format(id_placeholders=",".join(["%s"] * len(user_ids))), tuple(user_ids))
+            known_users = {row[0] for row in cursor.fetchall()}
+            rejected = [row for row in rows if row[0] not in known_users or row[1] not in known_movies]
+            latest = {key: rating for key, rating in latest.items() if key[0] in known_users and key[1] in known_movies}
+            if not latest:
+                connection.rollback()
+                return 0, rejected
+
+            old_ratings = {}
+            if self.aggregate_mode != AGGREGATE_MODE_RECOMPUTE:
+                key_params = [value for key in latest for value in key]
+                cursor.execute(
+                    GET_RATINGS_FOR_UPDATE_BY_KEYS.format(key_placeholders=",".join(["(%s, %s)"] * len(latest))),
+                    tuple(key_params)
+                )
+                old_ratings = {(row[0], row[1]): _stored_rating(row[2]) for row in cursor.fetchall() if row[2] is not None}
+
+            cursor.executemany(INSERT_RATING, [(user_id, tmdb_id, rating) for (user_id, tmdb_id), rating in latest.items()])
+
+            deltas = {}
+            if self.aggregate_mode == AGGREGATE_MODE_RECOMPUTE:
+                affected = sorted({tmdb_id for _, tmdb_id in latest})
+                placeholders = ",".join(["%s"] * len(affected))
+                cursor.execute(RECOMPUTE_MOVIE_AGGREGATES_FOR_IDS.format(id_placeholders=placeholders), tuple(affected) * 2)
+            else:
+                for key, rating in latest.items():
+                    old_rating = old_ratings.get(key)
+                    entry = deltas.setdefault(key[1], [Decimal(0), 0])
+                    entry[0] += rating - (old_rating or Decimal(0))
+                    entry[1] += 0 if old_rating is not None else 1
+                deltas = {tmdb_id: d for tmdb_id, d in deltas.items() if d[0] != 0 or d[1] != 0}
+                if deltas and self.aggregate_mode == AGGREGATE_MODE_DELTA:
+                    affected = sorted(deltas)
+                    case_sql = " ".join(["WHEN %s THEN %s"] * len(affected))
+                    params = [v for tmdb_id in affected for v in (tmdb_id, deltas[tmdb_id][0])]
+                    params += [v for tmdb_id in affected for v in (tmdb_id, deltas[tmdb_id][1])]
+                    params += affected
+                    cursor.execute(UPDATE_MOVIE_AGGREGATES_BATCH.format(
+                        total_cases=case_sql, count_cases=case_sql,
+                        id_placeholders=",".join(["%s"] * len(affected))
+                    ), tuple(params))
+
+            connection.commit()
+            if self.aggregate_mode == AGGREGATE_MODE_WRITE_BEHIND:
+                for tmdb_id, (delta_total, delta_count) in deltas.items():
+                    self._defer_aggregate_change((tmdb_id, delta_total, delta_count))
+            return len(latest), rejected
+        except Exception as e:
+            print(f"Error upserting rating batch of {len(rows)} rows: {e}")
+            connection.rollback()
+            return None, rows
+        finally:
+            cursor.close()
+            self.db_manager.close_connection(connection)
+
     def get_rating_by_user_and_movie(self, user_id, tmdb_id):
         """Fetches a specific rating by user and movie."""
         connection = self.db_manager.get_connection()
@@ -135,6 +318,32 @@ class RatingRepository:
             cursor.close()
             self.db_manager.close_connection(connection)
 
+    def get_user_rating_and_review(self, user_id, tmdb_id):
+        """Fetches a user's rating and review for a movie with one query.
+
+        Returns:
+            dict: {'rating', 'review', 'review_timeStamp'} (values None where absent), or None on error
+        """
+        connection = self.db_manager.get_connection()
+        if not connection:
+            return None
+
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute(GET_USER_RATING_AND_REVIEW_FOR_MOVIE, (user_id, tmdb_id))
+            row = cursor.fetchone()
+            return {
+                'rating': row['rating'] if row else None,
+                'review': row['review'] if row else None,
+                'review_timeStamp': row['review_timeStamp'] if row else None
+            }
+        except Exception as e:
+            print(f"Error fetching rating and review for user {user_id}, movie {tmdb_id}: {e}")
+            return None
+        finally:
+            cursor.close()
+            self.db_manager.close_connection(connection)
+
     def get_ratings_for_movie(self, tmdb_id):
         """Fetches all ratings for a specific movie."""
         connection = self.db_manager.get_connection()
@@ -236,3 +445,58 @@ class RatingRepository:
         finally:
             cursor.close()
             self.db_manager.close_connection(connection)
+
+    def reconcile_aggregate_chunk(self, after_id, chunk_size, dry_run=False, tolerance=1e-6):
+        """Recomputes the aggregates of the next chunk of movies in one set-based pass.
+
+        The chunk is the next chunk_size movies (by tmdbID) after after_id. Drifted rows are
+        reported and, unless dry_run, rewritten in the same short transaction, so locks are
+        held for one chunk at a time.
+
+        Args:
+            after_id (int): Last tmdbID of the previous chunk (use -1 to start)
+            chunk_size (int): Number of movies per chunk
+            dry_run (bool): Only report drift, do not write
+            tolerance (float): Allowed difference between stored and recomputed totalRatings
+
+        Returns:
+            tuple: (end_id, drift rows) where end_id is None once all movies were processed,
+                or (None, None) on error
+        """
+        connection = self.db_manager.get_connection()
+        if not connection:
+            return None, None
+
+        cursor = connection.cursor(dictionary=True)
+        try:
+            connection.start_transaction()
+            cursor.execute(GET_MOVIE_ID_CHUNK_END, (after_id, chunk_size))
+            row = cursor.fetchone()
+            end_id = row['end_id'] if row else None
+            if end_id is None:
+                connection.rollback()
+                return None, []
+
+            start_id = after_id + 1
+            range_params = (start_id, end_id, start_id, end_id, tolerance)
+            cursor.execute(FIND_AGGREGATE_DRIFT_IN_RANGE, range_params)
+            drift = cursor.fetchall()
+            for item in drift:
+                item['stored_total'] = float(item['stored_total'])
+                item['actual_total'] = float(item['actual_total'])
+                item['stored_count'] = int(item['stored_count'])
+                item['actual_count'] = int(item['actual_count'])
+
+            if drift and not dry_run:
+                cursor.execute(REPAIR_AGGREGATE_DRIFT_IN_RANGE, range_params)
+                connection.commit()
+            else:
+                connection.rollback()
+            return end_id, drift
+        except Exception as e:
+            print(f"Error reconciling rating aggregates after tmdbID {after_id}: {e}")
+            connection.rollback()
+            return None, None
+        finally:
+            cursor.close()
+            self.db_manager.close_connection(connection)
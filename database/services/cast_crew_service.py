@@ -1,5 +1,5 @@
 # database/services/cast_crew_service.py
-from database.repositories.cast_crew_repository import CastCrewRepository
+from database.repositories.cast_crew_repository import CastCrewRepository, NAME_SEARCH_TOKEN
 import threading
 
 class CastCrewService:
@@ -48,11 +48,11 @@ class CastCrewService:
             "director": director
         }
 
-    def find_tmdbids_by_cast(self, cast_name):
-        return self.cast_crew_repo.find_tmdbids_by_cast(cast_name)
+    def find_tmdbids_by_cast(self, cast_name, mode=NAME_SEARCH_TOKEN):
+        return self.cast_crew_repo.find_tmdbids_by_cast(cast_name, mode=mode)
 
-    def find_tmdbids_by_crew(self, crew_name, job=None):
-        return self.cast_crew_repo.find_tmdbids_by_crew(crew_name)
+    def find_tmdbids_by_crew(self, crew_name, job=None, mode=NAME_SEARCH_TOKEN):
+        return self.cast_crew_repo.find_tmdbids_by_crew(crew_name, job=job, mode=mode)
 
     # Optional: Helper method to get a formatted list of actors and their roles
     def get_formatted_cast_list(self, tmdb_id):
@@ -86,6 +86,60 @@ class CastCrewService:
             "crew_by_department": formatted_crew
         }
 
+    def get_credits_summary(self, tmdb_id, cast_limit=None, include_crew=True):
+        """Returns the director, a formatted cast list and the grouped crew from a single query.
+
+        Args:
+            tmdb_id (int): The tmdbID of the movie
+            cast_limit (int): Maximum number of cast members, or None for the full cast
+            include_crew (bool): Whether to also fetch the crew grouped by department/job
+
+        Returns:
+            dict: success flag, 'director', 'cast_list' ('Name as Character' strings) and 'crew_by_department'
+        """
+        summary = self.cast_crew_repo.get_credits_summary(tmdb_id, cast_limit=cast_limit, include_crew=include_crew)
+        if summary is None:
+            return {"success": False, "message": "Failed to load cast and crew (DB error).",
+                    "director": None, "cast_list": [], "crew_by_department": {}}
+        return {
+            "success": True,
+            "director": summary["director"],
+            "cast_list": [f"{person.get('name')} as {person.get('character')}" for person in summary["cast"]],
+            "crew_by_department": summary["crew_by_department"]
+        }
+
+    def get_directors_for_movies(self, tmdb_ids):
+        """Retrieves the director name of every movie in tmdb_ids with a single query."""
+        return {
+            "success": True,
+            "directors": self.cast_crew_repo.get_directors_for_movies(tmdb_ids)
+        }
+
+    def get_top_cast_for_movies(self, tmdb_ids, n=3):
+        """Retrieves the first n cast members of every movie in tmdb_ids with a single query."""
+        return {
+            "success": True,
+            "top_cast": self.cast_crew_repo.get_top_cast_for_movies(tmdb_ids, n)
+        }
+
+    def get_card_credits(self, tmdb_ids, lead_count=1):
+        """Returns the one-line credits shown under movie cards, for a whole page at once.
+
+        Costs two MongoDB queries per page (directors and lead cast) instead of two per movie.
+
+        Returns:
+            dict: tmdbID -> {'director': name or None, 'leads': [names]}
+        """
+        directors = self.cast_crew_repo.get_directors_for_movies(tmdb_ids)
+        top_cast = self.cast_crew_repo.get_top_cast_for_movies(tmdb_ids, lead_count)
+        return {
+            tmdb_id: {
+                "director": directors.get(tmdb_id),
+                "leads": [person.get('name') for person in top_cast.get(tmdb_id, [])]
+            }
+            for tmdb_id in tmdb_ids
+        }
+
     def add_cast_member(self, tmdb_id, name, character):
         """Adds a cast member via the repository using name for collision."""
         if not all([tmdb_id, name, character]):
@@ -115,6 +169,64 @@ class CastCrewService:
             print(f"Error in CastCrewService.add_crew_member: {e}")
             return {"success": False, "message": f"An error occurred: {e}"}
 
+    def replace_credits(self, tmdb_id, cast, crew):
+        """Replaces a movie's whole cast and crew with the given lists.
+
+        Only the differences are written, with one unordered bulk write per collection, so saving
+        a movie costs a handful of round trips however many credits it has.
+
+        Args:
+            tmdb_id (int): The tmdbID of the movie
+            cast (list): Dicts with 'name' and 'character'
+            crew (list): Dicts with 'name', 'job' and 'department'
+
+        Returns:
+            dict: success flag, message and per-item 'cast_results'/'crew_results'
+                (each with 'action', 'success' and, on failure, 'message')
+        """
+        if not tmdb_id:
+            return {"success": False, "message": "tmdbID is required.", "cast_results": [], "crew_results": []}
+
+        def split_valid(items, fields):
+            valid, invalid = [], []
+            for item in items or []:
+                cleaned = {field: str(item.get(field) or "").strip() for field in fields}
+                if all(cleaned.values()):
+                    valid.append(cleaned)
+                else:
+                    invalid.append({"name": cleaned["name"], "action": "skipped", "success": False,
+                                    "message": f"All fields ({', '.join(fields)}) are required."})
+            return valid, invalid
+
+        valid_cast, cast_invalid = split_valid(cast, ("name", "character"))
+        valid_crew, crew_invalid = split_valid(crew, ("name", "job", "department"))
+
+        try:
+            cast_results = self.cast_crew_repo.replace_cast_for_movie(tmdb_id, valid_cast)
+            crew_results = self.cast_crew_repo.replace_crew_for_movie(tmdb_id, valid_crew)
+        except Exception as e:
+            print(f"Error in CastCrewService.replace_credits: {e}")
+            return {"success": False, "message": f"An error occurred: {e}", "cast_results": [], "crew_results": []}
+
+        if cast_results is None or crew_results is None:
+            return {
+                "success": False,
+                "message": "Failed to save cast and crew (DB error).",
+                "cast_results": (cast_results or []) + cast_invalid,
+                "crew_results": (crew_results or []) + crew_invalid
+            }
+
+        cast_results += cast_invalid
+        crew_results += crew_invalid
+        failed = [r for r in cast_results + crew_results if not r["success"]]
+        changed = [r for r in cast_results + crew_results if r["action"] in ("inserted", "updated", "deleted") and r["success"]]
+        return {
+            "success": not failed,
+            "message": f"Saved cast and crew ({len(changed)} changes, {len(failed)} failed).",
+            "cast_results": cast_results,
+            "crew_results": crew_results
+        }
+
     def update_cast_member(self, tmdb_id, name, new_character):
         """Updates a cast member via the repository using name."""
         # Basic validation - removed actor_id check
@@ -0,0 +1,119 @@
+# database/services/movie_detail_service.py
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+from database.services.movie_service import MovieService
+from database.services.genre_service import GenreService
+from database.services.review_service import ReviewService
+from database.services.cast_crew_service import CastCrewService
+from database.repositories.rating_repository import RatingRepository
+import threading
+
+# Cast members fetched for the detail page; the page shows them as one line of text
+DETAIL_CAST_LIMIT = 20
+# Threads loading detail-page parts, shared by all concurrent loads. Each can hold a MySQL
+# connection, so this is part of the budget in database/db_connection.py (MYSQL_POOL_SIZE);
+# it covers the four MySQL parts of one page, the credits part (MongoDB) waits for a free thread.
+DETAIL_LOAD_THREADS = 4
+
+
+@dataclass
+class MovieDetail:
+    """Everything the movie detail page shows, loaded by MovieDetailService.load."""
+    tmdb_id: int
+    movie: Optional[dict] = None
+    genres: list = field(default_factory=list)         # genre names
+    director: Optional[dict] = None
+    cast_list: list = field(default_factory=list)      # "Name as Character" strings
+    reviews: list = field(default_factory=list)        # most recent reviews
+    user_rating: Optional[float] = None                # None when not logged in or not rated
+    user_review: Optional[str] = None
+    errors: list = field(default_factory=list)         # names of the parts that failed to load
+
+    @property
+    def found(self):
+        """True if the movie itself was loaded."""
+        return self.movie is not None
+
+
+class MovieDetailService:
+    """Loads a movie detail page in one go.
+
+    The MySQL parts (movie, genres, reviews, the user's rating and review) and the MongoDB
+    part (director and cast, one aggregation) are independent, so they run concurrently on a shared thread pool
+    and the page costs roughly one round trip instead of one per part.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(MovieDetailService, cls).__new__(cls)
+                    cls._instance.movie_service = MovieService()
+                    cls._instance.genre_service = GenreService()
+                    cls._instance.review_service = ReviewService()
+                    cls._instance.cast_crew_service = CastCrewService()
+                    cls._instance.rating_repo = RatingRepository()
+                    cls._instance.executor = ThreadPoolExecutor(max_workers=DETAIL_LOAD_THREADS, thread_name_prefix="movie-detail")
+        return cls._instance
+
+    def load(self, tmdb_id, user_id=None):
+        """Fetches the movie, genres, director, cast, recent reviews and (if user_id) the user's rating/review.
+
+        Args:
+            tmdb_id (int): The tmdbID of the movie
+            user_id (int): The logged-in user's ID, or None for guests
+
+        Returns:
+            MovieDetail: The merged result; check .found before using it
+        """
+        tasks = {
+            "movie": lambda: self.movie_service.get_movie_detail(tmdb_id),
+            "genres": lambda: self.genre_service.get_genres_for_movie(tmdb_id),
+            # Director and top-billed cast in one aggregation; the page does not show the rest of the crew
+            "credits": lambda: self.cast_crew_service.get_credits_summary(
+                tmdb_id, cast_limit=DETAIL_CAST_LIMIT, include_crew=False
+            ),
+            "reviews": lambda: self.review_service.get_reviews_for_movie(tmdb_id),
+        }
+        if user_id is not None:
+            tasks["user"] = lambda: self.rating_repo.get_user_rating_and_review(user_id, tmdb_id)
+
+        futures = {name: self.executor.submit(task) for name, task in tasks.items()}
+        results = {}
+        detail = MovieDetail(tmdb_id=tmdb_id)
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"Error loading '{name}' for movie {tmdb_id}: {e}")
+                results[name] = None
+                detail.errors.append(name)
+
+        movie_result = results.get("movie") or {}
+        if movie_result.get('success'):
+            detail.movie = movie_result.get('movie')
+
+        genre_result = results.get("genres") or {}
+        if genre_result.get('success'):
+            detail.genres = [g['genreName'] for g in genre_result.get('genres', []) if g.get('genreName')]
+
+        credits_result = results.get("credits") or {}
+        if credits_result.get('success'):
+            detail.director = credits_result.get('director')
+            detail.cast_list = credits_result.get('cast_list', [])
+
+        review_result = results.get("reviews") or {}
+        if review_result.get('success'):
+            detail.reviews = review_result.get('reviews', [])
+
+        user_result = results.get("user")
+        if user_result:
+            if user_result.get('rating') is not None:
+                detail.user_rating = float(user_result['rating'])
+            detail.user_review = user_result.get('review')
+
+        print(f"DEBUG: MovieDetailService.load: Loaded movie {tmdb_id} ({len(tasks)} parts, {len(detail.errors)} failed)")
+        return detail
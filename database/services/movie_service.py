@@ -1,8 +1,55 @@
 # database/services/movie_service.py
 
-from database.repositories.movie_repository import MovieRepository
+from database.repositories.movie_repository import MovieRepository, SORT_BY_RATING, uses_fulltext_title_search
+import base64
+import json
 import threading
 
+# Most matches search_movie_titles returns; an as-you-type term matching more runs a normal search
+MAX_TITLE_SEARCH_RESULTS = 50000
+
+
+def movie_sort_key(movie, sort_by=None):
+    """Returns a key ordering Movies rows the way the listing and search queries do for sort_by.
+
+    Those queries sort descending, so a larger key comes first; ties are broken by tmdbID.
+    """
+    if sort_by == SORT_BY_RATING:
+        avg_rating = movie.get('avgRating')
+        if avg_rating is None:  # Rows from queries that do not select the generated column
+            count_ratings = movie.get('countRatings') or 0
+            avg_rating = (movie.get('totalRatings') or 0) / count_ratings if count_ratings > 0 else 0
+        return (1, float(avg_rating)), movie['tmdbID']
+    release_date = movie.get('releaseDate')
+    # MySQL sorts NULL lowest, so undated movies come last
+    return ((1, str(release_date)[:10]) if release_date else (0, "")), movie['tmdbID']
+
+
+def _encode_page_cursor(movie, page_number, sort_by=None):
+    """Encodes the (sort key, tmdbID) of a boundary row, its page number and the sort order into an opaque token."""
+    if sort_by == SORT_BY_RATING:
+        sort_key = float(movie.get('avgRating') or 0)
+    else:
+        release_date = movie.get('releaseDate')
+        sort_key = release_date.isoformat() if hasattr(release_date, 'isoformat') else release_date
+    payload = {
+        "d": sort_key,
+        "id": movie['tmdbID'],
+        "p": page_number,
+        "s": sort_by
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def _decode_page_cursor(cursor):
+    """Decodes a token from _encode_page_cursor into ((sort key, tmdbID), page_number, sort_by), or None if invalid."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+        return (payload["d"], int(payload["id"])), max(1, int(payload["p"])), payload.get("s")
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
 class MovieService:
     _instance = None
     _lock = threading.Lock()
@@ -61,10 +108,21 @@ class MovieService:
                 "message": "Failed to create movie in database"
             }
 
-    def get_movies_for_homepage(self, page_number=1, movies_per_page=20, max_pages=10):
+    def get_movies_for_homepage(self, page_number=1, movies_per_page=20, max_pages=10, cursor=None, direction="next", use_keyset=False, sort_by=None, include_total=True):
         """
         Retrieves movies for the homepage with pagination constraints.
         Limits the total number of pages to max_pages.
+
+        Passing a cursor (or use_keyset=True for the first page) switches to keyset
+        pagination: page cost stays flat however deep the user goes, so max_pages is
+        not applied. Keyset results also carry opaque 'next_cursor'/'prev_cursor' tokens
+        to pass back in with direction='next' or direction='prev'.
+
+        sort_by='rating' lists the highest average rating first instead of the newest release.
+        A cursor remembers the sort it was issued for; if sort_by differs, paging restarts at page 1.
+
+        include_total=False skips the COUNT(*) on the keyset path ('total_pages' is then None);
+        has_next does not need it, so infinite-scroll callers should pass it.
         """
         # Validate inputs
         if page_number < 1:
@@ -72,6 +130,9 @@ class MovieService:
         if movies_per_page < 1:
             movies_per_page = 20 # Default
 
+        if use_keyset or cursor is not None:
+            return self._get_movies_for_homepage_keyset(cursor, direction, movies_per_page, sort_by, include_total)
+
         # Calculate the maximum possible page number based on total movies
         total_movies = self.movie_repo.count_all_movies()
         total_pages = (total_movies + movies_per_page - 1) // movies_per_page # Ceiling division
@@ -82,7 +143,7 @@ class MovieService:
              page_number = max_possible_page # Navigate to last allowed page if requested page is too high
 
         # Fetch the movies for the calculated page number
-        movies = self.movie_repo.get_movies_paginated(page_number, movies_per_page)
+        movies = self.movie_repo.get_movies_paginated(page_number, movies_per_page, sort_by)
 
         # Calculate the range of pages to display in the UI (e.g., 1-10)
         start_page = max(1, page_number - 4) # Show 4 pages before current
@@ -102,6 +163,43 @@ class MovieService:
             "has_prev": page_number > 1
         }
 
+    def _get_movies_for_homepage_keyset(self, cursor, direction, movies_per_page, sort_by=None, include_total=True):
+        """Keyset-paginated variant of get_movies_for_homepage (see its docstring)."""
+        decoded = _decode_page_cursor(cursor) if cursor else None
+        if decoded is None or decoded[2] != sort_by:
+            # No (or an unreadable, or other-sort) cursor: start again from the first page
+            cursor_key, page_number, direction = None, 1, "next"
+        else:
+            cursor_key, page_number, _ = decoded
+
+        movies, has_more = self.movie_repo.get_movies_keyset(cursor_key, movies_per_page, direction, sort_by)
+
+        if direction == "prev":
+            has_prev = has_more
+            has_next = True
+            if not has_prev:
+                page_number = 1  # Walked back to the start, re-anchor the page counter
+        else:
+            has_prev = cursor_key is not None
+            has_next = has_more
+
+        # has_next comes from the LIMIT n+1 fetch; the count is only for page-number displays
+        total_pages = None
+        if include_total:
+            total_movies = self.movie_repo.count_all_movies()
+            total_pages = max(page_number, (total_movies + movies_per_page - 1) // movies_per_page)
+
+        return {
+            "movies": movies,
+            "current_page": page_number,
+            "total_pages": total_pages,
+            "page_numbers": [page_number],
+            "has_next": has_next and bool(movies),
+            "has_prev": has_prev and bool(movies),
+            "next_cursor": _encode_page_cursor(movies[-1], page_number + 1, sort_by) if movies else None,
+            "prev_cursor": _encode_page_cursor(movies[0], page_number - 1, sort_by) if movies else None
+        }
+
     def get_movie_detail(self, tmdb_id):
         """Retrieves details for a specific movie."""
         movie = self.movie_repo.get_movie_by_id(tmdb_id)
@@ -116,8 +214,37 @@ class MovieService:
                 "message": "Movie not found"
             }
 
-    def search_movies_by_title(self, search_term=None, genres=None, cast=None, crew=None, year=None, min_avg_rating=None, page_number=1, movies_per_page=20, max_pages=10):
-        """Searches for movies by title with pagination, optionally filtering by genre, year and/or minimum average rating."""
+    def title_search_is_substring(self, search_term, genres=None, cast=None, crew=None, year=None, min_avg_rating=None):
+        """True if search_movies_by_title matches titles with LIKE '%term%' for these filters.
+
+        Otherwise (a plain title search of four or more characters) it uses FULLTEXT word matching.
+        """
+        genres_param = genres if genres is None or isinstance(genres, list) else [genres]
+        allowed_tmdbids = [] if (cast or crew) else None
+        return not uses_fulltext_title_search(search_term, genres_param, year, min_avg_rating, allowed_tmdbids)
+
+    def get_movies_by_ids(self, tmdb_ids, columns=None):
+        """Retrieves several movies at once (e.g. to refresh the cards of updated movies).
+
+        Args:
+            tmdb_ids (iterable): TMDB IDs, in the order the caller wants them back
+            columns (iterable): Movie columns to fetch (see MOVIE_COLUMNS); None fetches all
+
+        Returns:
+            dict: {"success": bool, "movies": {tmdbID: movie row}} in the order of tmdb_ids;
+            IDs that no longer exist are missing ({} if the lookup failed)
+        """
+        movies = self.movie_repo.get_movies_by_ids(tmdb_ids, columns)
+        if movies is None:
+            return {"success": False, "movies": {}}
+        return {"success": True, "movies": movies}
+
+    def _search_filter_params(self, genres=None, cast=None, crew=None, year=None):
+        """Normalizes the search filters for the repository and resolves cast/crew names to tmdbIDs.
+
+        Returns:
+            tuple: (genres list or None, allowed tmdbIDs or None, year or (start, end) or None)
+        """
         # Normalize year parameter for both count and search
         year_param = None
         if isinstance(year, (tuple, list)) and len(year) == 2:
@@ -144,26 +271,72 @@ class MovieService:
                 crew_ids = set(cast_crew_service.find_tmdbids_by_crew(crew))
                 candidates = crew_ids if candidates is None else candidates & crew_ids
             allowed_tmdbids = list(candidates) if candidates is not None else []
-        
-        # Get total count of matching movies first
-        total_movies = self.movie_repo.count_search_results(search_term, genres_param, allowed_tmdbids, year_param, min_avg_rating)
-        # Calculate total pages
-        total_pages = (total_movies + movies_per_page - 1) // movies_per_page
-        # Apply max pages constraint
-        max_possible_page = min(max_pages, total_pages)
-        if page_number > max_possible_page:
-            page_number = max_possible_page
+        return genres_param, allowed_tmdbids, year_param
 
-        # Get paginated results
-        movies = self.movie_repo.search_movies(
+    def search_movie_titles(self, search_term=None, genres=None, cast=None, crew=None, year=None, min_avg_rating=None, sort_by=None, max_results=MAX_TITLE_SEARCH_RESULTS):
+        """Retrieves the tmdbID and title of every movie a title-substring search matches, in result order.
+
+        Used by as-you-type search, which refines the set locally as the term grows. Titles are
+        matched with LIKE '%term%' even where search_movies_by_title would use FULLTEXT; the
+        other filters and the order are the same.
+
+        Returns:
+            dict: {"success": bool, "titles": [{'tmdbID', 'title'}], "complete": bool};
+            complete is False (and titles empty) when more than max_results movies match
+        """
+        genres_param, allowed_tmdbids, year_param = self._search_filter_params(genres, cast, crew, year)
+        titles = self.movie_repo.search_movie_titles(
+            search_term=search_term, genres=genres_param, allowed_tmdbids=allowed_tmdbids,
+            year=year_param, min_avg_rating=min_avg_rating, sort_by=sort_by, limit=max_results + 1
+        )
+        if titles is None:
+            return {"success": False, "titles": [], "complete": False}
+        if len(titles) > max_results:
+            return {"success": True, "titles": [], "complete": False}
+        return {"success": True, "titles": titles, "complete": True}
+
+    def search_movies_by_title(self, search_term=None, genres=None, cast=None, crew=None, year=None, min_avg_rating=None, page_number=1, movies_per_page=20, max_pages=10, sort_by=None):
+        """Searches for movies by title with pagination, optionally filtering by genre, year and/or minimum average rating.
+
+        sort_by='rating' orders the results by average rating (highest first).
+        """
+        genres_param, allowed_tmdbids, year_param = self._search_filter_params(genres, cast, crew, year)
+
+        page_number = max(1, min(page_number, max_pages))
+        search_kwargs = dict(
             search_term=search_term,
             genres=genres_param,
             allowed_tmdbids=allowed_tmdbids,
             year=year_param,
             min_avg_rating=min_avg_rating,
+            sort_by=sort_by
+        )
+
+        # Page rows and the total match count come back from a single statement
+        movies, total_movies = self.movie_repo.search_movies_with_count(
             offset=(page_number - 1) * movies_per_page,
-            limit=movies_per_page
+            limit=movies_per_page,
+            **search_kwargs
         )
+        if not movies and page_number > 1:
+            # The requested page is past the last match, so the window count is unavailable.
+            # Count separately and fall back to the last page that has results.
+            total_movies = self.movie_repo.count_search_results(search_term, genres_param, allowed_tmdbids, year_param, min_avg_rating)
+            page_number = max(1, min(page_number, (total_movies + movies_per_page - 1) // movies_per_page))
+            if total_movies:
+                movies, total_movies = self.movie_repo.search_movies_with_count(
+                    offset=(page_number - 1) * movies_per_page,
+                    limit=movies_per_page,
+                    **search_kwargs
+                )
+
+        # Calculate total pages
+        total_pages = (total_movies + movies_per_page - 1) // movies_per_page
+        # Apply max pages constraint
+        max_possible_page = min(max_pages, total_pages)
+        if page_number > max_possible_page:
+            page_number = max_possible_page
+
         print(f"DEBUG: Retrieved {len(movies)} movies for page {page_number}")
         return {
             "movies": movies,
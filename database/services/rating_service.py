@@ -1,8 +1,10 @@
 # In rating_service.py
-from database.repositories.rating_repository import RatingRepository
+from database.repositories.rating_repository import RatingRepository, AGGREGATE_MODE_WRITE_BEHIND
+from database.repositories.rating_aggregate_buffer import RatingAggregateBuffer
 from database.services.review_service import ReviewService  
 from database.services.movie_service import MovieService   
 
+from itertools import islice
 import threading
 
 class RatingService:
@@ -47,6 +49,78 @@ class RatingService:
         
         return {"success": True, "message": "Rating updated successfully."}
     
+    def add_ratings_bulk(self, ratings, batch_size=1000, max_reported_errors=100):
+        """Adds or updates many ratings, e.g. for dataset imports or partner feeds.
+
+        The input is consumed lazily batch by batch, so generators and file readers are never
+        materialized. Each batch is validated, upserted with a single executemany and updates
+        its movies' aggregates once.
+
+        Args:
+            ratings (iterable): (userID, tmdbID, rating) tuples
+            batch_size (int): Ratings per batch/transaction
+            max_reported_errors (int): Cap on rejected rows listed in the result
+
+        Returns:
+            dict: success flag, message and counts ('written', 'rejected', 'failed_batches')
+                plus up to max_reported_errors entries in 'errors'
+        """
+        if batch_size < 1:
+            return {"success": False, "message": "Batch size must be at least 1."}
+
+        written = 0
+        rejected = 0
+        failed_batches = 0
+        batches = 0
+        errors = []
+
+        def reject(row, reason):
+            nonlocal rejected
+            rejected += 1
+            if len(errors) < max_reported_errors:
+                errors.append({"row": row, "reason": reason})
+
+        iterator = iter(ratings)
+        while True:
+            raw_batch = list(islice(iterator, batch_size))
+            if not raw_batch:
+                break
+            batches += 1
+
+            valid = []
+            for row in raw_batch:
+                try:
+                    user_id, tmdb_id, rating_value = row
+                    user_id, tmdb_id, rating_value = int(user_id), int(tmdb_id), float(rating_value)
+                except (TypeError, ValueError):
+                    reject(row, "Expected (userID, tmdbID, rating) with numeric values.")
+                    continue
+                if rating_value < 0 or rating_value > 5:
+                    reject(row, "Rating must be between 0 and 5.")
+                    continue
+                valid.append((user_id, tmdb_id, round(rating_value, 1)))
+
+            count, unknown = self.rating_repo.upsert_ratings_batch(valid)
+            if count is None:
+                failed_batches += 1
+                for row in unknown:
+                    reject(row, "Batch failed to write.")
+                continue
+            written += count
+            for row in unknown:
+                reject(row, "Unknown userID or tmdbID.")
+            print(f"DEBUG: RatingService.add_ratings_bulk: batch {batches} wrote {count} ratings ({written} so far)")
+
+        return {
+            "success": failed_batches == 0,
+            "message": f"Wrote {written} ratings in {batches} batches, rejected {rejected}"
+                       + (f", {failed_batches} batches failed." if failed_batches else "."),
+            "written": written,
+            "rejected": rejected,
+            "failed_batches": failed_batches,
+            "errors": errors
+        }
+
     def get_user_rating_for_movie(self, user_id, tmdb_id):
         """Retrieves a specific user's rating for a movie."""
         rating = self.rating_repo.get_rating_by_user_and_movie(user_id, tmdb_id)
@@ -55,6 +129,37 @@ class RatingService:
             "rating": rating
         }
 
+    def get_user_interaction_for_movie(self, user_id, tmdb_id):
+        """Retrieves one movie's entry of the user's profile list (same shape as get_user_ratings_and_reviews_for_profile).
+
+        Returns:
+            dict: {"success": bool, "interaction": dict or None}; None if the user neither rated
+            nor reviewed the movie (or it no longer exists)
+        """
+        row = self.rating_repo.get_user_rating_and_review(user_id, tmdb_id)
+        if row is None:
+            return {"success": False, "interaction": None}
+        if row['rating'] is None and row['review'] is None:
+            return {"success": True, "interaction": None}
+        result = self.movie_service.get_movies_by_ids([tmdb_id], columns=["title"])
+        if not result['success']:
+            return {"success": False, "interaction": None}
+        movie = result['movies'].get(tmdb_id)
+        if movie is None:
+            return {"success": True, "interaction": None}
+        return {
+            "success": True,
+            "interaction": {
+                'tmdbID': tmdb_id,
+                'title': movie['title'],
+                'rating': row['rating'],
+                'review': row['review'],
+                # Only review-only entries show (and sort by) their time, which is the review's
+                'timeStamp': row['review_timeStamp'],
+                'type': 'rating' if row['rating'] is not None else 'review'
+            }
+        }
+
     def delete_rating(self, user_id, tmdb_id):
         """Deletes a rating (repository now handles atomic updates)."""
         # Repository handles transaction and aggregate update
@@ -128,4 +233,61 @@ class RatingService:
         return {
             "success": True,
             "interactions": processed_list
-        }
\ No newline at end of file
+        }
+
+    def reconcile_aggregates(self, chunk_size=1000, dry_run=False):
+        """Verifies (and unless dry_run, repairs) Movies.totalRatings/countRatings for every movie.
+
+        Runs a set-based recompute over Ratings one chunk of movies at a time and rewrites only
+        the movies whose stored aggregates drifted. Refused while write-behind mode is active: a
+        delta buffered after its chunk was recomputed from Ratings would be flushed on top of the
+        repaired totals and count that rating twice. Switch to delta mode first (which flushes the buffer).
+
+        Args:
+            chunk_size (int): Movies per chunk (each chunk is its own short transaction)
+            dry_run (bool): Report drift without writing
+
+        Returns:
+            dict: success flag, message and a drift report ('chunks', 'drifted', 'count_drift',
+                'total_drift' and the per-movie 'drift' rows)
+        """
+        if chunk_size < 1:
+            return {"success": False, "message": "Chunk size must be at least 1."}
+        if self.rating_repo.aggregate_mode == AGGREGATE_MODE_WRITE_BEHIND:
+            return {"success": False, "message": "Cannot reconcile while write-behind aggregate mode is active; switch to delta mode first."}
+
+        # Deltas left over from an earlier write-behind session
+        RatingAggregateBuffer().flush()
+
+        drift_rows = []
+        chunks = 0
+        after_id = -1
+        while True:
+            end_id, drift = self.rating_repo.reconcile_aggregate_chunk(after_id, chunk_size, dry_run=dry_run)
+            if drift is None:
+                return {
+                    "success": False,
+                    "message": f"Reconciliation failed after tmdbID {after_id}; earlier chunks were {'checked' if dry_run else 'repaired'}.",
+                    "chunks": chunks,
+                    "drifted": len(drift_rows),
+                    "drift": drift_rows
+                }
+            if end_id is None:
+                break
+            chunks += 1
+            drift_rows.extend(drift)
+            if drift:
+                print(f"DEBUG: RatingService.reconcile_aggregates: {len(drift)} drifted movies in tmdbID {after_id + 1}-{end_id}")
+            after_id = end_id
+
+        action = "found" if dry_run else "repaired"
+        return {
+            "success": True,
+            "message": f"Checked {chunks} chunks, {action} {len(drift_rows)} movies with drifted aggregates.",
+            "dry_run": dry_run,
+            "chunks": chunks,
+            "drifted": len(drift_rows),
+            "count_drift": sum(abs(r['stored_count'] - r['actual_count']) for r in drift_rows),
+            "total_drift": sum(abs(r['stored_total'] - r['actual_total']) for r in drift_rows),
+            "drift": drift_rows
+        }
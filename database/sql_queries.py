@@ -63,13 +63,26 @@ SELECT genreID, genreName FROM Genre ORDER BY genreID;
 """
 
 # -- Query to get movies for the home page with pagination, sorted by release date (newest first)
+# {order_by} is "m.releaseDate DESC, m.tmdbID DESC" by default, or the avgRating order when sorting by rating
 GET_MOVIES_PAGINATED = """
 SELECT *
 FROM Movies m
-ORDER BY m.releaseDate DESC, m.tmdbID DESC -- Order by release date descending, then by ID descending as a secondary sort to ensure stability
+ORDER BY {order_by} -- tmdbID DESC is always the last sort key to ensure stability
 LIMIT %s OFFSET %s;
 """
 
+# Query to get a page of movies for the home page using keyset (seek) pagination.
+# {where_section} holds the seek condition relative to the last (sort key, tmdbID) seen;
+# {sort_column} is m.releaseDate or m.avgRating;
+# {order} is DESC when paging forward and ASC when paging backward (rows are reversed in Python).
+GET_MOVIES_KEYSET = """
+SELECT *
+FROM Movies m
+{where_section}
+ORDER BY {sort_column} {order}, m.tmdbID {order}
+LIMIT %s;
+"""
+
 # Query to count total number of movies (for calculating total pages)
 COUNT_ALL_MOVIES = """
 SELECT COUNT(*) as total_count FROM Movies;
@@ -82,6 +95,14 @@ FROM Movies m
 WHERE m.tmdbID = %s;
 """
 
+# Batch lookup of movies by tmdbID; {columns} is a validated m.<column> list and
+# {placeholders} one %s per requested ID (callers chunk long ID lists)
+GET_MOVIES_BY_IDS = """
+SELECT {columns}
+FROM Movies m
+WHERE m.tmdbID IN ({placeholders});
+"""
+
 # Query for single-field movie search (title)
 SEARCH_MOVIES_BY_TITLE = """
 SELECT m.tmdbID, m.title, m.poster, m.overview, m.releaseDate, m.runtime, m.totalRatings, m.countRatings
@@ -107,10 +128,49 @@ JOIN Genre g ON mg.genreID = g.genreID
 {where_section}
 GROUP BY m.tmdbID
 HAVING COUNT(DISTINCT g.genreName) = %s
-ORDER BY m.releaseDate DESC, m.tmdbID DESC
+ORDER BY {order_by}
+LIMIT %s OFFSET %s
+"""
+
+# Single-round-trip variants of the searches above: COUNT(*) OVER() returns the total number
+# of matches on every row of the page, so no separate count query is needed.
+# {order_by} defaults to "relevance_score DESC, m.releaseDate DESC" for the FULLTEXT search
+# and to "m.releaseDate DESC, m.tmdbID DESC" for the genre search.
+SEARCH_MOVIES_BY_TITLE_FULLTEXT_WITH_COUNT = """
+SELECT m.tmdbID, m.title, m.poster, m.overview, m.releaseDate, m.runtime, m.totalRatings, m.countRatings,
+       MATCH(m.title) AGAINST(%s IN NATURAL LANGUAGE MODE) AS relevance_score,
+       COUNT(*) OVER() AS total_count
+FROM Movies m
+WHERE MATCH(m.title) AGAINST(%s IN NATURAL LANGUAGE MODE)
+ORDER BY {order_by}
+LIMIT %s OFFSET %s;
+"""
+
+SEARCH_MOVIES_BY_GENRES_WITH_COUNT = """
+SELECT m.tmdbID, m.title, m.poster, m.overview, m.releaseDate, m.runtime, m.totalRatings, m.countRatings,
+       COUNT(*) OVER() AS total_count
+FROM Movies m
+JOIN Movie_Genre mg ON m.tmdbID = mg.tmdbID
+JOIN Genre g ON mg.genreID = g.genreID
+{where_section}
+GROUP BY m.tmdbID
+HAVING COUNT(DISTINCT g.genreName) = %s
+ORDER BY {order_by}
 LIMIT %s OFFSET %s
 """
 
+# tmdbID and title of every movie matching the search filters, in search order, for as-you-type
+# search to refine locally. {genre_join}/{group_section} add the every-selected-genre filter
+SEARCH_MOVIE_TITLES = """
+SELECT m.tmdbID, m.title
+FROM Movies m
+{genre_join}
+{where_section}
+{group_section}
+ORDER BY {order_by}
+LIMIT %s
+"""
+
 # Query for FULLTEXT search with BOOLEAN MODE (for advanced search patterns)
 SEARCH_MOVIES_BY_TITLE_FULLTEXT_BOOLEAN = """
 SELECT m.tmdbID, m.title, m.poster, m.overview, m.releaseDate, m.runtime, m.totalRatings, m.countRatings,
@@ -121,9 +181,30 @@ ORDER BY relevance_score DESC, m.releaseDate DESC
 LIMIT 50;
 """
 
+# --- Large tmdbID Filter Queries ---
+# Session-scoped holding table for cast/crew tmdbID filters too large for an IN list.
+# Temporary tables are per connection, and the pool's session reset drops it when the connection is returned.
+CREATE_TEMP_FILTER_IDS = """
+CREATE TEMPORARY TABLE IF NOT EXISTS tmp_filter_tmdbids (tmdbID INT PRIMARY KEY) ENGINE=MEMORY;
+"""
+
+# Empties the holding table in case this session already used it
+CLEAR_TEMP_FILTER_IDS = """
+DELETE FROM tmp_filter_tmdbids;
+"""
+
+# Loads one batch of IDs into the holding table (executemany sends each batch as a multi-row INSERT)
+INSERT_TEMP_FILTER_IDS = """
+INSERT IGNORE INTO tmp_filter_tmdbids (tmdbID) VALUES (%s);
+"""
+
+# Search condition that semi-joins Movies against the holding table instead of listing the IDs
+TEMP_FILTER_IDS_CONDITION = "m.tmdbID IN (SELECT f.tmdbID FROM tmp_filter_tmdbids f)"
+
 # Get all distinct years present in Movies.releaseDate (for populating year dropdowns)
+# Reads the generated releaseYear column so the idx_movies_release_year index covers it
 GET_DISTINCT_YEARS = """
-SELECT DISTINCT YEAR(releaseDate) as year FROM Movies WHERE releaseDate IS NOT NULL ORDER BY year DESC;
+SELECT DISTINCT releaseYear as year FROM Movies WHERE releaseYear IS NOT NULL ORDER BY year DESC;
 """
 
 COUNT_MOVIES_BY_GENRES = """
@@ -246,6 +327,13 @@ DELETE FROM Reviews WHERE userID = %s AND tmdbID = %s;
 GET_REVIEW_BY_USER_AND_MOVIE = """
 SELECT userID, tmdbID, review, timeStamp FROM Reviews WHERE userID = %s AND tmdbID = %s;
 """
+# Query to get a user's rating and review for one movie in a single round trip (either may be NULL)
+GET_USER_RATING_AND_REVIEW_FOR_MOVIE = """
+SELECT k.userID, k.tmdbID, r.rating, v.review, v.timeStamp AS review_timeStamp
+FROM (SELECT %s AS userID, %s AS tmdbID) k
+LEFT JOIN Ratings r ON r.userID = k.userID AND r.tmdbID = k.tmdbID
+LEFT JOIN Reviews v ON v.userID = k.userID AND v.tmdbID = k.tmdbID;
+"""
 # Query to get all reviews for a specific movie (limiting to 3 most recent)
 GET_REVIEWS_FOR_MOVIE = """
 SELECT r.userID, u.email, r.review, r.timeStamp
@@ -407,5 +495,98 @@ SET
 WHERE tmdbID = %s;
 """
 
+# Incremental aggregate update (used within transactions): applies the old->new difference
+# of a single rating write instead of re-scanning every rating of the movie
+UPDATE_MOVIE_AGGREGATES_DELTA = """
+UPDATE Movies SET totalRatings = totalRatings + %s, countRatings = countRatings + %s WHERE tmdbID = %s;
+"""
+
+# Batched incremental aggregate update for the write-behind buffer: one statement applies the
+# buffered deltas of many movies. {total_cases}/{count_cases} are repeated "WHEN %s THEN %s" pairs
+# and {id_placeholders} lists the same tmdbIDs for the WHERE clause.
+UPDATE_MOVIE_AGGREGATES_BATCH = """
+UPDATE Movies
+SET totalRatings = totalRatings + (CASE tmdbID {total_cases} ELSE 0 END),
+    countRatings = countRatings + (CASE tmdbID {count_cases} ELSE 0 END)
+WHERE tmdbID IN ({id_placeholders});
+"""
+
+# Locks the user's existing rating row (or the gap where it would go) so the delta is computed from a stable old value
+GET_RATING_FOR_UPDATE = """
+SELECT rating FROM Ratings WHERE userID = %s AND tmdbID = %s FOR UPDATE;
+"""
+
+# --- Bulk Rating Ingestion Queries ---
+# Existing ratings for a batch of (userID, tmdbID) keys, locked so per-batch deltas are exact.
+# {key_placeholders} is a comma-separated list of "(%s, %s)" pairs.
+GET_RATINGS_FOR_UPDATE_BY_KEYS = """
+SELECT userID, tmdbID, rating FROM Ratings WHERE (userID, tmdbID) IN ({key_placeholders}) FOR UPDATE;
+"""
+
+# Which of a batch of IDs exist, so rows with unknown users/movies are rejected before the
+# upsert instead of failing the whole batch on a foreign key. {id_placeholders} lists %s markers.
+GET_EXISTING_MOVIE_IDS = """
+SELECT tmdbID FROM Movies WHERE tmdbID IN ({id_placeholders});
+"""
+GET_EXISTING_USER_IDS = """
+SELECT userID FROM Users WHERE userID IN ({id_placeholders});
+"""
+
+# Set-based recompute of the aggregates of several movies (recompute mode for bulk writes)
+RECOMPUTE_MOVIE_AGGREGATES_FOR_IDS = """
+UPDATE Movies m
+LEFT JOIN (
+    SELECT tmdbID, SUM(rating) AS sum_ratings, COUNT(*) AS rating_count
+    FROM Ratings
+    WHERE tmdbID IN ({id_placeholders})
+    GROUP BY tmdbID
+) r ON r.tmdbID = m.tmdbID
+SET m.totalRatings = COALESCE(r.sum_ratings, 0),
+    m.countRatings = COALESCE(r.rating_count, 0)
+WHERE m.tmdbID IN ({id_placeholders});
+"""
+
+# --- Aggregate Reconciliation Queries ---
+# Upper tmdbID of the next chunk of at most %s movies after the given tmdbID (NULL when there are no more movies)
+GET_MOVIE_ID_CHUNK_END = """
+SELECT MAX(c.tmdbID) AS end_id
+FROM (SELECT tmdbID FROM Movies WHERE tmdbID > %s ORDER BY tmdbID LIMIT %s) c;
+"""
+
+# Movies in a tmdbID range whose stored aggregates differ from a set-based recompute over Ratings.
+# Params: range start/end for the Ratings scan, range start/end for Movies, total tolerance.
+FIND_AGGREGATE_DRIFT_IN_RANGE = """
+SELECT m.tmdbID, m.title, m.totalRatings AS stored_total, m.countRatings AS stored_count,
+       COALESCE(r.sum_ratings, 0) AS actual_total, COALESCE(r.rating_count, 0) AS actual_count
+FROM Movies m
+LEFT JOIN (
+    SELECT tmdbID, SUM(rating) AS sum_ratings, COUNT(*) AS rating_count
+    FROM Ratings
+    WHERE tmdbID BETWEEN %s AND %s
+    GROUP BY tmdbID
+) r ON r.tmdbID = m.tmdbID
+WHERE m.tmdbID BETWEEN %s AND %s
+  AND (m.countRatings <> COALESCE(r.rating_count, 0)
+       OR ABS(m.totalRatings - COALESCE(r.sum_ratings, 0)) > %s)
+ORDER BY m.tmdbID;
+"""
+
+# Rewrites the aggregates of drifted movies in a tmdbID range from the same set-based recompute;
+# rows that already match are not touched. Params are the same as FIND_AGGREGATE_DRIFT_IN_RANGE.
+REPAIR_AGGREGATE_DRIFT_IN_RANGE = """
+UPDATE Movies m
+LEFT JOIN (
+    SELECT tmdbID, SUM(rating) AS sum_ratings, COUNT(*) AS rating_count
+    FROM Ratings
+    WHERE tmdbID BETWEEN %s AND %s
+    GROUP BY tmdbID
+) r ON r.tmdbID = m.tmdbID
+SET m.totalRatings = COALESCE(r.sum_ratings, 0),
+    m.countRatings = COALESCE(r.rating_count, 0)
+WHERE m.tmdbID BETWEEN %s AND %s
+  AND (m.countRatings <> COALESCE(r.rating_count, 0)
+       OR ABS(m.totalRatings - COALESCE(r.sum_ratings, 0)) > %s);
+"""
+
 # Example: Query to get all cast and crew for a specific movie from MongoDB (this will be handled differently)
 # GET_MOVIE_CAST_CREW = "..." # This will likely be a MongoDB query handled in db_mongo_pre_function.py or a dedicated service
\ No newline at end of file
@@ -1,10 +1,10 @@
 # gui/gui_home.py
 
 from PyQt5.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea,
-    QGridLayout, QMessageBox, QFrame, QTextEdit, QSizePolicy, QSpacerItem, QLineEdit, QComboBox,
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QGridLayout, QMessageBox, QFrame, QSizePolicy, QSpacerItem, QLineEdit, QComboBox,
     QCalendarWidget, QDialog, QRadioButton, QButtonGroup, QSpinBox, QGroupBox, QFormLayout, QVBoxLayout,
-    QToolButton, QListWidget, QAbstractItemView
+    QToolButton, QListWidget, QAbstractItemView, QListView, QCheckBox
 )
 
 class CollapsiblePanel(QWidget):
@@ -133,19 +133,23 @@ class YearSelectorDialog(QDialog):
                 return
 
         super().accept()
-from PyQt5.QtCore import Qt, QUrl # Added QUrl for potential link handling
-from PyQt5.QtGui import QPixmap, QIcon
-from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QIcon
+import logging
+import re
 import sys
 from gui.session_manager import SessionManager
 from gui.gui_signals import global_signals
-from database.services.movie_service import MovieService
+from database.services.movie_service import MovieService, movie_sort_key, SORT_BY_RATING
 from database.services.genre_service import GenreService
+from database.services.cast_crew_service import CastCrewService
 from gui.gui_movie_detail import MovieDetailWindow
 from gui.gui_profile import ProfileWindow
-from gui.utils import is_placeholder_url, DEFAULT_POSTER_PATH, load_default_poster
-import weakref
+from gui.movie_grid import MovieListModel, MovieCardDelegate, POSTER_RELEASE_DELAY_MS
+from gui.workers import TaskRunner
+from gui.live_search import SearchResultCache, fold_title, LIVE_SEARCH_DEBOUNCE_MS, LIVE_SEARCH_MIN_CHARS
 
+logger = logging.getLogger(__name__)
 
 
 class HomeWindow(QWidget):
@@ -156,39 +160,71 @@ class HomeWindow(QWidget):
         self.session_manager = SessionManager()
         self.movie_service = MovieService()
         self.genre_service = GenreService()
+        self.cast_crew_service = CastCrewService()
         self.current_year_selection = None  # Will store (start_year, end_year) or (single_year, None)
         # Current filter state for searches
         self.current_genres = None
         self.current_year = None
         self.current_rating = None
-        # Map active QNetworkReply objects to (label_ref, movie_title) so handlers
-        # can find the right widget when signals arrive. This helps avoid lambda
-        # closures which can sometimes lead to duplicate signal handling.
-        self._reply_map = {}
-        # Initialize current page state
-        self.current_page = 1
+        # Sort order for both browsing and searching: None (newest first) or 'rating'
+        self.current_sort = None
+        # Movies are loaded in batches of movies_per_page as the grid is scrolled;
+        # search results stop after max_pages batches
         self.movies_per_page = 20
         self.max_pages = 10
         # Track if we are in search mode
         self.search_mode = False
         self.current_search_term = ""
-        # Initialize the Network Access Manager for async image loading
-        self.network_manager = QNetworkAccessManager()
         self.profile_window_ref = None
+        # Service calls run in the background (the grid's batches are loaded by its model)
+        self.tasks = TaskRunner()
+        # Title match sets and movie rows seen by as-you-type searches this session, refined locally
+        self.search_cache = SearchResultCache()
+        self.search_is_live = False  # Whether the results shown come from an as-you-type (title substring) search
+        # Restarted on every keystroke in as-you-type mode; the search runs once typing pauses
+        self.live_search_timer = QTimer(self)
+        self.live_search_timer.setSingleShot(True)
+        self.live_search_timer.setInterval(LIVE_SEARCH_DEBOUNCE_MS)
+        self.live_search_timer.timeout.connect(self.run_live_search)
+        # Restarted while the grid scrolls; then the off-screen cards' queued poster downloads are released
+        self.poster_release_timer = QTimer(self)
+        self.poster_release_timer.setSingleShot(True)
+        self.poster_release_timer.setInterval(POSTER_RELEASE_DELAY_MS)
+        self.poster_release_timer.timeout.connect(self.release_offscreen_posters)
         # Connect to global signals
         global_signals.movie_data_updated.connect(self.on_movie_data_updated)
         global_signals.user_logged_out.connect(self.on_user_logged_out)
 
-        self.available_years = []
-        try:
-            years_result = self.movie_service.get_available_years()
-            if years_result.get('success'):
-                self.available_years = years_result.get('years', [])
-        except Exception as e:
-            print(f"DEBUG: Failed to load years from DB: {e}")
+        self.available_years = []  # Filled in by load_filter_options
         
         self.init_ui()
-        self.load_movies_page(self.current_page)
+        self.load_filter_options()
+        self.load_home_movies()
+
+    def closeEvent(self, event):
+        """Drops pending background loads so their results are not delivered to a closed window."""
+        self.tasks.cancel()
+        self.movie_model.cancel()
+        super().closeEvent(event)
+
+    def load_filter_options(self):
+        """Loads the available years and genres for the search filters in the background."""
+        def fetch():
+            return self.movie_service.get_available_years(), self.genre_service.get_all_genres()
+        self.tasks.submit("filters", fetch, self.on_filter_options_loaded,
+                          lambda message: print(f"DEBUG: Failed to load search filters: {message}"))
+
+    def on_filter_options_loaded(self, options):
+        """Fills the year selector range and the genre list once load_filter_options returns."""
+        years_result, genre_result = options
+        if years_result.get('success'):
+            self.available_years = years_result.get('years', [])
+        if genre_result.get('success'):
+            for g in genre_result.get('genres', []):
+                name = g.get('genreName')
+                if name:
+                    self.genre_list.addItem(name)
+                    self.genre_items.append(name)
 
     def handle_genre_selection_change(self):
         all_genre_item = self.genre_list.item(0)
@@ -205,17 +241,138 @@ class HomeWindow(QWidget):
 
     # Slot to handle the signal
     def on_movie_data_updated(self, tmdb_id):
-        """Reloads the current page of movies or search results if the updated movie is visible."""
+        """Refreshes just the updated movie's card in place, or reloads the view if it has to change shape.
+
+        Only that movie's row (and its card credits) is refetched. The view is reloaded if the movie
+        left the result set (it was deleted, or no longer matches the search), moved in the sort
+        order, or is not shown but now belongs among the rows already loaded (e.g. it was just created).
+        """
         print(f"DEBUG: HomeWindow.on_movie_data_updated: Received signal for tmdbID {tmdb_id}.")
-        # Check if we are currently showing paginated movies or search results
-        if self.search_mode and (self.current_search_term or self.current_genres or self.current_year):
-            # If in search mode, reload the search results
-            print(f"DEBUG: HomeWindow.on_movie_data_updated: Reloading search results for title='{self.current_search_term}', genre='{self.current_genres}', year='{self.current_year}'.")
-            self.load_search_results()
+        self.search_cache.clear()  # Cached results may hold the old data
+        search_filters = self.current_search_filters() if self.search_mode else None
+
+        def fetch():
+            result = self.movie_service.get_movies_by_ids([tmdb_id])
+            if not result['success']:
+                raise RuntimeError(f"Loading movie {tmdb_id} failed")
+            movie = result['movies'].get(tmdb_id)
+            if movie is None:
+                return None, False  # Deleted
+            matches = search_filters is None or self.movie_matches_search(movie, search_filters)
+            if matches:
+                self.add_card_credits([movie])
+            return movie, matches
+
+        # One channel per movie: a newer update of the same movie supersedes an older one
+        self.tasks.submit(f"refresh-{tmdb_id}", fetch, lambda result: self.on_movie_refreshed(tmdb_id, *result),
+                          lambda message: self.on_movie_refresh_failed(tmdb_id, message))
+
+    def on_movie_refreshed(self, tmdb_id, movie, matches):
+        """Patches the refreshed card, or reloads the view if the movie enters, leaves or moves within it."""
+        rows = self.movie_model.rows_for_movie(tmdb_id)
+        if not rows:
+            if movie is None or not matches or not self.movie_enters_loaded_rows(movie):
+                print(f"DEBUG: HomeWindow.on_movie_refreshed: tmdbID {tmdb_id} is not in the loaded rows, nothing to refresh.")
+                return
+            reason = "now belongs among the loaded rows"
+        elif movie is not None and matches and self.movie_keeps_position(rows[0], movie):
+            print(f"DEBUG: HomeWindow.on_movie_refreshed: Updated the card of tmdbID {tmdb_id} in place.")
+            self.movie_model.update_movie(movie)
+            return
+        else:
+            reason = "left the results" if movie is None or not matches else "moved in the sort order"
+        print(f"DEBUG: HomeWindow.on_movie_refreshed: tmdbID {tmdb_id} {reason}, reloading.")
+        self.reload_movies()
+
+    def on_movie_refresh_failed(self, tmdb_id, message):
+        """Falls back to a full reload when the updated movie could not be fetched."""
+        print(f"DEBUG: HomeWindow.on_movie_refresh_failed: tmdbID {tmdb_id}: {message}, reloading.")
+        self.reload_movies()
+
+    def reload_movies(self):
+        """Reloads the current view: the search results in search mode, otherwise the home listing."""
+        if self.search_mode:
+            self.load_search_results(live=self.search_is_live)
         else:
-            # If in pagination mode, reload the current page
-            print(f"DEBUG: HomeWindow.on_movie_data_updated: Reloading current page {self.current_page}.")
-            self.load_movies_page(self.current_page) # This will fetch the updated average ratings
+            self.load_home_movies()
+
+    def sorted_by_relevance(self):
+        """True if the shown search results are ordered by FULLTEXT relevance, which cannot be computed locally."""
+        return (self.search_mode and not self.search_is_live and self.current_sort != SORT_BY_RATING
+                and not self.movie_service.title_search_is_substring(
+                    self.current_search_term, self.current_genres, self.current_cast, self.current_crew,
+                    self.current_year_selection, self.current_rating))
+
+    def movie_keeps_position(self, row, movie):
+        """True if the updated movie still sorts between its neighbours at row."""
+        if self.sorted_by_relevance():
+            return True  # Relevance depends only on the title, which a still-matching movie kept
+        key = movie_sort_key(movie, self.current_sort)
+        before = self.movie_model.movie_at(row - 1)
+        after = self.movie_model.movie_at(row + 1)
+        return ((before is None or movie_sort_key(before, self.current_sort) > key)
+                and (after is None or key > movie_sort_key(after, self.current_sort)))
+
+    def movie_enters_loaded_rows(self, movie):
+        """True if a matching movie that is not shown would sort among the rows loaded so far.
+
+        If it sorts after them it shows up by itself when the grid scrolls that far.
+        """
+        if self.sorted_by_relevance() or not self.movie_model.movies or not self.movie_model.canFetchMore():
+            return True
+        last_row = self.movie_model.movies[-1]
+        return movie_sort_key(movie, self.current_sort) > movie_sort_key(last_row, self.current_sort)
+
+    def current_search_filters(self):
+        """Snapshot of the active search filters, for checking a movie against them off the UI thread."""
+        return {
+            'search_term': self.current_search_term,
+            'genres': self.current_genres,
+            'cast': self.current_cast,
+            'crew': self.current_crew,
+            'year_selection': self.current_year_selection,
+            'min_avg_rating': self.current_rating,
+            'title_substring': self.search_is_live or self.movie_service.title_search_is_substring(
+                self.current_search_term, self.current_genres, self.current_cast, self.current_crew,
+                self.current_year_selection, self.current_rating),
+            'titles': {m['tmdbID']: m.get('title') for m in self.movie_model.movies},
+        }
+
+    def movie_matches_search(self, movie, filters):
+        """True if movie (a Movies row) still satisfies the search filters (runs on a worker thread).
+
+        Title, year and rating are checked on the row itself; genre and cast/crew filters need one lookup each.
+        """
+        term = filters['search_term']
+        if term:
+            if filters['title_substring']:
+                if fold_title(term) not in fold_title(movie.get('title')):
+                    return False
+            elif movie['tmdbID'] in filters['titles']:
+                # FULLTEXT word match; only MySQL can tell whether a renamed title still matches
+                if movie.get('title') != filters['titles'][movie['tmdbID']]:
+                    return False
+            elif not set(re.findall(r"\w+", fold_title(term))) & set(re.findall(r"\w+", fold_title(movie.get('title')))):
+                return False  # A movie not shown yet may match if its title shares a word with the term
+        year_selection = filters['year_selection']
+        if year_selection:
+            release_year = movie.get('releaseYear') or (int(str(movie['releaseDate'])[:4]) if movie.get('releaseDate') else None)
+            start_year, end_year = year_selection
+            if release_year is None or not (start_year <= release_year <= (end_year or start_year)):
+                return False
+        if filters['min_avg_rating'] is not None and float(movie.get('avgRating') or 0) < filters['min_avg_rating']:
+            return False
+        tmdb_id = movie['tmdbID']
+        if filters['genres']:
+            genre_result = self.genre_service.get_genres_for_movie(tmdb_id)
+            movie_genres = {g['genreName'] for g in genre_result.get('genres', [])}
+            if not set(filters['genres']).issubset(movie_genres):
+                return False  # Searches require every selected genre
+        if filters['cast'] and tmdb_id not in set(self.cast_crew_service.find_tmdbids_by_cast(filters['cast'])):
+            return False
+        if filters['crew'] and tmdb_id not in set(self.cast_crew_service.find_tmdbids_by_crew(filters['crew'])):
+            return False
+        return True
 
     def on_user_logged_out(self):
         """Handles the user_logged_out signal by updating the UI."""
@@ -257,13 +414,25 @@ class HomeWindow(QWidget):
         main_search_row = QHBoxLayout()
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search movies by title or keyword...")
+        self.search_input.textChanged.connect(self.on_search_text_changed)
         main_search_row.addWidget(self.search_input)
+        self.live_search_checkbox = QCheckBox("Search as you type")
+        self.live_search_checkbox.setToolTip("Shows movies whose title contains the typed text, also when you press Search; "
+                                             "turn it off for keyword matching ranked by relevance.")
+        main_search_row.addWidget(self.live_search_checkbox)
         search_button = QPushButton("Search")
-        search_button.clicked.connect(self.perform_search)
+        search_button.clicked.connect(lambda: self.perform_search())
         clear_search_button = QPushButton("Clear")
         clear_search_button.clicked.connect(self.clear_search)
         main_search_row.addWidget(search_button)
         main_search_row.addWidget(clear_search_button)
+        # Sort order, applied to browsing and to search results
+        main_search_row.addWidget(QLabel("Sort:"))
+        self.sort_combo = QComboBox()
+        self.sort_combo.addItem("Newest", None)
+        self.sort_combo.addItem("Top Rated", "rating")
+        self.sort_combo.currentIndexChanged.connect(self.on_sort_changed)
+        main_search_row.addWidget(self.sort_combo)
         search_layout.addLayout(main_search_row)
 
         # Build the collapsible advanced filter panel
@@ -274,19 +443,7 @@ class HomeWindow(QWidget):
         self.genre_list.setSelectionMode(QAbstractItemView.MultiSelection)
         self.genre_list.addItem("All Genre")
         self.genre_list.item(0).setSelected(True)  # Default to all genres selected
-        self.genre_items = []  # Store references to genre items
-
-        try:
-            genre_result = self.genre_service.get_all_genres()
-            if genre_result.get('success'):
-                genres = genre_result.get('genres', [])
-                for g in genres:
-                    name = g.get('genreName')
-                    if name:
-                        self.genre_list.addItem(name)
-                        self.genre_items.append(name)
-        except Exception as e:
-            print(f"DEBUG: Failed to load genres for multi-select: {e}")
+        self.genre_items = []  # Store references to genre items; filled in by on_filter_options_loaded
 
         self.genre_list.itemSelectionChanged.connect(self.handle_genre_selection_change)
 
@@ -324,29 +481,34 @@ class HomeWindow(QWidget):
         search_layout.addWidget(self.advanced_filters_panel)
         main_layout.addLayout(search_layout)
         # --- Movie Grid Area ---
-        self.scroll_area = QScrollArea()
-        self.scroll_widget = QWidget()
-        self.movie_grid_layout = QGridLayout(self.scroll_widget)
-        self.scroll_area.setWidget(self.scroll_widget)
-        self.scroll_area.setWidgetResizable(True) # Allow the scroll area to expand with content
-        main_layout.addWidget(self.scroll_area)
-
-        # --- Pagination Controls (Arrows only) ---
-        self.pagination_layout = QHBoxLayout() # Store as instance variable
-        self.prev_button = QPushButton("Previous")
-        self.prev_button.clicked.connect(lambda: self.change_page(self.current_page - 1))
-        self.page_label = QLabel("Page 1") # This will be updated
-        self.next_button = QPushButton("Next")
-        self.next_button.clicked.connect(lambda: self.change_page(self.current_page + 1))
-
-        self.pagination_layout.addStretch() # Push controls to the center
-        self.pagination_layout.addWidget(self.prev_button)
-        self.pagination_layout.addWidget(self.page_label)
-        self.pagination_layout.addWidget(self.next_button)
-        self.pagination_layout.addStretch()
-        main_layout.addLayout(self.pagination_layout)
-        # Show/hide based on search mode initially (default is pagination)
-        self.update_pagination_visibility()
+        # A virtualized list: only the visible cards are painted, and further batches are
+        # fetched (canFetchMore/fetchMore) as the user scrolls to the end
+        self.movie_model = MovieListModel(self)
+        self.movie_model.loading_changed.connect(self.on_movies_loading_changed)
+        self.movie_model.batch_loaded.connect(self.on_movies_batch_loaded)
+        self.movie_model.load_failed.connect(self.on_movies_load_failed)
+        self.movie_view = QListView()
+        self.movie_view.setViewMode(QListView.IconMode)
+        self.movie_view.setResizeMode(QListView.Adjust)  # Re-flow the cards when the window is resized
+        self.movie_view.setMovement(QListView.Static)
+        self.movie_view.setUniformItemSizes(True)
+        self.movie_view.setSpacing(10)
+        self.movie_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.movie_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.movie_view.setMouseTracking(True)  # Hover highlight
+        self.movie_view.setItemDelegate(MovieCardDelegate(self.movie_view))
+        self.movie_view.setModel(self.movie_model)
+        self.movie_view.clicked.connect(self.open_movie_detail)
+        self.movie_view.verticalScrollBar().valueChanged.connect(lambda _: self.poster_release_timer.start())
+        main_layout.addWidget(self.movie_view)
+
+        # --- Load status (replaces the Previous/Next pagination controls) ---
+        self.status_layout = QHBoxLayout()
+        self.status_label = QLabel("")
+        self.status_layout.addStretch()
+        self.status_layout.addWidget(self.status_label)
+        self.status_layout.addStretch()
+        main_layout.addLayout(self.status_layout)
 
         # --- REMOVED: Dynamic Page Number Buttons (1, 2, 3, ...) ---
         # self.page_buttons_layout = QHBoxLayout()
@@ -355,8 +517,28 @@ class HomeWindow(QWidget):
 
         self.setLayout(main_layout)
     
-    def perform_search(self):
-        """Handles the search button click."""
+    def on_search_text_changed(self, text):
+        """Restarts the debounce timer while the user types (as-you-type mode only)."""
+        if self.live_search_checkbox.isChecked():
+            self.live_search_timer.start()
+
+    def run_live_search(self):
+        """Runs the as-you-type search once typing has paused."""
+        term = self.search_input.text().strip()
+        if 0 < len(term) < LIVE_SEARCH_MIN_CHARS:
+            return
+        if self.search_mode and term == self.current_search_term:
+            return  # Typed and deleted back to the query already shown
+        self.perform_search(live=True)
+
+    def perform_search(self, live=False):
+        """Handles the search button click, or an as-you-type search if live is True.
+
+        While as-you-type mode is on, an explicit search matches titles the same way (by substring),
+        so pressing Search shows the same results, in the same order, as pausing.
+        """
+        self.live_search_timer.stop()  # An explicit search supersedes a pending as-you-type one
+        live = live or self.live_search_checkbox.isChecked()
         search_term = self.search_input.text().strip()
         genres_selected = self.get_selected_genres()
         year = None
@@ -391,12 +573,16 @@ class HomeWindow(QWidget):
         self.current_cast = cast
         self.current_crew = crew
 
-        print(f"DEBUG: perform_search filters -> title='{search_term}', genres='{genres_selected}', year='{year}', min_avg_rating='{rating}', cast='{cast}', crew='{crew}'")
+        if live:
+            # Runs on every typing pause, so it stays off stdout unless debug logging is enabled
+            logger.debug("live search filters -> title='%s', genres='%s', year='%s', min_avg_rating='%s', cast='%s', crew='%s'",
+                         search_term, genres_selected, year, rating, cast, crew)
+        else:
+            print(f"DEBUG: perform_search filters -> title='{search_term}', genres='{genres_selected}', year='{year}', min_avg_rating='{rating}', cast='{cast}', crew='{crew}'")
 
-        self.current_page = 1
         if search_term or genres_selected is not None or self.current_year_selection or rating is not None or cast or crew:
             self.search_mode = True
-            self.load_search_results()
+            self.load_search_results(live=live)
         else:
             self.clear_search()
 
@@ -423,11 +609,18 @@ class HomeWindow(QWidget):
         self.current_cast = None
         self.current_crew = None
         self.search_mode = False
-        self.current_page = 1
-        self.load_movies_page(self.current_page)
-        self.update_pagination_visibility()
+        self.load_home_movies()
 
 
+    def on_sort_changed(self, index):
+        """Reloads the current view from the start using the newly selected sort order."""
+        self.current_sort = self.sort_combo.itemData(index)
+        print(f"DEBUG: Sort order changed to '{self.current_sort}'")
+        if self.search_mode:
+            self.load_search_results(live=self.search_is_live)
+        else:
+            self.load_home_movies()
+
     def show_year_selector(self):
         """Shows the year selector dialog and updates the button text based on selection."""
         dialog = YearSelectorDialog(self, self.available_years)
@@ -445,14 +638,12 @@ class HomeWindow(QWidget):
                 self.current_year_selection = (start_year, end_year)
                 self.year_button.setText(f"Years: {start_year}-{end_year}")
 
-    def update_pagination_visibility(self):
-        """Shows or hides pagination controls based on search mode and results."""
-        self.prev_button.show()
-        self.page_label.show()
-        self.next_button.show()
+    def load_search_results(self, live=False):
+        """Shows the search results for the current filters, fetching batches in the background as the grid scrolls.
 
-    def load_search_results(self):
-        """Fetches search results using current filters and updates the UI with pagination."""
+        A live (as-you-type) search matches titles by substring and is answered from the session's
+        search cache when it extends a term already searched (see load_live_search_results).
+        """
         # Handle year selection
         year_param = None
         if self.current_year_selection:
@@ -465,56 +656,136 @@ class HomeWindow(QWidget):
         else:
             print("DEBUG: No year filter active")
 
-        # Get paginated search results
-        result = self.movie_service.search_movies_by_title(
+        # Search results (and the cards' credits) are fetched a page at a time in the background as the grid scrolls
+        search_args = dict(
             search_term=self.current_search_term,
             genres=self.current_genres,
             cast=self.current_cast,
             crew=self.current_crew,
             year=year_param,
             min_avg_rating=self.current_rating,
-            page_number=self.current_page,
             movies_per_page=self.movies_per_page,
-            max_pages=self.max_pages
+            max_pages=self.max_pages,
+            sort_by=self.current_sort
         )
-
-        # Debug message for search results
-        year_debug = None
-        if isinstance(year_param, tuple):
-            year_debug = f"{year_param[0]}-{year_param[1]}"
+        self.search_is_live = live
+
+        def fetch_page(page_number):
+            result = self.movie_service.search_movies_by_title(page_number=page_number, **search_args)
+            print(f"DEBUG: Found results for title='{search_args['search_term']}', genre='{search_args['genres']}', "
+                  f"year='{year_param}', min_avg_rating='{search_args['min_avg_rating']}', "
+                  f"page {result['current_page']} of {result['total_pages']}")
+            if result['current_page'] != page_number:
+                return [], None  # The service clamped a page past the end of the results
+            self.add_card_credits(result['movies'])
+            return result['movies'], page_number + 1 if result['has_next'] else None
+
+        if live:
+            self.load_live_search_results(search_args, fetch_page)
         else:
-            year_debug = str(year_param)
-            
-        print(f"DEBUG: Found results for title='{self.current_search_term}', genre='{self.current_genres}', "
-              f"year='{year_debug}', min_avg_rating='{self.current_rating}', "
-              f"page {result['current_page']} of {result['total_pages']}")
-
-        # Clear existing movie widgets from the grid layout
-        while self.movie_grid_layout.count():
-            child = self.movie_grid_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        # Populate the grid with search results
-        if result['movies']:
-            row, col = 0, 0
-            for movie in result['movies']:
-                movie_widget = self.create_movie_widget(movie)
-                self.movie_grid_layout.addWidget(movie_widget, row, col)
-                col += 1
-                if col > 3:  # Show 4 movies per row
-                    col = 0
-                    row += 1
+            self.movie_model.reset(fetch_page, first_token=1)
+
+    def load_live_search_results(self, search_args, fetch_page):
+        """Shows an as-you-type search without re-running the title scan for every pause in typing.
+
+        The ordered IDs of all matches come from the search cache when the term extends one already
+        searched with the same filters, otherwise from one tmdbID/title query whose result is cached.
+        Batches then load only the rows of the cards shown, by primary key (also cached). If too many
+        movies match to list them all, it falls back to fetch_page (the regular paged search).
+        """
+        genres = search_args['genres']
+        filters_key = (tuple(genres) if isinstance(genres, list) else genres, search_args['cast'], search_args['crew'],
+                       search_args['year'], search_args['min_avg_rating'], search_args['sort_by'])
+        term = search_args['search_term'] or ""
+        max_results = self.max_pages * self.movies_per_page  # The same cap as an explicit search
+        per_page = self.movies_per_page
+
+        def matching_ids():
+            ids = self.search_cache.lookup_ids(filters_key, term)
+            if ids is None:
+                result = self.movie_service.search_movie_titles(
+                    search_term=term, genres=genres, cast=search_args['cast'], crew=search_args['crew'],
+                    year=search_args['year'], min_avg_rating=search_args['min_avg_rating'], sort_by=search_args['sort_by']
+                )
+                if not result['success']:
+                    raise RuntimeError("The title search failed")
+                if not result['complete']:
+                    return None
+                self.search_cache.put_titles(filters_key, term, result['titles'])
+                ids = [t['tmdbID'] for t in result['titles']]
+            return ids[:max_results]
+
+        def movies_for(ids):
+            movies = self.search_cache.get_movies(ids)
+            missing = [tmdb_id for tmdb_id in ids if tmdb_id not in movies]
+            if missing:
+                result = self.movie_service.get_movies_by_ids(missing)
+                if not result['success']:
+                    raise RuntimeError("Loading the matching movies failed")
+                fetched = list(result['movies'].values())
+                self.add_card_credits(fetched)
+                self.search_cache.put_movies(fetched)
+                movies.update(result['movies'])
+            return [movies[tmdb_id] for tmdb_id in ids if tmdb_id in movies]
+
+        def fetch_batch(token):
+            # token: None for the first batch, then ("ids", ids, offset) or ("page", page_number)
+            if token is None:
+                ids = matching_ids()
+                if ids is None:
+                    logger.debug("Live search '%s' matches too many movies to list, using the paged search", term)
+                    token = ("page", 1)
+                else:
+                    token = ("ids", ids, 0)
+            if token[0] == "page":
+                movies, next_page = fetch_page(token[1])
+                return movies, ("page", next_page) if next_page is not None else None
+            _, ids, offset = token
+            batch = ids[offset:offset + per_page]
+            next_offset = offset + per_page
+            return movies_for(batch), ("ids", ids, next_offset) if next_offset < len(ids) else None
+
+        self.movie_model.reset(fetch_batch)
+
+    def load_home_movies(self):
+        """Shows all movies (no search filters), fetching batches in the background as the grid scrolls.
+
+        The home page uses keyset pagination, so each batch passes the cursor returned with the previous one.
+        """
+        sort_by = self.current_sort
+
+        def fetch_batch(cursor):
+            result = self.movie_service.get_movies_for_homepage(
+                movies_per_page=self.movies_per_page,
+                cursor=cursor,
+                direction="next",
+                use_keyset=True,
+                sort_by=sort_by,
+                include_total=False  # The grid only needs has_next, so skip the COUNT(*)
+            )
+            self.add_card_credits(result['movies'])
+            return result['movies'], result.get('next_cursor') if result['has_next'] else None
+
+        self.movie_model.reset(fetch_batch)
+
+    def on_movies_loading_changed(self, loading):
+        """Shows a loading message while the grid fetches a batch."""
+        if loading:
+            self.status_label.setText("Loading movies...")
+
+    def on_movies_batch_loaded(self, total, has_more):
+        """Updates the status line after a batch of movies was added to the grid."""
+        if total == 0:
+            self.status_label.setText("No movies found matching your search." if self.search_mode else "No movies found.")
+        elif has_more:
+            self.status_label.setText(f"Showing {total} movies - scroll for more")
         else:
-            # Show a message if no results found
-            no_results_label = QLabel("No movies found matching your search.")
-            no_results_label.setAlignment(Qt.AlignCenter)
-            self.movie_grid_layout.addWidget(no_results_label, 0, 0, 1, 4)  # Span 4 columns
+            self.status_label.setText(f"Showing all {total} movies")
 
-        # Update pagination display
-        self.page_label.setText(f"Page {result['current_page']} of {result['total_pages']}")
-        self.prev_button.setEnabled(result['has_prev'])
-        self.next_button.setEnabled(result['has_next'])
+    def on_movies_load_failed(self, message):
+        """Reports a batch that could not be loaded."""
+        print(f"DEBUG: Failed to load movies: {message}")
+        self.status_label.setText("Could not load movies. Please try again.")
 
     def get_selected_genres(self):
         # Returns None if all genres checked, else a list of selected genres.
@@ -523,276 +794,43 @@ class HomeWindow(QWidget):
             return None  # Means "all genres" (no filter)
         return [g for g in selected if g != "All Genre"] or None
 
-    def load_movies_page(self, page_number):
-        """Fetches movies for the given page and updates the UI."""
-        self.current_page = page_number
-        result = self.movie_service.get_movies_for_homepage(
-            page_number=self.current_page,
-            movies_per_page=self.movies_per_page,
-            max_pages=self.max_pages
-        )
-        
-        # Clear existing movie widgets from the grid layout
-        while self.movie_grid_layout.count():
-            child = self.movie_grid_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        # Populate the grid with new movies
-        movies = result['movies']
-        row, col = 0, 0
-        for movie in movies:
-            movie_widget = self.create_movie_widget(movie)
-            self.movie_grid_layout.addWidget(movie_widget, row, col)
-            col += 1
-            if col > 3:  # Show 4 movies per row
-                col = 0
-                row += 1
-
-        # Update pagination controls
-        if not self.search_mode:
-            self.page_label.setText(f"Page {self.current_page} of {result['total_pages']}")
-            self.prev_button.setEnabled(result['has_prev'])
-            self.next_button.setEnabled(result['has_next'])
-
-    def create_movie_widget(self, movie_data):
-        """Creates a QWidget representing a single movie."""
-        widget = QWidget()
-        widget.setFixedWidth(250) # Set a fixed width for consistency
-        layout = QVBoxLayout(widget)
-        layout.setAlignment(Qt.AlignTop) # Align contents to the top
-
-        # Movie Poster
-        poster_label = QLabel()
-        poster_label.setFixedSize(200, 300) # Set a fixed size for posters
-        poster_label.setAlignment(Qt.AlignCenter)
-        poster_label.setStyleSheet("border: 1px solid gray;") # Add a border for clarity
-
-        # Load poster image from URL or use default
-        poster_url = movie_data.get('poster')
-        # Use the helper function to check for placeholders/invalid URLs
-        if is_placeholder_url(poster_url):
-            # Use default image if poster is NULL, empty, or a known placeholder/invalid URL
-            pixmap = QPixmap(DEFAULT_POSTER_PATH) # Load default image
-            if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(200, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                poster_label.setPixmap(scaled_pixmap)
-            else:
-                poster_label.setText("No Poster") # Fallback if default image also fails
-        else: # If poster_url is not a placeholder/invalid URL
-            # --- ASYNC LOADING ---
-            # Create a request object
-            request = QNetworkRequest(QUrl(poster_url))
-            # Set a short timeout for the request (optional, handled differently in async)
-            request.setTransferTimeout(5000) # Timeout in milliseconds (e.g., 5 seconds)
-            # Start the network request using the manager
-            # The finished signal will be emitted when the request completes (success, failure, timeout)
-            reply = self.network_manager.get(request)
-            # Store a weakref and title for this reply so handlers can look them up
-            label_ref = weakref.ref(poster_label)
-            movie_title = movie_data.get('title', 'Unknown')
-            try:
-                # Map the reply object (QObject) to its context
-                self._reply_map[reply] = (label_ref, movie_title)
-            except Exception:
-                # If reply is not hashable for some reason, fall back to the lambda approach
-                reply.finished.connect(lambda r=reply, lr=label_ref, mt=movie_title: self.on_image_load_finished(r, lr, mt))
-            else:
-                # Connect centralized handlers which use sender() to find reply
-                # Bind finished and errorOccurred when available.
-                try:
-                    reply.finished.connect(self._on_image_reply_finished)
-                except Exception:
-                    # Fallback: if finished doesn't accept this slot, use lambda
-                    reply.finished.connect(lambda r=reply: self._on_image_reply_finished())
-                try:
-                    # errorOccurred is available in newer PyQt5/Qt versions
-                    reply.errorOccurred.connect(self._on_image_reply_error)
-                except Exception:
-                    # Older versions may not have errorOccurred; ignore (finished will still be invoked)
-                    pass
-            # The label currently shows nothing or the old pixmap if reused. It will be updated by the callback.
-            # You could set a temporary loading image here if desired.
-            # --- END ASYNC LOADING ---
-        # Movie Title
-        title_label = QLabel(movie_data.get('title', 'Unknown Title'))
-        title_label.setWordWrap(True) # Allow text wrapping
-        title_label.setStyleSheet("font-weight: bold; font-size: 14px;")
-
-        # Movie Overview (Truncated)
-        overview_text = QTextEdit()
-        overview_text.setMaximumHeight(60) # Limit height
-        overview_text.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded) # Enable scrolling if needed
-        overview_text.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff) # Disable horizontal scrolling
-        overview_text.setPlainText(movie_data.get('overview', 'No overview available.'))
-        overview_text.setReadOnly(True) # Make it non-editable
-        size_policy = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        size_policy.setVerticalStretch(0)
-        overview_text.setSizePolicy(size_policy)
-
-        # Release Date and Rating Info
-        info_label = QLabel()
-        release_date = movie_data.get('releaseDate')
-        if release_date:
-             # Format date if it's a string, or use strftime if it's a datetime object
-             # Assuming it comes as 'YYYY-MM-DD' string from the DB
-            formatted_date = str(release_date)[:10] # Get just the date part if datetime
-        else:
-            formatted_date = "Unknown Date"
-        sum_ratings = movie_data.get('totalRatings', 0) # Retrieves the SUM from the database row
-        num_ratings = movie_data.get('countRatings', 0) # Retrieves the COUNT from the database row
-        avg_rating = 0.0
-        if num_ratings > 0:
-            avg_rating = sum_ratings / num_ratings
-
-        # NEW: Display the CALCULATED average
-        info_label.setText(f"Release: {formatted_date} | Avg: {avg_rating:.1f}/5 ({num_ratings} ratings)")
-
-        # Add widgets to the layout
-        layout.addWidget(poster_label)
-        layout.addWidget(title_label)
-        layout.addWidget(overview_text)
-        layout.addWidget(info_label)
-
-        # Connect click event to open movie detail
-        def open_detail():
-            from gui.gui_movie_detail import MovieDetailWindow
-            print(f"DEBUG: gui_home.py open_detail: Creating MovieDetailWindow for tmdbID {movie_data['tmdbID']}")
-            detail_window = MovieDetailWindow(movie_data['tmdbID']) # Pass the movie ID
-            print(f"DEBUG: gui_home.py open_detail: Attempting to show MovieDetailWindow")
-            try:
-                detail_window.show()
-                print(f"DEBUG: gui_home.py open_detail: Successfully called show() on MovieDetailWindow")
-            except Exception as e:
-                print(f"ERROR: gui_home.py open_detail: Exception occurred when showing MovieDetailWindow: {e}")
-                import traceback
-                traceback.print_exc() # Print the full traceback for detailed error info
-        widget.mousePressEvent = lambda event: open_detail() # Simulate click on the whole widget
-        poster_label.mousePressEvent = lambda event: open_detail() # Also allow click on poster
-        title_label.mousePressEvent = lambda event: open_detail() # Also allow click on title
-        # Note: QTextEdit and QLabel are not focusable by default, so mousePressEvent might not work directly on them if they contain other focusable elements.
-        # The widget-level event should handle most clicks.
-
-        return widget
-
-    def on_image_load_finished(self, reply, poster_label_ref, movie_title):
-        """
-        Callback function called when the QNetworkReply finishes.
-        Updates the specific poster_label with the loaded image or the default image.
-        """
-        poster_label = poster_label_ref()
-        if poster_label is None:
-            reply.deleteLater()
-            return
-
-        if reply.error() == QNetworkReply.NoError:  # Success
-            image_data = reply.readAll()
-            pixmap = QPixmap()
-            pixmap.loadFromData(image_data)
-            if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(200, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                poster_label.setPixmap(scaled_pixmap)
-            else:
-                print(f"Could not load image data for movie '{movie_title}' from {reply.url().toString()}")
-                load_default_poster(poster_label, size=(200, 300))
-        else:  # Error (e.g., 404, timeout, network failure)
-            load_default_poster(poster_label, size=(200, 300))
-
-        reply.deleteLater()
+    def add_card_credits(self, movies):
+        """Adds 'card_credits' (director and lead actor) to each movie dict, with two queries for the whole batch.
 
-    def _handle_reply_once(self, reply):
-        """Internal helper to ensure a reply is processed only once.
-
-        Returns (label_ref, movie_title) tuple or (None, None) if already handled
-        or not found.
+        Called from the background fetch, so it must not touch widgets.
         """
-        # Use the map we maintain to find the widget context
-        try:
-            if reply in self._reply_map:
-                label_ref, movie_title = self._reply_map.pop(reply)
-            else:
-                return None, None
-        except Exception:
-            # If reply isn't hashable or any other issue, bail out
-            return None, None
-
-        # Mark handled via a property to be extra-safe
-        try:
-            if reply.property('handled'):
-                return None, None
-            reply.setProperty('handled', True)
-        except Exception:
-            pass
-
-        return label_ref, movie_title
-
-    def _on_image_reply_finished(self):
-        """Called when a QNetworkReply emits finished(). Uses sender() to locate context."""
-        reply = self.sender()
-        if reply is None:
+        if not movies:
             return
-        # Debug lifecycle
         try:
-            url = reply.url().toString()
-        except Exception:
-            url = '<unknown>'
-        # print(f"DEBUG: _on_image_reply_finished for {url}")
-
-        label_ref, movie_title = self._handle_reply_once(reply)
-        if label_ref is None:
-            reply.deleteLater()
+            credits = self.cast_crew_service.get_card_credits([m['tmdbID'] for m in movies])
+        except Exception as e:
+            print(f"DEBUG: Failed to load card credits: {e}")
             return
+        for movie in movies:
+            movie['card_credits'] = credits.get(movie['tmdbID'])
 
-        # Reuse the existing image processing routine
-        try:
-            self.on_image_load_finished(reply, label_ref, movie_title)
-        except Exception as e:
-            print(f"ERROR: Exception processing finished reply: {e}")
-            reply.deleteLater()
+    def release_offscreen_posters(self):
+        """Lets the poster downloads of the cards now on screen go ahead of those scrolled past."""
+        viewport = self.movie_view.viewport().rect()
+        self.movie_model.release_offscreen_posters(
+            lambda row: self.movie_view.visualRect(self.movie_model.index(row)).intersects(viewport)
+        )
 
-    def _on_image_reply_error(self, code):
-        """Called when a QNetworkReply emits errorOccurred(code)."""
-        reply = self.sender()
-        if reply is None:
-            return
-        try:
-            url = reply.url().toString()
-        except Exception:
-            url = '<unknown>'
-        # print(f"DEBUG: _on_image_reply_error code={code} for {url}")
-
-        label_ref, movie_title = self._handle_reply_once(reply)
-        if label_ref is None:
-            reply.deleteLater()
+    def open_movie_detail(self, index):
+        """Opens the detail window for the clicked card."""
+        movie_data = self.movie_model.movie_at(index.row())
+        if movie_data is None:
             return
-
-        # Treat error like finished but on_image_load_finished will choose default image
+        print(f"DEBUG: gui_home.py open_detail: Creating MovieDetailWindow for tmdbID {movie_data['tmdbID']}")
+        detail_window = MovieDetailWindow(movie_data['tmdbID']) # Pass the movie ID
+        print(f"DEBUG: gui_home.py open_detail: Attempting to show MovieDetailWindow")
         try:
-            self.on_image_load_finished(reply, label_ref, movie_title)
+            detail_window.show()
+            print(f"DEBUG: gui_home.py open_detail: Successfully called show() on MovieDetailWindow")
         except Exception as e:
-            print(f"ERROR: Exception processing error reply: {e}")
-            reply.deleteLater()
-
-
-
-    def load_default_poster(self, poster_label):
-        """Helper function to load the default poster into a given label."""
-        pixmap = QPixmap(DEFAULT_POSTER_PATH)
-        if not pixmap.isNull():
-            scaled_pixmap = pixmap.scaled(200, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            poster_label.setPixmap(scaled_pixmap)
-        else:
-            poster_label.setText("No Poster")
-
-
-    def change_page(self, new_page):
-        """Changes the displayed movie page for both search results and homepage."""
-        if new_page != self.current_page:  # Only reload if page actually changed
-            self.current_page = new_page
-            if self.search_mode:
-                self.load_search_results()
-            else:
-                self.load_movies_page(new_page)
+            print(f"ERROR: gui_home.py open_detail: Exception occurred when showing MovieDetailWindow: {e}")
+            import traceback
+            traceback.print_exc() # Print the full traceback for detailed error info
 
     def open_login_window(self):
         """Opens the login window and passes a reference to this HomeWindow instance."""
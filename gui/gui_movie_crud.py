@@ -11,6 +11,7 @@ from database.services.movie_service import MovieService
 from database.services.genre_service import GenreService
 from database.services.cast_crew_service import CastCrewService
 from gui.gui_signals import global_signals
+from gui.workers import TaskRunner
 
 class MovieForm(QWidget):
     """A reusable movie form widget for both create and edit operations"""
@@ -385,8 +386,19 @@ class MovieForm(QWidget):
         self.crew_display_list.clear() # Clear crew list
         self.movie_data = None
 
-    def load_movie_data(self, movie_data):
-        """Load movie data into the form for editing"""
+    def fetch_related_data(self, tmdb_id):
+        """Fetches the movie's genres, cast and crew (service calls only, so it can run on a worker thread)."""
+        return {
+            'genres': self.genre_service.get_genres_for_movie(tmdb_id),
+            'cast': self.cast_crew_service.get_cast_for_movie(tmdb_id),
+            'crew': self.cast_crew_service.get_crew_for_movie(tmdb_id),
+        }
+
+    def load_movie_data(self, movie_data, related=None):
+        """Load movie data into the form for editing
+
+        related is the result of fetch_related_data if it was already fetched in the background.
+        """
         self.movie_data = movie_data
         if not movie_data:
             return
@@ -402,9 +414,12 @@ class MovieForm(QWidget):
             release_date = QDate.fromString(str(movie_data['releaseDate']), "yyyy-MM-dd")
             self.release_date_input.setDate(release_date)
 
+        if related is None:
+            related = self.fetch_related_data(movie_data['tmdbID'])
+
         # Load genres
         self.genre_list.clear()
-        genre_result = self.genre_service.get_genres_for_movie(movie_data['tmdbID'])
+        genre_result = related['genres']
         if genre_result.get('success'):
             genres = genre_result.get('genres', [])
             for genre in genres:
@@ -412,16 +427,14 @@ class MovieForm(QWidget):
 
         # Load Cast and Crew data
         if movie_data.get('tmdbID'):
-            tmdb_id = movie_data['tmdbID']
-            
-            cast_result = self.cast_crew_service.get_cast_for_movie(tmdb_id)
+            cast_result = related['cast']
             if cast_result.get('success'):
                 cast_data = cast_result.get('cast', [])
                 self.cast_display_list.clear()
                 for person in cast_data:
                     self.create_cast_item(person['name'], person['character'])
 
-            crew_result = self.cast_crew_service.get_crew_for_movie(tmdb_id)
+            crew_result = related['crew']
             if crew_result.get('success'):
                 crew_data = crew_result.get('crew', [])
                 self.crew_display_list.clear()
@@ -473,6 +486,7 @@ class MovieSearchPanel(QWidget):
         super().__init__(parent)
         self.movie_service = MovieService()
         self.genre_service = GenreService()
+        self.tasks = TaskRunner()
         self.init_ui()
 
     def init_ui(self):
@@ -543,12 +557,21 @@ class MovieSearchPanel(QWidget):
         year = self.year_combo.currentText()
         year = None if year == "All Years" else int(year)
 
-        # Search with filters
-        results = self.movie_service.search_movies_by_title(
-            search_term=title,
-            genres=genre,
-            year=year
-        )["movies"]  # Get the movies from the pagination result
+        # Search with filters in the background; a newer search drops the result of an older one
+        self.search_btn.setEnabled(False)
+        self.search_btn.setText("Searching...")
+        self.tasks.submit(
+            "search",
+            lambda: self.movie_service.search_movies_by_title(search_term=title, genres=genre, year=year),
+            self.on_search_results,
+            lambda message: self.on_search_results({"movies": []})
+        )
+
+    def on_search_results(self, result):
+        """Fills the results table with the movies returned by search_movies."""
+        self.search_btn.setEnabled(True)
+        self.search_btn.setText("Search")
+        results = result["movies"]  # Get the movies from the pagination result
 
         # Clear and populate table
         self.results_table.setRowCount(0)
@@ -566,6 +589,8 @@ class MovieCrudWindow(QWidget):
         self.movie_service = MovieService()
         self.cast_crew_service = CastCrewService()
         self.parent = parent
+        # Loads and saves run in the background; the tabs are disabled while a save is in flight
+        self.tasks = TaskRunner()
         
         self.setWindowTitle('Movie Management')
         self.setGeometry(100, 100, 1000, 800)
@@ -634,15 +659,41 @@ class MovieCrudWindow(QWidget):
         # Connect table selection to form update
         self.search_panel.results_table.itemSelectionChanged.connect(self.load_selected_movie)
 
+    def closeEvent(self, event):
+        """Drops pending loads; a save in flight still reports back so other windows get refreshed."""
+        self.tasks.cancel("select")
+        self.search_panel.tasks.cancel()
+        super().closeEvent(event)
+
+    def set_busy(self, busy):
+        """Disables the forms while a save or delete is running."""
+        self.tab_widget.setEnabled(not busy)
+
+    def on_task_failed(self, message):
+        self.set_busy(False)
+        QMessageBox.critical(self, "Error", f"An error occurred: {message}")
+
     def load_selected_movie(self):
         """Load the selected movie into the edit form"""
         table = self.search_panel.results_table
         current_row = table.currentRow()
         if current_row >= 0:
             tmdb_id = int(table.item(current_row, 0).text())
-            movie_result = self.movie_service.get_movie_detail(tmdb_id)
-            if movie_result.get('success') and movie_result.get('movie'):
-                self.edit_form.load_movie_data(movie_result['movie'])
+
+            def fetch():
+                movie_result = self.movie_service.get_movie_detail(tmdb_id)
+                if not (movie_result.get('success') and movie_result.get('movie')):
+                    return None
+                return movie_result['movie'], self.edit_form.fetch_related_data(tmdb_id)
+
+            # Selecting another row before this returns supersedes it
+            self.tasks.submit("select", fetch, self.on_selected_movie_loaded,
+                              lambda message: print(f"DEBUG: Failed to load movie {tmdb_id}: {message}"))
+
+    def on_selected_movie_loaded(self, loaded):
+        if loaded is not None:
+            movie, related = loaded
+            self.edit_form.load_movie_data(movie, related)
 
     def create_movie(self):
         """Create a new movie"""
@@ -656,7 +707,7 @@ class MovieCrudWindow(QWidget):
             QMessageBox.warning(self, "Validation Error", "At least one genre is required!")
             return
 
-        try:
+        def save():
             result = self.movie_service.create_movie(movie_data)
             print(f"DEBUG: MovieService.create_movie returned result: {result}")
             if result["success"]:
@@ -664,35 +715,35 @@ class MovieCrudWindow(QWidget):
                 print(f"DEBUG: Retrieved tmdbID from result: {tmdb_id}")
                 if tmdb_id:
                     # NOW save cast and crew data with the correct tmdbID
-                    cast_list = movie_data.get("cast", [])
-                    crew_list = movie_data.get("crew", [])
-                    
-                    # Save cast members
-                    for person in cast_list:
-                        cast_result = self.cast_crew_service.add_cast_member(
-                            tmdb_id, person['name'], person['character']
-                        )
-                        if not cast_result["success"]:
-                            print(f"Warning: Could not save cast member {person['name']}: {cast_result['message']}")
-                    
-                    # Save crew members
-                    for person in crew_list:
-                        crew_result = self.cast_crew_service.add_crew_member(
-                            tmdb_id, person['name'], person['job'], person['department']
-                        )
-                        if not crew_result["success"]:
-                            print(f"Warning: Could not save crew member {person['name']}: {crew_result['message']}")
-                
-                QMessageBox.information(self, "Success", "Movie created successfully!")
-                self.create_form.clear_form()
-                
-                # Emit signal to notify other windows
-                global_signals.movie_data_updated.emit(tmdb_id)
-                self.close()
-            else:
-                QMessageBox.critical(self, "Error", f"Failed to create movie: {result['message']}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
+                    self.save_credits(tmdb_id, movie_data)
+            return result
+
+        self.set_busy(True)
+        self.tasks.submit("save", save, self.on_movie_created, self.on_task_failed)
+
+    def on_movie_created(self, result):
+        self.set_busy(False)
+        if result["success"]:
+            tmdb_id = result.get("movie_id")
+            QMessageBox.information(self, "Success", "Movie created successfully!")
+            self.create_form.clear_form()
+            
+            # Emit signal to notify other windows
+            global_signals.movie_data_updated.emit(tmdb_id)
+            self.close()
+        else:
+            QMessageBox.critical(self, "Error", f"Failed to create movie: {result['message']}")
+
+    def save_credits(self, tmdb_id, movie_data):
+        """Replaces the movie's cast and crew with the lists from the form (runs on a worker thread)."""
+        result = self.cast_crew_service.replace_credits(
+            tmdb_id, movie_data.get("cast", []), movie_data.get("crew", [])
+        )
+        for item in result["cast_results"] + result["crew_results"]:
+            if not item["success"]:
+                print(f"Warning: Could not save credit {item.get('name')} ({item['action']}): {item.get('message')}")
+        print(f"DEBUG: MovieCrudWindow.save_credits: {result['message']}")
+        return result
 
     def update_movie(self):
         """Update the selected movie"""
@@ -709,7 +760,13 @@ class MovieCrudWindow(QWidget):
             QMessageBox.warning(self, "Validation Error", "At least one genre is required!")
             return
 
-        stats_result = self.movie_service.get_movie_stats(movie_data["tmdbID"])
+        self.set_busy(True)
+        self.tasks.submit("save", lambda: self.movie_service.get_movie_stats(movie_data["tmdbID"]),
+                          lambda stats_result: self.confirm_update_movie(movie_data, stats_result),
+                          self.on_task_failed)
+
+    def confirm_update_movie(self, movie_data, stats_result):
+        """Asks for confirmation if the movie has ratings or reviews, then saves it in the background."""
         if stats_result.get('success'):
             rating_count = stats_result.get('rating_count', 0)
             review_count = stats_result.get('review_count', 0)
@@ -725,47 +782,30 @@ class MovieCrudWindow(QWidget):
                     f"Note: This will not affect existing ratings and reviews.",
                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
                 if reply == QMessageBox.No:
+                    self.set_busy(False)
                     return
 
-        try:
+        def save():
             result = self.movie_service.update_movie(movie_data)
             if result["success"]:
-                tmdb_id = movie_data["tmdbID"]
-                
-                # Delete existing cast and crew data first
-                self.cast_crew_service.delete_all_cast_for_movie(tmdb_id)
-                self.cast_crew_service.delete_all_crew_for_movie(tmdb_id)
-                
-                # Now save the updated cast and crew data
-                cast_list = movie_data.get("cast", [])
-                crew_list = movie_data.get("crew", [])
-                
-                # Save cast members
-                for person in cast_list:
-                    cast_result = self.cast_crew_service.add_cast_member(
-                        tmdb_id, person['name'], person['character']
-                    )
-                    if not cast_result["success"]:
-                        print(f"Warning: Could not save cast member {person['name']}: {cast_result['message']}")
-                
-                # Save crew members
-                for person in crew_list:
-                    crew_result = self.cast_crew_service.add_crew_member(
-                        tmdb_id, person['name'], person['job'], person['department']
-                    )
-                    if not crew_result["success"]:
-                        print(f"Warning: Could not save crew member {person['name']}: {crew_result['message']}")
-
-                QMessageBox.information(self, "Success", "Movie updated successfully!")
-                self.search_panel.search_movies()  # Refresh search results
-                self.edit_form.clear_form()
-                
-                # Emit signal to notify other windows
-                global_signals.movie_data_updated.emit(tmdb_id)
-            else:
-                QMessageBox.critical(self, "Error", f"Failed to update movie: {result['message']}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
+                # Bring the stored cast and crew in line with the form (only the differences are written)
+                self.save_credits(movie_data["tmdbID"], movie_data)
+            return result
+
+        self.tasks.submit("save", save, lambda result: self.on_movie_updated(movie_data["tmdbID"], result),
+                          self.on_task_failed)
+
+    def on_movie_updated(self, tmdb_id, result):
+        self.set_busy(False)
+        if result["success"]:
+            QMessageBox.information(self, "Success", "Movie updated successfully!")
+            self.search_panel.search_movies()  # Refresh search results
+            self.edit_form.clear_form()
+            
+            # Emit signal to notify other windows
+            global_signals.movie_data_updated.emit(tmdb_id)
+        else:
+            QMessageBox.critical(self, "Error", f"Failed to update movie: {result['message']}")
 
     def delete_movie(self):
         """Delete the selected movie"""
@@ -775,7 +815,13 @@ class MovieCrudWindow(QWidget):
             return
 
         # FIXED: Use service layer instead of repository
-        stats_result = self.movie_service.get_movie_stats(movie_data["tmdbID"])
+        self.set_busy(True)
+        self.tasks.submit("save", lambda: self.movie_service.get_movie_stats(movie_data["tmdbID"]),
+                          lambda stats_result: self.confirm_delete_movie(movie_data, stats_result),
+                          self.on_task_failed)
+
+    def confirm_delete_movie(self, movie_data, stats_result):
+        """Asks for confirmation (warning about ratings and reviews), then deletes the movie in the background."""
         warning_msg = f"Are you sure you want to delete '{movie_data['title']}'?"
 
         if stats_result.get('success'):
@@ -796,29 +842,36 @@ class MovieCrudWindow(QWidget):
             warning_msg,
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
-        if reply == QMessageBox.Yes:
-            try:
-                # Delete cast/crew data from MongoDB BEFORE deleting the movie from MySQL
-                tmdb_id = movie_data["tmdbID"]
-                print(f"DEBUG: Attempting to delete cast/crew for tmdbID {tmdb_id} before deleting movie.")
-                cast_result = self.cast_crew_service.delete_all_cast_for_movie(tmdb_id)
-                crew_result = self.cast_crew_service.delete_all_crew_for_movie(tmdb_id)
-
-                if not cast_result["success"]:
-                    print(f"WARNING: Could not delete cast for movie {tmdb_id}: {cast_result['message']}")
-                if not crew_result["success"]:
-                    print(f"WARNING: Could not delete crew for movie {tmdb_id}: {crew_result['message']}")
-
-                # Now, delete the main movie entry
-                result = self.movie_service.delete_movie(tmdb_id)
-                if result["success"]:
-                    QMessageBox.information(self, "Success", "Movie deleted successfully!")
-                    self.search_panel.search_movies()  # Refresh search results
-                    self.edit_form.clear_form()
-                    
-                    # Emit signal to notify other windows
-                    global_signals.movie_data_updated.emit(tmdb_id)
-                else:
-                    QMessageBox.critical(self, "Error", f"Failed to delete movie: {result['message']}")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
\ No newline at end of file
+        if reply != QMessageBox.Yes:
+            self.set_busy(False)
+            return
+
+        tmdb_id = movie_data["tmdbID"]
+
+        def delete():
+            # Delete cast/crew data from MongoDB BEFORE deleting the movie from MySQL
+            print(f"DEBUG: Attempting to delete cast/crew for tmdbID {tmdb_id} before deleting movie.")
+            cast_result = self.cast_crew_service.delete_all_cast_for_movie(tmdb_id)
+            crew_result = self.cast_crew_service.delete_all_crew_for_movie(tmdb_id)
+
+            if not cast_result["success"]:
+                print(f"WARNING: Could not delete cast for movie {tmdb_id}: {cast_result['message']}")
+            if not crew_result["success"]:
+                print(f"WARNING: Could not delete crew for movie {tmdb_id}: {crew_result['message']}")
+
+            # Now, delete the main movie entry
+            return self.movie_service.delete_movie(tmdb_id)
+
+        self.tasks.submit("save", delete, lambda result: self.on_movie_deleted(tmdb_id, result), self.on_task_failed)
+
+    def on_movie_deleted(self, tmdb_id, result):
+        self.set_busy(False)
+        if result["success"]:
+            QMessageBox.information(self, "Success", "Movie deleted successfully!")
+            self.search_panel.search_movies()  # Refresh search results
+            self.edit_form.clear_form()
+            
+            # Emit signal to notify other windows
+            global_signals.movie_data_updated.emit(tmdb_id)
+        else:
+            QMessageBox.critical(self, "Error", f"Failed to delete movie: {result['message']}")
@@ -4,9 +4,8 @@ from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTextEdit,
     QFormLayout, QScrollArea, QFrame, QMessageBox, QGridLayout, QSpacerItem
 )
-from PyQt5.QtCore import Qt, QUrl
-from PyQt5.QtGui import QPixmap, QIcon
-from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QIcon
 from gui.session_manager import SessionManager
 from gui.gui_signals import global_signals #for global signal to refresh other pages
 from database.services.movie_service import MovieService
@@ -14,8 +13,12 @@ from database.services.rating_service import RatingService
 from database.services.review_service import ReviewService
 from database.services.genre_service import GenreService
 from database.services.cast_crew_service import CastCrewService
+from database.services.movie_detail_service import MovieDetailService
 
-from gui.utils import is_placeholder_url, DEFAULT_POSTER_PATH, load_default_poster
+from gui.utils import is_placeholder_url, load_default_poster
+from gui.poster_cache import PosterCache
+from gui.poster_fetcher import PosterFetcher, PRIORITY_DETAIL
+from gui.workers import TaskRunner
 
 class MovieDetailWindow(QWidget):
     def __init__(self, tmdb_id):
@@ -28,8 +31,13 @@ class MovieDetailWindow(QWidget):
         self.review_service = ReviewService()
         self.genre_service = GenreService()
         self.cast_crew_service = CastCrewService()
+        self.movie_detail_service = MovieDetailService()
 
-        self.network_manager = QNetworkAccessManager()
+        # Downloads go through the shared fetcher, so the grid and this window never fetch a poster twice
+        self.poster_fetcher = PosterFetcher()
+        self.poster_cache = PosterCache()
+        # Detail loads and submissions run in the background; the "Loading..." labels show meanwhile
+        self.tasks = TaskRunner()
 
         self.setWindowTitle('Movie Details')
         self.setGeometry(150, 150, 1000, 800)
@@ -49,6 +57,7 @@ class MovieDetailWindow(QWidget):
     # Debug closeEvent
     def closeEvent(self, event):
         # print("DEBUG: MovieDetailWindow.closeEvent called - Window is about to close.")
+        self.tasks.cancel("details")  # A submission in flight still reports back and notifies other windows
         event.accept() # Accept the close event, allowing the window to close
 
     def init_ui(self):
@@ -213,16 +222,31 @@ class MovieDetailWindow(QWidget):
             # print(f"DEBUG: Rating selected, stored: {self.selected_rating}")
 
 
-    def load_movie_details(self):
-        """Loads and displays the movie details."""
-        # Fetch main movie info
-        movie_result = self.movie_service.get_movie_detail(self.tmdb_id)
-        if not movie_result.get('success') or not movie_result.get('movie'):
+    def load_movie_details(self, prefill_user_input=True):
+        """Loads the movie details in the background; on_movie_details_loaded displays them.
+
+        With prefill_user_input=False the user's saved rating/review are not copied into the inputs.
+        """
+        # Fetch every part of the page concurrently (movie, genres, cast/crew, reviews, user's rating/review)
+        user_id = self.session_manager.get_current_user_id() if self.session_manager.is_logged_in() else None
+        self.tasks.submit("details", lambda: self.movie_detail_service.load(self.tmdb_id, user_id),
+                          lambda detail: self.on_movie_details_loaded(detail, user_id if prefill_user_input else None),
+                          self.on_movie_details_failed)
+
+    def on_movie_details_failed(self, message):
+        """Reports a detail load that raised instead of returning."""
+        print(f"DEBUG: MovieDetailWindow: Failed to load details for {self.tmdb_id}: {message}")
+        QMessageBox.critical(self, 'Error', f'Could not load details for movie ID {self.tmdb_id}.')
+        self.close()
+
+    def on_movie_details_loaded(self, detail, user_id):
+        """Displays the details returned by load_movie_details (user_id None skips the rating/review prefill)."""
+        if not detail.found:
             QMessageBox.critical(self, 'Error', f'Could not load details for movie ID {self.tmdb_id}.')
             self.close()
             return
 
-        movie_detail = movie_result['movie']
+        movie_detail = detail.movie
         print(f"DEBUG: MovieDetailWindow.load_movie_details(): Retrieved movie detail: {movie_detail.get('title')}")
 
         # --- Populate Movie Info ---
@@ -238,21 +262,17 @@ class MovieDetailWindow(QWidget):
         # Load Poster
         poster_url = movie_detail.get('poster')
         # print(f"DEBUG: MovieDetailWindow.load_movie_details(): Poster URL is '{poster_url}'")
-        if is_placeholder_url(poster_url):
-            # print("DEBUG: MovieDetailWindow.load_movie_details(): Poster URL is a placeholder.")
-            pixmap = QPixmap(DEFAULT_POSTER_PATH)
-            if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(300, 450, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                self.poster_label.setPixmap(scaled_pixmap)
-            else:
-                self.poster_label.setText("No Poster")
-        else:
+        # The shared placeholder stays up until the poster is ready
+        load_default_poster(self.poster_label, size=(300, 450))
+        # Cached posters are decoded off the UI thread and handed to show_poster; others are downloaded
+        if not is_placeholder_url(poster_url) and not self.poster_cache.request(poster_url, (300, 450), self.show_poster):
             # print("DEBUG: MovieDetailWindow.load_movie_details(): Attempting to load poster from URL.")
-            request = QNetworkRequest(QUrl(poster_url))
-            request.setTransferTimeout(5000)
-            reply = self.network_manager.get(request)
-            reply.finished.connect(
-                lambda: self.on_poster_load_finished(reply, self.poster_label, movie_detail.get('title', 'Unknown'))
+            # Tied to the label, so the download is dropped if the window is destroyed first
+            self.poster_fetcher.fetch(
+                poster_url,
+                lambda data, url=poster_url: self.on_poster_load_finished(url, data, self.poster_label, movie_detail.get('title', 'Unknown')),
+                owner=self.poster_label,
+                priority=PRIORITY_DETAIL
             )
 
         runtime = movie_detail.get('runtime')
@@ -274,72 +294,48 @@ class MovieDetailWindow(QWidget):
 
         self.overview_text.setPlainText(movie_detail.get('overview', 'No overview available.'))
 
-        # --- Fetch and Populate Genres, Cast, Crew ---
-        genre_result = self.genre_service.get_genres_for_movie(self.tmdb_id)
-        if genre_result.get('success'):
-            genres = genre_result.get('genres', [])
-            genre_names = [g['genreName'] for g in genres]
-            self.genres_text.setPlainText(", ".join(genre_names) if genre_names else "No genres listed.")
-        else:
-            self.genres_text.setPlainText("No genres listed.")
+        # --- Populate Genres, Cast, Crew ---
+        self.genres_text.setPlainText(", ".join(detail.genres) if detail.genres else "No genres listed.")
+        director_info = detail.director
+        self.director_text.setText(director_info['name'] if director_info else "Director information not available.")
+        self.cast_text.setPlainText(", ".join(detail.cast_list) if detail.cast_list else "Cast information not available.")
 
-        # Fetch director
-        director_result = self.cast_crew_service.get_director_for_movie(self.tmdb_id)
-        if director_result.get('success'):
-            director_info = director_result.get('director')
-            self.director_text.setText(director_info['name'] if director_info else "Director information not available.")
-        else:
-            self.director_text.setText("Director information not available.")
+        # --- Populate Reviews ---
+        self.load_reviews(detail.reviews)
 
-        # Fetch cast
-        cast_result = self.cast_crew_service.get_formatted_cast_list(self.tmdb_id)
-        if cast_result.get('success'):
-            cast_list = cast_result.get('cast_list', [])
-            self.cast_text.setPlainText(", ".join(cast_list) if cast_list else "Cast information not available.")
-        else:
-            self.cast_text.setPlainText("Cast information not available.")
-
-        # --- Fetch and Populate Reviews ---
-        self.load_reviews()
-
-        # --- Check for Existing User Rating/Review (if logged in) ---
-        if self.session_manager.is_logged_in():
-            user_id = self.session_manager.get_current_user_id()
-            
-            rating_result = self.rating_service.get_user_rating_for_movie(user_id, self.tmdb_id)
-            if rating_result.get('success') and rating_result.get('rating'):
-                existing_rating = rating_result['rating']
-                rating_val = float(existing_rating['rating'])
+        # --- Existing User Rating/Review (if logged in) ---
+        if user_id is not None:
+            if detail.user_rating is not None:
+                rating_val = detail.user_rating
                 for btn in self.rating_buttons:
                     if btn.text() == f"{rating_val:.1f}":
                         btn.setChecked(True)
                         self.select_rating(rating_val, True)
                         break
 
-            review_result = self.review_service.get_user_review_for_movie(user_id, self.tmdb_id)
-            if review_result.get('success') and review_result.get('review'):
-                existing_review = review_result['review']
-                self.review_text_input.setPlainText(existing_review['review']) # Pre-fill the review text
+            if detail.user_review:
+                self.review_text_input.setPlainText(detail.user_review) # Pre-fill the review text
         #else:
             #print("DEBUG: MovieDetailWindow.load_movie_details(): User is not logged in, skipping rating/review check.")
         # print("DEBUG: MovieDetailWindow.load_movie_details(): Finished.")
 
-    def load_reviews(self):
+    def load_reviews(self, reviews=None):
         # print("DEBUG: MovieDetailWindow.load_reviews() called")
-        """Fetches and displays the 3 most recent reviews."""
+        """Displays the 3 most recent reviews, fetching them unless already loaded."""
         # Clear existing review widgets
         while self.reviews_container.count():
             child = self.reviews_container.takeAt(0)
             if child.widget():
                 child.widget().deleteLater()
 
-        review_result = self.review_service.get_reviews_for_movie(self.tmdb_id)
-        if not review_result.get('success'):
-            no_reviews_label = QLabel("No reviews yet.")
-            self.reviews_container.addWidget(no_reviews_label)
-            return
+        if reviews is None:
+            review_result = self.review_service.get_reviews_for_movie(self.tmdb_id)
+            if not review_result.get('success'):
+                no_reviews_label = QLabel("No reviews yet.")
+                self.reviews_container.addWidget(no_reviews_label)
+                return
+            reviews = review_result.get('reviews', [])
 
-        reviews = review_result.get('reviews', [])
         if not reviews:
             no_reviews_label = QLabel("No reviews yet.")
             self.reviews_container.addWidget(no_reviews_label)
@@ -365,26 +361,29 @@ class MovieDetailWindow(QWidget):
                 self.reviews_container.addWidget(review_widget)
         # print("DEBUG: MovieDetailWindow.load_reviews(): Finished.")
 
-    def on_poster_load_finished(self, reply, poster_label, movie_title):
-        """Callback for loading the movie poster."""
-        # print(f"DEBUG: MovieDetailWindow.on_poster_load_finished() called for '{movie_title}'")
-        if reply.error() == QNetworkReply.NoError:
-            image_data = reply.readAll()
-            pixmap = QPixmap()
-            pixmap.loadFromData(image_data)
-            if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(300, 450, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                poster_label.setPixmap(scaled_pixmap)
+    def show_poster(self, pixmap):
+        """Shows a decoded poster, or the placeholder if it could not be decoded."""
+        try:
+            if pixmap is not None:
+                self.poster_label.setPixmap(pixmap)
             else:
-                # print(f"DEBUG: MovieDetailWindow.on_poster_load_finished(): Could not load image data for movie '{movie_title}' from {reply.url().toString()}")
-                # --- Use helper from utils ---
-                load_default_poster(poster_label, size=(300, 450))
-                
+                load_default_poster(self.poster_label, size=(300, 450))
+        except RuntimeError:
+            pass  # The window was closed while the poster was decoding
+
+    def on_poster_load_finished(self, url, image_data, poster_label, movie_title):
+        """Callback for loading the movie poster (image_data is None if the download failed)."""
+        # print(f"DEBUG: MovieDetailWindow.on_poster_load_finished() called for '{movie_title}'")
+        if image_data:
+            # Decoded, scaled and cached on the thumbnail pool; show_poster falls back to the placeholder
+            self.poster_cache.store(url, image_data, (300, 450), self.show_poster)
         else:
-            # print(f"DEBUG: MovieDetailWindow.on_poster_load_finished(): Failed to load poster for '{movie_title}' from {reply.url().toString()}: {reply.errorString()}")
+            # print(f"DEBUG: MovieDetailWindow.on_poster_load_finished(): Failed to load poster for '{movie_title}' from {url}")
             # --- Use helper from utils ---
-            load_default_poster(poster_label, size=(300, 450))
-        reply.deleteLater()
+            try:
+                load_default_poster(poster_label, size=(300, 450))
+            except RuntimeError:
+                pass  # The window was closed during the download
         # print(f"DEBUG: MovieDetailWindow.on_poster_load_finished(): Finished for '{movie_title}'")
 
     # Note: This helper is redundant now as load_default_poster from utils.py is used
@@ -418,16 +417,47 @@ class MovieDetailWindow(QWidget):
             QMessageBox.warning(self, 'No Input', 'Please provide a rating or a review.')
             return
 
-        success = True
-        message_parts = []
-
+        self.submit_button.setEnabled(False)
+        self.submit_button.setText("Submitting...")
+        self.tasks.submit("submit",
+                          lambda: self._save_rating_review(user_id, rating_value, review_text),
+                          lambda results: self.on_rating_review_saved(results, rating_value, review_text),
+                          self.on_rating_review_failed)
+
+    def _save_rating_review(self, user_id, rating_value, review_text):
+        """Runs on a worker thread: saves the rating and/or review, returning (rating_result, review_result)."""
+        rating_result = None
+        review_result = None
         # Submit Rating if selected
         if rating_value is not None:
             # print(f"DEBUG: MovieDetailWindow.submit_rating_review(): Attempting to submit rating: {rating_value}")
             # Pass the float rating_value directly
             rating_result = self.rating_service.add_rating(user_id, self.tmdb_id, rating_value)
             # print(f"DEBUG: MovieDetailWindow.submit_rating_review(): Rating service result: {rating_result}")
+        # Submit Review if provided
+        if review_text:
+            # print(f"DEBUG: MovieDetailWindow.submit_rating_review(): Attempting to submit review: {review_text[:50]}...") # Print first 50 chars
+            review_result = self.review_service.add_review(user_id, self.tmdb_id, review_text)
+            # print(f"DEBUG: MovieDetailWindow.submit_rating_review(): Review service result: {review_result}")
+        return rating_result, review_result
+
+    def _reset_submit_button(self):
+        self.submit_button.setEnabled(True)
+        self.submit_button.setText("Submit Rating/Review")
 
+    def on_rating_review_failed(self, message):
+        """Reports a submission that raised instead of returning a result."""
+        self._reset_submit_button()
+        QMessageBox.critical(self, 'Error', f'Could not submit your rating/review: {message}')
+
+    def on_rating_review_saved(self, results, rating_value, review_text):
+        """Reports the results of submit_rating_review and refreshes the page."""
+        self._reset_submit_button()
+        rating_result, review_result = results
+        success = True
+        message_parts = []
+
+        if rating_result is not None:
             if rating_result['success']:
                 message_parts.append("Rating submitted successfully.")
                 print(f"DEBUG: MovieDetailWindow.submit_rating_review: Emitting movie_data_updated signal for tmdbID {self.tmdb_id}")
@@ -437,12 +467,7 @@ class MovieDetailWindow(QWidget):
                 success = False
                 message_parts.append(rating_result['message'])
 
-        # Submit Review if provided
-        if review_text:
-            # print(f"DEBUG: MovieDetailWindow.submit_rating_review(): Attempting to submit review: {review_text[:50]}...") # Print first 50 chars
-            review_result = self.review_service.add_review(user_id, self.tmdb_id, review_text)
-            # print(f"DEBUG: MovieDetailWindow.submit_rating_review(): Review service result: {review_result}")
-
+        if review_result is not None:
             if review_result['success']:
                 message_parts.append("Review submitted successfully.")
                 # Emit signal indicating movie data changed (even if only review changed)
@@ -455,8 +480,8 @@ class MovieDetailWindow(QWidget):
         if success:
             # print("DEBUG: MovieDetailWindow.submit_rating_review(): All submissions successful.")
             QMessageBox.information(self, 'Success', " ".join(message_parts))
-            # Reload movie details to show updated average rating and review count
-            self.load_movie_details()
+            # Reload movie details to show updated average rating and review count (the inputs are cleared below)
+            self.load_movie_details(prefill_user_input=False)
             # Clear the input fields after successful submission
             if rating_value is not None:
                 # Deselect all rating buttons
@@ -12,6 +12,7 @@ from database.services.movie_service import MovieService
 from database.services.rating_service import RatingService
 from database.services.user_service import UserService
 from gui.gui_movie_detail import MovieDetailWindow
+from gui.workers import TaskRunner
 
 class ProfileWindow(QWidget):
     def __init__(self, session_manager):
@@ -30,6 +31,10 @@ class ProfileWindow(QWidget):
         
         # Keep reference to the CRUD window
         self.movie_crud_window = None
+        # The selected user's interactions from the last load, patched in place on movie_data_updated
+        self.profile_interactions = None
+        # Profile loads run in the background; a newer load (e.g. another user selected) supersedes an older one
+        self.tasks = TaskRunner()
 
         self.setWindowTitle('Profile')
         self.setGeometry(200, 200, 800, 600)
@@ -39,9 +44,30 @@ class ProfileWindow(QWidget):
         self.load_profile_data()
 
     def on_movie_data_updated(self, tmdb_id):
-        """Reloads the profile data if the updated movie is relevant to the currently viewed profile."""
-        print(f"DEBUG: ProfileWindow.on_movie_data_updated: Received signal for tmdbID {tmdb_id}. Reloading data for selected user ID {self.selected_user_id}.")
-        self.load_profile_data()
+        """Refetches the selected user's entry for just the updated movie and patches the list in place."""
+        print(f"DEBUG: ProfileWindow.on_movie_data_updated: Received signal for tmdbID {tmdb_id}. Refreshing it for selected user ID {self.selected_user_id}.")
+        if not self.selected_user_id or self.profile_interactions is None:
+            return  # The full load has not finished yet and will include the change
+        user_id = self.selected_user_id
+        # One channel per movie: a newer update of the same movie supersedes an older one
+        self.tasks.submit(
+            f"refresh-{tmdb_id}",
+            lambda: self.rating_service.get_user_interaction_for_movie(user_id, tmdb_id),
+            lambda result: self.on_interaction_refreshed(user_id, tmdb_id, result)
+        )
+
+    def on_interaction_refreshed(self, user_id, tmdb_id, result):
+        """Replaces, adds or removes the movie's entry and redraws the list from memory."""
+        if user_id != self.selected_user_id or self.profile_interactions is None:
+            return  # Another user was selected meanwhile
+        if not result.get('success'):
+            self.load_profile_data()  # Could not tell what changed; fall back to a full reload
+            return
+        interactions = [i for i in self.profile_interactions if i['tmdbID'] != tmdb_id]
+        if result['interaction'] is not None:
+            interactions.append(result['interaction'])
+        self.profile_interactions = interactions
+        self.render_profile_interactions()
 
     def showEvent(self, event):
         print("DEBUG: ProfileWindow.showEvent called - Window is being shown, reloading data.")
@@ -55,6 +81,7 @@ class ProfileWindow(QWidget):
             print("DEBUG: ProfileWindow.closeEvent: Disconnected movie_data_updated signal.")
         except TypeError:
             print("DEBUG: ProfileWindow.closeEvent: Signal was already disconnected or not connected.")
+        self.tasks.cancel()
         event.accept()
 
     def init_ui(self):
@@ -436,22 +463,44 @@ class ProfileWindow(QWidget):
             QMessageBox.information(self, 'User Not Found', f'No user found with email: {email_to_search}')
 
     def load_profile_data(self):
-        """Loads the rated/reviewed movies for the currently selected user (self.selected_user_id)."""
+        """Loads the rated/reviewed movies for the currently selected user (self.selected_user_id) in the background."""
         if not self.selected_user_id:
             print(f"DEBUG: ProfileWindow.load_profile_data: selected_user_id is None or 0.")
             return
 
         print(f"DEBUG: ProfileWindow.load_profile_data: Loading data for userID {self.selected_user_id}")
 
+        # Show a loading row until the service returns
+        self.rated_movies_list.clear()
+        loading_item = QListWidgetItem("Loading...")
+        loading_item.setFlags(Qt.NoItemFlags)
+        self.rated_movies_list.addItem(loading_item)
+
         # Get the raw data from the service (includes ratings and reviews)
-        interactions_result = self.rating_service.get_user_ratings_and_reviews_for_profile(self.selected_user_id)
-        
+        user_id = self.selected_user_id
+        self.profile_interactions = None
+        self.tasks.submit(
+            "profile",
+            lambda: self.rating_service.get_user_ratings_and_reviews_for_profile(user_id),
+            self.on_profile_data_loaded,
+            lambda message: self.on_profile_data_loaded({'success': False, 'message': message})
+        )
+
+    def on_profile_data_loaded(self, interactions_result):
+        """Fills the list with the interactions returned by load_profile_data."""
         if not interactions_result.get('success'):
+            self.rated_movies_list.clear()
             print(f"DEBUG: ProfileWindow.load_profile_data: Failed to retrieve interactions.")
             return
         
         user_interactions = interactions_result.get('interactions', [])
         print(f"DEBUG: ProfileWindow.load_profile_data: Retrieved {len(user_interactions)} interactions (ratings/reviews) via service.")
+        self.profile_interactions = user_interactions
+        self.render_profile_interactions()
+
+    def render_profile_interactions(self):
+        """Sorts self.profile_interactions and rebuilds the list widget from them (no database access)."""
+        user_interactions = self.profile_interactions
 
         # --- GUI LOGIC: Separate, Sort, and Combine ---
         rated_movies = []
@@ -465,7 +514,7 @@ class ProfileWindow(QWidget):
 
         # Sort lists
         rated_movies.sort(key=lambda x: x['rating'], reverse=True)
-        reviewed_only_movies.sort(key=lambda x: x.get('timeStamp'), reverse=True)
+        reviewed_only_movies.sort(key=lambda x: str(x.get('timeStamp') or ''), reverse=True)
 
         # Combine the two lists
         sorted_interactions = rated_movies + reviewed_only_movies
@@ -603,9 +652,7 @@ class ProfileWindow(QWidget):
             
             if result['success']:
                 QMessageBox.information(self, "Success", "Review deleted successfully.")
-                # Reload the profile data to reflect changes
-                self.load_profile_data()
-                # Emit signal to update other windows if needed
+                # Update other windows; this window's own handler refreshes just this entry
                 global_signals.movie_data_updated.emit(tmdb_id)
             else:
                 QMessageBox.critical(self, "Error", f"Failed to delete review: {result['message']}")
@@ -0,0 +1,97 @@
+# gui/live_search.py
+from collections import OrderedDict
+import logging
+import threading
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+# As-you-type search waits this long after the last keystroke before it runs
+LIVE_SEARCH_DEBOUNCE_MS = 350
+# Shorter titles match too much to be worth a query while typing (an explicit search still runs them)
+LIVE_SEARCH_MIN_CHARS = 2
+MAX_CACHED_SEARCHES = 50
+# Movie rows kept for drawing live results; refinements mostly show rows that are already loaded
+MAX_CACHED_MOVIES = 2000
+
+
+def fold_title(text):
+    """Case- and accent-folds text, approximating MySQL's default collation for local LIKE matching."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def _has_wildcards(term):
+    return "%" in term or "_" in term
+
+
+class SearchResultCache:
+    """Per-session cache for as-you-type search: complete title match sets plus the movie rows shown.
+
+    Live searches match titles with LIKE '%term%'. For a new term MySQL returns the complete,
+    ordered (tmdbID, title) set once (MovieService.search_movie_titles). Every title containing
+    a longer term also contains its prefix, so a term extending a cached one is answered by
+    filtering that set locally. The grid then only loads the rows of the cards it shows, by
+    primary key, and keeps them here so refinements mostly reuse them.
+    Safe to use from the worker threads that load results.
+    """
+
+    def __init__(self, max_entries=MAX_CACHED_SEARCHES, max_movies=MAX_CACHED_MOVIES):
+        self.max_entries = max_entries
+        self.max_movies = max_movies
+        self._entries = OrderedDict()  # (filters_key, folded term) -> [(tmdbID, folded title)] in result order
+        self._movies = OrderedDict()   # tmdbID -> movie dict (with card credits)
+        self._lock = threading.Lock()
+
+    def _store(self, key, titles):
+        self._entries[key] = titles
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def put_titles(self, filters_key, term, titles):
+        """Caches the complete, ordered match set for term: the {'tmdbID', 'title'} rows of every match."""
+        with self._lock:
+            self._store((filters_key, fold_title(term)), [(t['tmdbID'], fold_title(t['title'])) for t in titles])
+
+    def lookup_ids(self, filters_key, term):
+        """Returns the ordered tmdbIDs matching term (refining a cached prefix locally), or None if MySQL must be asked."""
+        folded = fold_title(term)
+        with self._lock:
+            titles = self._entries.get((filters_key, folded))
+            if titles is not None:
+                self._entries.move_to_end((filters_key, folded))
+                return [tmdb_id for tmdb_id, _ in titles]
+            if _has_wildcards(term):
+                return None  # LIKE wildcards in the term; leave the matching to MySQL
+            best_term, best_titles = None, None
+            for (cached_filters, cached_term), cached_titles in self._entries.items():
+                if (cached_filters == filters_key and folded.startswith(cached_term) and not _has_wildcards(cached_term)
+                        and (best_term is None or len(cached_term) > len(best_term))):
+                    best_term, best_titles = cached_term, cached_titles
+            if best_titles is None:
+                return None
+            refined = [(tmdb_id, title) for tmdb_id, title in best_titles if folded in title]
+            self._store((filters_key, folded), refined)
+            logger.debug("Live search refined '%s' -> '%s' locally (%d of %d)", best_term, folded, len(refined), len(best_titles))
+            return [tmdb_id for tmdb_id, _ in refined]
+
+    def put_movies(self, movies):
+        """Keeps loaded movie rows for later live results."""
+        with self._lock:
+            for movie in movies:
+                self._movies[movie['tmdbID']] = movie
+                self._movies.move_to_end(movie['tmdbID'])
+            while len(self._movies) > self.max_movies:
+                self._movies.popitem(last=False)
+
+    def get_movies(self, tmdb_ids):
+        """Returns {tmdbID: movie} for the requested rows that are cached."""
+        with self._lock:
+            return {tmdb_id: self._movies[tmdb_id] for tmdb_id in tmdb_ids if tmdb_id in self._movies}
+
+    def clear(self):
+        """Forgets every cached match set and row (call when movie data changes)."""
+        with self._lock:
+            self._entries.clear()
+            self._movies.clear()
@@ -0,0 +1,275 @@
+# gui/movie_grid.py
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, pyqtSignal
+from PyQt5.QtGui import QColor, QFont
+from gui.poster_cache import PosterCache
+from gui.poster_fetcher import PosterFetcher, PRIORITY_VISIBLE
+from gui.utils import is_placeholder_url, placeholder_pixmap
+from gui.workers import TaskRunner
+
+POSTER_SIZE = (200, 300)
+CARD_SIZE = QSize(250, 480)
+# Queued poster downloads of cards scrolled out of view are released once scrolling pauses this long
+POSTER_RELEASE_DELAY_MS = 150
+
+
+def format_card_info(movie):
+    """Returns the 'Release | Avg' line shown under a card's overview."""
+    release_date = movie.get('releaseDate')
+    # Assuming it comes as 'YYYY-MM-DD' string (or a date) from the DB
+    formatted_date = str(release_date)[:10] if release_date else "Unknown Date"
+    sum_ratings = movie.get('totalRatings', 0) or 0  # SUM of the ratings from the database row
+    num_ratings = movie.get('countRatings', 0) or 0  # COUNT of the ratings from the database row
+    avg_rating = sum_ratings / num_ratings if num_ratings > 0 else 0.0
+    return f"Release: {formatted_date} | Avg: {avg_rating:.1f}/5 ({num_ratings} ratings)"
+
+
+def format_card_credits(movie):
+    """Returns the 'Dir. X | Starring Y' line, or '' if add_card_credits found nothing."""
+    card_credits = movie.get('card_credits') or {}
+    credit_parts = []
+    if card_credits.get('director'):
+        credit_parts.append(f"Dir. {card_credits['director']}")
+    if card_credits.get('leads'):
+        credit_parts.append(f"Starring {', '.join(card_credits['leads'])}")
+    return " | ".join(credit_parts)
+
+
+class MovieListModel(QAbstractListModel):
+    """Movie cards for a QListView, loaded batch by batch as the user scrolls.
+
+    reset(fetch_batch) starts a new result set. fetch_batch(token) runs on a worker thread and
+    returns (movies, next_token); next_token None means there is nothing more to load. The view
+    asks for further batches through canFetchMore/fetchMore when it is scrolled to the end.
+
+    Posters are looked up in the PosterCache when a card is painted; a missing one is loaded
+    in the background (only painted, i.e. visible, cards ask) and its rows repainted when ready.
+    Downloads still queued when the rows are replaced are cancelled, and release_offscreen_posters
+    gives up the queued ones whose cards have scrolled out of view, so visible cards come first.
+    """
+    MovieRole = Qt.UserRole + 1
+
+    loading_changed = pyqtSignal(bool)  # True while a batch is being fetched
+    batch_loaded = pyqtSignal(int, bool)  # total rows, whether more can be fetched
+    load_failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.movies = []
+        self.tasks = TaskRunner()
+        self.poster_cache = PosterCache()
+        self.poster_fetcher = PosterFetcher()
+        self._fetch_batch = None
+        self._next_token = None
+        self._loading = False
+        self._posters_pending = set()
+        self._posters_failed = set()
+        self._poster_fetches = {}      # url -> PosterFetcher token of the download this model waits for
+        self._poster_generation = 0    # bumped when the rows are replaced; older poster callbacks are ignored
+
+    # --- Qt model interface ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.movies)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.movies):
+            return None
+        movie = self.movies[index.row()]
+        if role == Qt.DisplayRole:
+            return movie.get('title', 'Unknown Title')
+        if role == Qt.ToolTipRole:
+            return movie.get('overview')
+        if role == self.MovieRole:
+            return movie
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._loading and self._next_token is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self._load_batch(self._next_token)
+
+    # --- Loading ---
+
+    def reset(self, fetch_batch, first_token=None):
+        """Replaces the rows with the result set produced by fetch_batch, starting at first_token."""
+        self.tasks.cancel()
+        self._reset_posters()
+        self.beginResetModel()
+        self.movies = []
+        self._fetch_batch = fetch_batch
+        self._next_token = None
+        self.endResetModel()
+        self._load_batch(first_token)
+
+    def cancel(self):
+        """Drops the batch being loaded, if any."""
+        self.tasks.cancel()
+        self._set_loading(False)
+
+    def _set_loading(self, loading):
+        if loading != self._loading:
+            self._loading = loading
+            self.loading_changed.emit(loading)
+
+    def _load_batch(self, token):
+        self._set_loading(True)
+        fetch_batch = self._fetch_batch
+        self.tasks.submit("batch", lambda: fetch_batch(token), self._on_batch_loaded, self._on_batch_failed)
+
+    def _on_batch_loaded(self, batch):
+        movies, next_token = batch
+        self._next_token = next_token
+        if movies:
+            self.beginInsertRows(QModelIndex(), len(self.movies), len(self.movies) + len(movies) - 1)
+            self.movies.extend(movies)
+            self.endInsertRows()
+        self._set_loading(False)
+        self.batch_loaded.emit(len(self.movies), self._next_token is not None)
+
+    def _on_batch_failed(self, message):
+        self._set_loading(False)
+        self.load_failed.emit(message)
+
+    def movie_at(self, row):
+        return self.movies[row] if 0 <= row < len(self.movies) else None
+
+    def rows_for_movie(self, tmdb_id):
+        """Returns the rows showing tmdb_id (normally at most one)."""
+        return [row for row, movie in enumerate(self.movies) if movie.get('tmdbID') == tmdb_id]
+
+    def update_movie(self, movie):
+        """Replaces the data of the rows showing movie['tmdbID'] in place and repaints just those cards."""
+        for row in self.rows_for_movie(movie['tmdbID']):
+            self.movies[row] = movie
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    # --- Posters ---
+
+    def _reset_posters(self):
+        """Cancels the downloads for the old rows and forgets their failures (a new result set retries them)."""
+        for url, token in self._poster_fetches.items():
+            self.poster_fetcher.cancel(url, token)
+        self._poster_fetches = {}
+        self._posters_pending = set()
+        self._posters_failed = set()
+        self._poster_generation += 1
+
+    def poster_for(self, row):
+        """Returns the row's poster pixmap if it is ready, else None after making sure it is being loaded."""
+        url = self.movies[row].get('poster')
+        if is_placeholder_url(url) or url in self._posters_failed:
+            return None
+        pixmap = self.poster_cache.cached_pixmap(url, POSTER_SIZE)
+        if pixmap is not None or url in self._posters_pending:
+            return pixmap
+        self._posters_pending.add(url)
+        generation = self._poster_generation
+        on_pixmap = lambda pixmap, u=url: self._on_poster_ready(u, pixmap, generation)
+        if not self.poster_cache.request(url, POSTER_SIZE, on_pixmap):
+            self._poster_fetches[url] = self.poster_fetcher.fetch(
+                url, lambda data, u=url: self._on_poster_downloaded(u, data, on_pixmap, generation),
+                priority=PRIORITY_VISIBLE
+            )
+        return None
+
+    def release_offscreen_posters(self, is_row_visible):
+        """Gives up queued downloads whose cards are all off screen (call once scrolling settles).
+
+        is_row_visible(row) tells whether a row is in the viewport. Downloads already running
+        are kept; a released poster is requested again when its card is painted.
+        """
+        for url, token in list(self._poster_fetches.items()):
+            rows = [row for row, movie in enumerate(self.movies) if movie.get('poster') == url]
+            if any(is_row_visible(row) for row in rows):
+                self.poster_fetcher.prioritize(url, PRIORITY_VISIBLE)
+            elif self.poster_fetcher.cancel(url, token, abort_started=False):
+                del self._poster_fetches[url]
+                self._posters_pending.discard(url)
+
+    def _on_poster_downloaded(self, url, data, on_pixmap, generation):
+        if generation == self._poster_generation:
+            self._poster_fetches.pop(url, None)
+        if data:
+            self.poster_cache.store(url, data, POSTER_SIZE, on_pixmap)
+        else:
+            on_pixmap(None)
+
+    def _on_poster_ready(self, url, pixmap, generation):
+        if generation != self._poster_generation:
+            return  # Requested for rows that have been replaced; a new request covers the current ones
+        self._posters_pending.discard(url)
+        if pixmap is None:
+            self._posters_failed.add(url)  # Paint the placeholder instead of retrying on every repaint
+        # The pixmap is in the memory cache now; repaint every card showing this poster
+        for row, movie in enumerate(self.movies):
+            if movie.get('poster') == url:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+
+class MovieCardDelegate(QStyledItemDelegate):
+    """Paints a movie card (poster, title, credits, overview and rating line) without creating widgets."""
+
+    def sizeHint(self, option, index):
+        return CARD_SIZE
+
+    def paint(self, painter, option, index):
+        movie = index.data(MovieListModel.MovieRole)
+        if movie is None:
+            return
+        painter.save()
+        rect = option.rect.adjusted(5, 5, -5, -5)
+        if option.state & QStyle.State_MouseOver:
+            painter.fillRect(rect, option.palette.alternateBase())
+
+        # Movie Poster (the shared placeholder until the real one is ready)
+        poster_rect = QRect(rect.x() + (rect.width() - POSTER_SIZE[0]) // 2, rect.y(), POSTER_SIZE[0], POSTER_SIZE[1])
+        pixmap = index.model().poster_for(index.row()) or placeholder_pixmap(POSTER_SIZE)
+        if not pixmap.isNull():
+            painter.drawPixmap(poster_rect.x() + (poster_rect.width() - pixmap.width()) // 2,
+                               poster_rect.y() + (poster_rect.height() - pixmap.height()) // 2, pixmap)
+        else:
+            painter.drawText(poster_rect, Qt.AlignCenter, "No Poster")
+        painter.setPen(QColor("gray"))
+        painter.drawRect(poster_rect)
+        y = poster_rect.bottom() + 8
+
+        # Movie Title (bold, up to two lines)
+        font = QFont(option.font)
+        font.setBold(True)
+        font.setPixelSize(14)
+        painter.setFont(font)
+        painter.setPen(option.palette.text().color())
+        y = self._draw_text(painter, QRect(rect.x(), y, rect.width(), 40), movie.get('title', 'Unknown Title'))
+
+        # Director and lead actor, if add_card_credits found any
+        credits_text = format_card_credits(movie)
+        if credits_text:
+            font = QFont(option.font)
+            font.setPixelSize(11)
+            painter.setFont(font)
+            painter.setPen(QColor("gray"))
+            y = self._draw_text(painter, QRect(rect.x(), y, rect.width(), 30), credits_text)
+
+        # Overview (clipped to a few lines) and release/rating info
+        painter.setFont(option.font)
+        painter.setPen(option.palette.text().color())
+        info_height = option.fontMetrics.height() + 4
+        overview_rect = QRect(rect.x(), y, rect.width(), rect.bottom() - info_height - y)
+        self._draw_text(painter, overview_rect, movie.get('overview') or 'No overview available.')
+        painter.drawText(QRect(rect.x(), rect.bottom() - info_height, rect.width(), info_height),
+                         Qt.AlignLeft | Qt.AlignVCenter, format_card_info(movie))
+        painter.restore()
+
+    def _draw_text(self, painter, rect, text):
+        """Draws word-wrapped text clipped to rect and returns the y just below what was drawn."""
+        bounds = painter.boundingRect(rect, Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, text)
+        painter.save()
+        painter.setClipRect(rect)
+        painter.drawText(rect, Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, text)
+        painter.restore()
+        return min(bounds.bottom(), rect.bottom()) + 4
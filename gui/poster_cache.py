@@ -0,0 +1,240 @@
+# gui/poster_cache.py
+from PyQt5.QtGui import QPixmap
+from gui.utils import ImageCache
+from gui.thumbnails import ThumbnailPipeline
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Where downloaded posters are kept between runs
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".moov", "poster_cache")
+INDEX_FILE = "index.json"
+# Minimum seconds between index writes triggered by new downloads (shutdown always writes)
+INDEX_SAVE_INTERVAL = 5
+
+
+class DiskImageCache:
+    """Persistent, byte-budgeted LRU cache of downloaded image bytes.
+
+    Files are content-addressed (named by the SHA-256 of their bytes, so posters shared by several
+    URLs are stored once) and index.json maps each URL to its file, size and last access time.
+    The index is reloaded on startup; when the total size passes max_bytes the least recently
+    used URLs are dropped and files no URL points to any more are deleted.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = {}     # url -> {"hash": str, "size": int, "atime": float}
+        self._refs = {}        # hash -> number of URLs pointing to it
+        self._sizes = {}       # hash -> file size
+        self.total_bytes = 0
+        self._dirty = False
+        self._last_save = 0.0
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._load_index()
+        except OSError as e:
+            print(f"Error opening poster cache at {self.directory}: {e}")
+
+    def _path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def _add_ref(self, url, entry):
+        self._entries[url] = entry
+        self._refs[entry["hash"]] = self._refs.get(entry["hash"], 0) + 1
+        if entry["hash"] not in self._sizes:
+            self._sizes[entry["hash"]] = entry["size"]
+            self.total_bytes += entry["size"]
+
+    def _drop_ref(self, url):
+        """Forgets url and deletes its file if no other URL uses it."""
+        entry = self._entries.pop(url)
+        digest = entry["hash"]
+        self._refs[digest] -= 1
+        if self._refs[digest] == 0:
+            del self._refs[digest]
+            self.total_bytes -= self._sizes.pop(digest)
+            try:
+                os.remove(self._path(digest))
+            except OSError:
+                pass
+
+    def _load_index(self):
+        """Reads index.json, skipping entries whose file is gone and deleting files no entry uses."""
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE), "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+        for url, entry in entries.items():
+            if os.path.isfile(self._path(entry.get("hash", ""))):
+                self._add_ref(url, entry)
+        for sub in os.listdir(self.directory):
+            sub_path = os.path.join(self.directory, sub)
+            if os.path.isdir(sub_path):
+                for name in os.listdir(sub_path):
+                    if name not in self._sizes:
+                        try:
+                            os.remove(os.path.join(sub_path, name))
+                        except OSError:
+                            pass
+        self._evict()
+        print(f"DEBUG: Poster disk cache loaded {len(self._entries)} entries ({self.total_bytes // 1024} KB)")
+
+    def _evict(self):
+        """Drops least recently used URLs until the cache fits in max_bytes."""
+        if self.total_bytes <= self.max_bytes:
+            return
+        for url in sorted(self._entries, key=lambda u: self._entries[u]["atime"]):
+            self._drop_ref(url)
+            self._dirty = True
+            if self.total_bytes <= self.max_bytes:
+                break
+
+    def save(self, force=True):
+        """Writes index.json if anything changed (atomically, so a crash never leaves a torn index).
+
+        With force=False the write is skipped if the index was saved less than INDEX_SAVE_INTERVAL ago.
+        """
+        with self._lock:
+            if not self._dirty or (not force and time.time() - self._last_save < INDEX_SAVE_INTERVAL):
+                return
+            snapshot = {url: dict(entry) for url, entry in self._entries.items()}
+            self._dirty = False
+            self._last_save = time.time()
+        tmp_path = os.path.join(self.directory, INDEX_FILE + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, os.path.join(self.directory, INDEX_FILE))
+        except OSError as e:
+            print(f"Error saving poster cache index: {e}")
+
+    def contains(self, url):
+        """True if url is in the index (a cheap check, safe on the UI thread)."""
+        with self._lock:
+            return url in self._entries
+
+    def get(self, url):
+        """Returns the cached bytes for url, or None."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            entry["atime"] = time.time()
+            self._dirty = True
+            path = self._path(entry["hash"])
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            with self._lock:
+                if url in self._entries:
+                    self._drop_ref(url)
+            return None
+
+    def put(self, url, data):
+        """Stores the bytes downloaded from url."""
+        if not data or len(data) > self.max_bytes:
+            return
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        with self._lock:
+            existing = self._entries.get(url)
+            if existing is not None and existing["hash"] == digest:
+                existing["atime"] = time.time()
+                self._dirty = True
+                return
+            needs_file = digest not in self._sizes
+        if needs_file:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path + ".tmp", "wb") as f:
+                    f.write(data)
+                os.replace(path + ".tmp", path)
+            except OSError as e:
+                print(f"Error writing poster cache file: {e}")
+                return
+        with self._lock:
+            if url in self._entries:
+                self._drop_ref(url)
+            self._add_ref(url, {"hash": digest, "size": len(data), "atime": time.time()})
+            self._dirty = True
+            self._evict()
+        self.save(force=False)
+
+
+class PosterCache:
+    """Two-tier poster cache: decoded, scaled pixmaps in memory in front of the raw bytes on disk.
+
+    Disk reads, decoding and scaling run on the ThumbnailPipeline pool; only the final
+    QImage -> QPixmap conversion happens on the UI thread.
+
+    The memory tier is keyed by (url, size) so the grid thumbnail and the detail-page poster of the
+    same movie are cached separately; both are rebuilt from one disk entry.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(PosterCache, cls).__new__(cls)
+                    cls._instance.memory = ImageCache()
+                    cls._instance.disk = DiskImageCache()
+                    cls._instance.pipeline = ThumbnailPipeline()
+        return cls._instance
+
+    def _deliver(self, key, callback):
+        """Wraps callback so the decoded QImage is cached as a pixmap (on the UI thread) before delivery."""
+        def on_image(image):
+            pixmap = None
+            if image is not None:
+                pixmap = self.memory.get(key)
+                if pixmap is None:
+                    pixmap = QPixmap.fromImage(image)
+                    self.memory.put(key, pixmap)
+            callback(pixmap)
+        return on_image
+
+    def cached_pixmap(self, url, size):
+        """Returns the poster for url at size if it is in the memory tier, else None (never blocks; for paint code)."""
+        return self.memory.get((url, tuple(size)))
+
+    def request(self, url, size, callback):
+        """Serves the poster for url at size from the cache, without blocking the UI thread.
+
+        A memory hit calls callback(pixmap) right away; a disk hit reads, decodes and scales the
+        file on the thumbnail pool and calls callback later (with None if the file was unusable).
+
+        Returns:
+            bool: False if the poster is not cached and has to be downloaded (callback is not called)
+        """
+        key = (url, tuple(size))
+        pixmap = self.memory.get(key)
+        if pixmap is not None:
+            callback(pixmap)
+            return True
+        if not self.disk.contains(url):
+            return False
+        self.pipeline.submit(key, size, self._deliver(key, callback), loader=lambda: self.disk.get(url))
+        return True
+
+    def store(self, url, data, size, callback):
+        """Caches freshly downloaded poster bytes; callback gets them decoded and scaled to size (None if not an image).
+
+        Decoding and (once the bytes proved to be an image) writing the file happen on the thumbnail pool.
+        """
+        key = (url, tuple(size))
+        self.pipeline.submit(key, size, self._deliver(key, callback), data=bytes(data),
+                             on_decoded=lambda image_bytes: self.disk.put(url, image_bytes))
+
+    def save(self):
+        """Persists the disk index (call on app shutdown)."""
+        self.disk.save()
+
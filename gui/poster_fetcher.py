@@ -0,0 +1,143 @@
+# gui/poster_fetcher.py
+from PyQt5.QtCore import QUrl
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkDiskCache, QNetworkReply, QNetworkRequest
+import heapq
+import itertools
+import os
+import threading
+
+# HTTP-level cache for poster responses (the decoded posters live in gui/poster_cache.py)
+HTTP_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".moov", "http_cache")
+HTTP_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Downloads in flight at once; the rest wait in priority order
+MAX_CONCURRENT_DOWNLOADS = 6
+REQUEST_TIMEOUT_MS = 5000
+
+# Suggested priorities: higher is fetched first
+PRIORITY_DETAIL = 100     # the poster of an open detail window
+PRIORITY_VISIBLE = 50     # cards currently on screen
+PRIORITY_DEFAULT = 0
+
+
+class PosterFetcher:
+    """Application-wide poster downloader shared by every window (UI thread only).
+
+    - Requests for a URL that is already queued or downloading join that request instead of
+      starting another one, and every callback gets the same bytes.
+    - At most MAX_CONCURRENT_DOWNLOADS run at once; waiting requests start highest priority first.
+    - A request can be tied to an owner QObject (e.g. the poster label); when the owner is
+      destroyed its callback is dropped, and a download nobody is waiting for any more is
+      dequeued or aborted. cancel() does the same explicitly with the token fetch() returned.
+    - Responses go through a QNetworkDiskCache, so HTTP caching headers are honoured across runs.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(PosterFetcher, cls).__new__(cls)
+                    cls._instance._init_network()
+        return cls._instance
+
+    def _init_network(self):
+        self.network_manager = QNetworkAccessManager()
+        disk_cache = QNetworkDiskCache(self.network_manager)
+        disk_cache.setCacheDirectory(HTTP_CACHE_DIR)
+        disk_cache.setMaximumCacheSize(HTTP_CACHE_MAX_BYTES)
+        self.network_manager.setCache(disk_cache)
+        self.max_concurrent = MAX_CONCURRENT_DOWNLOADS
+        self._requests = {}            # url -> {"waiters": {token: callback}, "priority": int, "reply": QNetworkReply or None}
+        self._queue = []               # heap of (-priority, seq, url); stale entries are skipped
+        self._seq = itertools.count()
+        self._tokens = itertools.count()
+        self._active = 0
+
+    def fetch(self, url, callback, owner=None, priority=PRIORITY_DEFAULT):
+        """Downloads url and calls callback(bytes or None) on the UI thread.
+
+        Args:
+            url (str): Poster URL
+            callback (callable): Receives the downloaded bytes, or None if the download failed
+            owner (QObject): If given, the callback is dropped when owner is destroyed
+            priority (int): Higher priorities start first (see PRIORITY_*)
+
+        Returns:
+            int: A token for cancel()
+        """
+        token = next(self._tokens)
+        request = self._requests.get(url)
+        if request is None:
+            request = {"waiters": {}, "priority": priority, "reply": None}
+            self._requests[url] = request
+            heapq.heappush(self._queue, (-priority, next(self._seq), url))
+        else:
+            self.prioritize(url, priority)
+        request["waiters"][token] = callback
+        if owner is not None:
+            owner.destroyed.connect(lambda _=None, u=url, t=token: self.cancel(u, t))
+        self._start_next()
+        return token
+
+    def prioritize(self, url, priority):
+        """Raises the priority of a queued request (e.g. when its card scrolls into view)."""
+        request = self._requests.get(url)
+        if request is None or request["reply"] is not None or priority <= request["priority"]:
+            return
+        request["priority"] = priority
+        heapq.heappush(self._queue, (-priority, next(self._seq), url))
+
+    def cancel(self, url, token, abort_started=True):
+        """Drops one waiter; the request itself is dropped or aborted when nobody waits for it.
+
+        With abort_started=False a download that has already started is left alone (the waiter
+        keeps its callback), so only queued requests are given up.
+
+        Returns:
+            bool: True if the waiter was dropped
+        """
+        request = self._requests.get(url)
+        if request is None or token not in request["waiters"]:
+            return False
+        if request["reply"] is not None and not abort_started:
+            return False
+        del request["waiters"][token]
+        if request["waiters"]:
+            return True
+        if request["reply"] is None:
+            del self._requests[url]  # Its heap entries are skipped when popped
+        else:
+            request["reply"].abort()  # finished() fires and _on_finished cleans up
+        return True
+
+    def _start_next(self):
+        while self._active < self.max_concurrent and self._queue:
+            neg_priority, _, url = heapq.heappop(self._queue)
+            request = self._requests.get(url)
+            if request is None or request["reply"] is not None or -neg_priority != request["priority"]:
+                continue  # Cancelled, already started, or superseded by a higher-priority entry
+            http_request = QNetworkRequest(QUrl(url))
+            http_request.setTransferTimeout(REQUEST_TIMEOUT_MS)
+            http_request.setAttribute(QNetworkRequest.CacheLoadControlAttribute, QNetworkRequest.PreferCache)
+            reply = self.network_manager.get(http_request)
+            request["reply"] = reply
+            self._active += 1
+            reply.finished.connect(lambda r=reply, u=url: self._on_finished(u, r))
+
+    def _on_finished(self, url, reply):
+        self._active -= 1
+        request = self._requests.pop(url, None)
+        data = None
+        if reply.error() == QNetworkReply.NoError:
+            data = bytes(reply.readAll())
+        elif reply.error() != QNetworkReply.OperationCanceledError:
+            print(f"DEBUG: Poster download failed for {url}: {reply.errorString()}")
+        reply.deleteLater()
+        for callback in (request or {}).get("waiters", {}).values():
+            try:
+                callback(data)
+            except Exception as e:
+                print(f"Error delivering poster for {url}: {e}")
+        self._start_next()
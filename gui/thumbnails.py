@@ -0,0 +1,118 @@
+# gui/thumbnails.py
+from PyQt5.QtGui import QImage
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+import io
+import threading
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is in requirements.txt; fall back to Qt's decoder if it is missing
+    Image = None
+
+
+def decode_thumbnail(data, size):
+    """Decodes image bytes and scales them to fit size, returning a QImage (safe off the UI thread) or None.
+
+    Pillow's draft mode lets the JPEG decoder skip most of the full-size image, which is the
+    bulk of the work for a grid thumbnail.
+    """
+    if not data:
+        return None
+    if Image is not None:
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                img.draft("RGB", size)
+                img = img.convert("RGBA")
+                img.thumbnail(size, Image.LANCZOS)
+                raw = img.tobytes("raw", "RGBA")
+                # copy() detaches the QImage from the Python buffer before it is freed
+                return QImage(raw, img.width, img.height, img.width * 4, QImage.Format_RGBA8888).copy()
+        except Exception as e:
+            print(f"DEBUG: Pillow could not decode poster ({e}), trying Qt")
+    image = QImage.fromData(data)
+    if image.isNull():
+        return None
+    return image.scaled(size[0], size[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+class _ThumbnailTask(QRunnable):
+    """Fetches bytes (from memory or via a loader such as a disk read) and decodes them on a pool thread.
+
+    With notify=False the result is not reported (the task only runs on_decoded for its bytes).
+    """
+
+    def __init__(self, pipeline, key, size, data=None, loader=None, on_decoded=None, notify=True):
+        super().__init__()
+        self.pipeline = pipeline
+        self.key = key
+        self.size = size
+        self.data = data
+        self.loader = loader
+        self.on_decoded = on_decoded
+        self.notify = notify
+
+    def run(self):
+        image = None
+        try:
+            data = self.data if self.data is not None else (self.loader() if self.loader else None)
+            image = decode_thumbnail(data, self.size)
+            if image is not None and self.on_decoded is not None:
+                self.on_decoded(data)
+        except Exception as e:
+            print(f"Error building thumbnail for {self.key}: {e}")
+        # Queued to the UI thread, where the signals object lives
+        if self.notify:
+            self.pipeline.signals.finished.emit(self.key, image)
+
+
+class _ThumbnailSignals(QObject):
+    """QRunnable cannot emit signals itself; this object lives on the UI thread and relays results there."""
+    finished = pyqtSignal(object, object)  # key, QImage or None
+
+
+class ThumbnailPipeline:
+    """Decodes and scales posters on a small thread pool and hands back QImages on the UI thread.
+
+    Requests for the same key while one is in flight share the one decode; every callback
+    is called on the UI thread with the QImage (or None if the bytes were not an image).
+    Create it (first use) from the UI thread.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(ThumbnailPipeline, cls).__new__(cls)
+                    cls._instance._pending = {}
+                    cls._instance.signals = _ThumbnailSignals()
+                    cls._instance.signals.finished.connect(cls._instance._on_finished)
+                    cls._instance.pool = QThreadPool()
+                    # Leave cores for the UI and the database threads
+                    cls._instance.pool.setMaxThreadCount(max(2, QThreadPool.globalInstance().maxThreadCount() // 2))
+        return cls._instance
+
+    def submit(self, key, size, callback, data=None, loader=None, on_decoded=None):
+        """Queues a decode of data (or of loader()'s result) scaled to size; callback(QImage or None) runs on the UI thread.
+
+        on_decoded(data), if given, runs on the pool thread once the bytes proved to be an image.
+        """
+        callbacks = self._pending.get(key)
+        if callbacks is not None:
+            callbacks.append(callback)
+            if on_decoded is not None:
+                # The decode in flight is of other bytes (e.g. a disk read), so check and hand
+                # over these bytes separately; the callback still shares the pending result
+                self.pool.start(_ThumbnailTask(self, key, tuple(size), data=data, loader=loader,
+                                               on_decoded=on_decoded, notify=False))
+            return
+        self._pending[key] = [callback]
+        self.pool.start(_ThumbnailTask(self, key, tuple(size), data=data, loader=loader, on_decoded=on_decoded))
+
+    def _on_finished(self, key, image):
+        for callback in self._pending.pop(key, []):
+            try:
+                callback(image)
+            except Exception as e:
+                print(f"Error delivering thumbnail for {key}: {e}")
@@ -1,42 +1,65 @@
 # gui/utils.py
-from PyQt5.QtGui import QPixmap, QMovie
+from PyQt5.QtGui import QPixmap, QImage, QMovie
 from PyQt5.QtCore import Qt
 from collections import OrderedDict
 import time
 
 class ImageCache:
-    """Caches downloaded images with LRU eviction and expiration."""
-    def __init__(self, max_size=100, expiry_minutes=60):
+    """Caches decoded images in memory with LRU eviction and expiration.
+
+    The budget is in bytes of decoded pixels (width x height x depth), not entries, so a few
+    full-size posters cannot push out a whole page of thumbnails.
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024, expiry_minutes=60):
         self.cache = OrderedDict()
-        self.max_size = max_size
+        self.max_bytes = max_bytes
         self.expiry_seconds = expiry_minutes * 60
         self.timestamps = {}  # Track when each image was cached
+        self.costs = {}       # Decoded size of each entry in bytes
+        self.total_bytes = 0
+
+    @staticmethod
+    def decoded_size(image_data):
+        """Returns the in-memory size of a QPixmap/QImage (pixels x depth) or the length of raw bytes."""
+        if isinstance(image_data, (QPixmap, QImage)):
+            return image_data.width() * image_data.height() * max(image_data.depth(), 8) // 8
+        try:
+            return len(image_data)
+        except TypeError:
+            return 0
 
-    def get(self, url):
+    def _remove(self, key):
+        self.cache.pop(key)
+        self.timestamps.pop(key)
+        self.total_bytes -= self.costs.pop(key)
+
+    def get(self, key):
         """Get image data from cache if present and not expired."""
-        if url in self.cache:
+        if key in self.cache:
             # Check expiration
-            if time.time() - self.timestamps[url] <= self.expiry_seconds:
+            if time.time() - self.timestamps[key] <= self.expiry_seconds:
                 # Move to end (most recently used)
-                self.cache.move_to_end(url)
-                return self.cache[url]
+                self.cache.move_to_end(key)
+                return self.cache[key]
             else:
                 # Expired, remove it
-                self.cache.pop(url)
-                self.timestamps.pop(url)
+                self._remove(key)
         return None
 
-    def put(self, url, image_data):
-        """Store image data in cache with LRU eviction."""
-        # Remove oldest if at capacity
-        if len(self.cache) >= self.max_size:
-            oldest = next(iter(self.cache))
-            self.cache.pop(oldest)
-            self.timestamps.pop(oldest)
-        
-        self.cache[url] = image_data
-        self.timestamps[url] = time.time()
-        self.cache.move_to_end(url)  # Move to end (most recently used)
+    def put(self, key, image_data, cost=None):
+        """Store image data in cache, evicting least recently used entries to stay within max_bytes."""
+        cost = self.decoded_size(image_data) if cost is None else cost
+        if cost > self.max_bytes:
+            return  # Would evict everything else
+        if key in self.cache:
+            self._remove(key)
+        while self.cache and self.total_bytes + cost > self.max_bytes:
+            self._remove(next(iter(self.cache)))
+
+        self.cache[key] = image_data
+        self.timestamps[key] = time.time()
+        self.costs[key] = cost
+        self.total_bytes += cost
 
 # Global image cache instance
 image_cache = ImageCache()
@@ -56,11 +79,26 @@ def is_placeholder_url(url):
         return True # Consider None or empty string as placeholder/default
     return any(pattern in url for pattern in PLACEHOLDER_PATTERNS)
 
+# Default poster scaled once per size and shared by every widget showing it
+_placeholder_pixmaps = {}
+
+
+def placeholder_pixmap(size=(200, 300)):
+    """Returns the default poster scaled to size, loading and scaling it only the first time (UI thread only)."""
+    size = tuple(size)
+    pixmap = _placeholder_pixmaps.get(size)
+    if pixmap is None:
+        pixmap = QPixmap(DEFAULT_POSTER_PATH)
+        if not pixmap.isNull():
+            pixmap = pixmap.scaled(size[0], size[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        _placeholder_pixmaps[size] = pixmap
+    return pixmap
+
+
 def load_default_poster(pixmap_label, size=(200, 300)):
     """Helper function to load the default poster into a given label."""
-    pixmap = QPixmap(DEFAULT_POSTER_PATH)
+    pixmap = placeholder_pixmap(size)
     if not pixmap.isNull():
-        scaled_pixmap = pixmap.scaled(size[0], size[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        pixmap_label.setPixmap(scaled_pixmap)
+        pixmap_label.setPixmap(pixmap)
     else:
         pixmap_label.setText("No Poster")
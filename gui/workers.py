@@ -0,0 +1,128 @@
+# gui/workers.py
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+import threading
+import traceback
+
+# Threads for service calls. Each can hold a MySQL connection, and a task may fan out further
+# (MovieDetailService.load uses its own DETAIL_LOAD_THREADS), so this is one share of the
+# connection budget in database/db_connection.py (MYSQL_POOL_SIZE); change them together.
+MAX_SERVICE_THREADS = 4
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def service_thread_pool():
+    """Returns the thread pool shared by every window for database/service calls."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = QThreadPool()
+            _pool.setMaxThreadCount(MAX_SERVICE_THREADS)
+        return _pool
+
+
+class _TaskSignals(QObject):
+    """Relays task results from pool threads to the UI thread, where this object lives."""
+    result = pyqtSignal(str, int, object)  # channel, generation, return value
+    error = pyqtSignal(str, int, str)      # channel, generation, error message
+
+
+class ServiceTask(QRunnable):
+    """Runs one service call on a pool thread and reports back through the runner's signals."""
+
+    def __init__(self, signals, channel, generation, fn, is_current):
+        super().__init__()
+        self.signals = signals
+        self.channel = channel
+        self.generation = generation
+        self.fn = fn
+        self.is_current = is_current
+
+    def run(self):
+        # Tasks superseded or cancelled while still queued never touch the database
+        if not self.is_current(self.channel, self.generation):
+            return
+        try:
+            result = self.fn()
+        except Exception as e:
+            print(f"Error in background task '{self.channel}': {e}")
+            traceback.print_exc()
+            self._emit(self.signals.error, str(e))
+            return
+        self._emit(self.signals.result, result)
+
+    def _emit(self, signal, value):
+        try:
+            signal.emit(self.channel, self.generation, value)
+        except RuntimeError:
+            pass  # The window (and its runner) was destroyed while the call was running
+
+
+class TaskRunner:
+    """Runs a window's service calls off the UI thread and delivers only the results still wanted.
+
+    Each call goes on a named channel (e.g. "page", "details"). Submitting on a channel supersedes
+    the previous call on it: a superseded call that has not started yet is skipped, and the result
+    of one that already ran is dropped, so a slow old query can never overwrite a newer one.
+    cancel() does the same for one or every channel; call it when the window closes.
+    Callbacks run on the UI thread. Create the runner on the UI thread.
+    """
+
+    def __init__(self):
+        self._generations = {}  # channel -> generation of the call whose result is wanted
+        self._callbacks = {}    # channel -> (generation, on_result, on_error)
+        self._lock = threading.Lock()
+        self.signals = _TaskSignals()
+        self.signals.result.connect(self._on_result)
+        self.signals.error.connect(self._on_error)
+
+    def submit(self, channel, fn, on_result, on_error=None):
+        """Runs fn() on the service pool and calls on_result(return value) on the UI thread.
+
+        on_error(message), if given, is called instead when fn raises.
+
+        Returns:
+            int: The generation token of this call
+        """
+        with self._lock:
+            generation = self._generations.get(channel, 0) + 1
+            self._generations[channel] = generation
+        self._callbacks[channel] = (generation, on_result, on_error)
+        service_thread_pool().start(ServiceTask(self.signals, channel, generation, fn, self.is_current))
+        return generation
+
+    def is_current(self, channel, generation):
+        """True if generation is still the wanted call on channel (safe from any thread)."""
+        with self._lock:
+            return self._generations.get(channel) == generation
+
+    def is_busy(self, channel):
+        """True if a call on channel has been submitted and its result not delivered yet."""
+        return channel in self._callbacks
+
+    def cancel(self, channel=None):
+        """Drops the pending call on channel, or on every channel if channel is None."""
+        with self._lock:
+            channels = list(self._generations) if channel is None else [channel]
+            for name in channels:
+                self._generations[name] = self._generations.get(name, 0) + 1
+        for name in channels:
+            self._callbacks.pop(name, None)
+
+    def _take_callbacks(self, channel, generation):
+        entry = self._callbacks.get(channel)
+        if entry is None or entry[0] != generation or not self.is_current(channel, generation):
+            return None
+        del self._callbacks[channel]
+        return entry
+
+    def _on_result(self, channel, generation, result):
+        entry = self._take_callbacks(channel, generation)
+        if entry is not None:
+            entry[1](result)
+
+    def _on_error(self, channel, generation, message):
+        entry = self._take_callbacks(channel, generation)
+        if entry is not None and entry[2] is not None:
+            entry[2](message)
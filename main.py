@@ -1,10 +1,14 @@
 # main.py
 
+import os
 import sys
+import threading
 from PyQt5.QtWidgets import QApplication
 from gui.gui_home import HomeWindow
-from database.db_connection import MySQLConnectionManager
+from database.db_connection import MySQLConnectionManager, MYSQL_POOL_SIZE
 from database.db_mongo_connection import MongoConnectionManager
+from database.repositories.cast_crew_repository import CastCrewRepository
+from gui.poster_cache import PosterCache
 
 def main():
     # Initialize singleton connection managers
@@ -14,8 +18,12 @@ def main():
     mysql_manager = MySQLConnectionManager()
     mongo_manager = MongoConnectionManager()
     
-    mysql_manager.initialize_pool(pool_size=10)
+    mysql_manager.initialize_pool(pool_size=MYSQL_POOL_SIZE)
     mongo_manager.initialize_connection()
+    # Optional in-memory cast/crew name index (MOOV_NAME_INDEX=1). Loading it streams every credit
+    # from MongoDB, so it is off by default; searches use MongoDB until it has loaded
+    if os.environ.get("MOOV_NAME_INDEX") == "1":
+        threading.Thread(target=CastCrewRepository().enable_name_index, name="name-index-loader", daemon=True).start()
     
     app = QApplication(sys.argv)
     
@@ -25,6 +33,9 @@ def main():
     # Cleanup on exit
     exit_code = app.exec_()
     
+    # Persist last-access times so the poster cache's LRU order survives the restart
+    PosterCache().save()
+
     print("Shutting down database connections...")
     mysql_manager.shutdown_pool()
     mongo_manager.close_connection()
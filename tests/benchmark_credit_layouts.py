@@ -0,0 +1,93 @@
+"""
+Cast/Crew Storage Layout Benchmark - linked (MovieCastLink/MovieCrewLink) vs embedded (MovieCredits)
+Run with: python benchmark_credit_layouts.py
+Requires the embedded collection: python -m database.migrations.005_embedded_movie_credits
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.db_mongo_connection import MongoConnectionManager
+from database.repositories.cast_crew_repository import (
+    CastCrewRepository, CREDITS_LAYOUT_LINKED, CREDITS_LAYOUT_EMBEDDED
+)
+import random
+import statistics
+import time
+
+
+class CreditLayoutBenchmark:
+    def __init__(self, sample_size=200, rounds=3):
+        self.sample_size = sample_size
+        self.rounds = rounds
+        self.mongo_manager = MongoConnectionManager()
+        self.mongo_manager.initialize_connection()
+        self.repo = CastCrewRepository()
+
+    def pick_samples(self):
+        """Random movies that have credits, and name fragments to search for."""
+        db = self.mongo_manager.get_database()
+        tmdb_ids = [doc["_id"] for doc in db["MovieCredits"].aggregate([{"$sample": {"size": self.sample_size}}])]
+        names = [doc.get("name", "") for doc in db["MovieCastLink"].aggregate([{"$sample": {"size": 50}}])]
+        queries = []
+        for name in names:
+            words = name.split()
+            if words:
+                # First word plus the start of the last word, e.g. "tom han"
+                queries.append(f"{words[0]} {words[-1][:3]}" if len(words) > 1 else words[0][:4])
+        return tmdb_ids, queries
+
+    def time_operation(self, operation, inputs):
+        """Runs operation over all inputs for each round; returns per-call times in ms."""
+        times = []
+        for _ in range(self.rounds):
+            for value in inputs:
+                start = time.perf_counter()
+                operation(value)
+                times.append((time.perf_counter() - start) * 1000)
+        return times
+
+    def run_layout(self, layout, tmdb_ids, queries):
+        self.repo.set_layout(layout)
+        return {
+            "detail read (cast+crew+director)": self.time_operation(
+                lambda t: (self.repo.get_cast_for_movie(t), self.repo.get_crew_for_movie(t),
+                           self.repo.get_director_for_movie(t)),
+                tmdb_ids
+            ),
+            "cast name search": self.time_operation(self.repo.find_tmdbids_by_cast, queries),
+            "crew name search": self.time_operation(self.repo.find_tmdbids_by_crew, queries),
+        }
+
+    def run(self):
+        tmdb_ids, queries = self.pick_samples()
+        if not tmdb_ids:
+            print("✗ MovieCredits is empty - run the 005_embedded_movie_credits migration first")
+            return
+        random.shuffle(tmdb_ids)
+        print(f"Benchmarking {len(tmdb_ids)} movies and {len(queries)} name queries, {self.rounds} rounds each\n")
+
+        results = {}
+        for layout in (CREDITS_LAYOUT_LINKED, CREDITS_LAYOUT_EMBEDDED):
+            results[layout] = self.run_layout(layout, tmdb_ids, queries)
+        self.repo.set_layout(CREDITS_LAYOUT_LINKED)
+
+        print(f"{'Operation':<36}{'Layout':<10}{'Mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        print("-" * 76)
+        for operation in results[CREDITS_LAYOUT_LINKED]:
+            for layout in (CREDITS_LAYOUT_LINKED, CREDITS_LAYOUT_EMBEDDED):
+                times = results[layout][operation]
+                p95 = statistics.quantiles(times, n=20)[18] if len(times) >= 20 else max(times)
+                print(f"{operation:<36}{layout:<10}{statistics.mean(times):>10.2f}"
+                      f"{statistics.median(times):>10.2f}{p95:>10.2f}")
+            linked = statistics.mean(results[CREDITS_LAYOUT_LINKED][operation])
+            embedded = statistics.mean(results[CREDITS_LAYOUT_EMBEDDED][operation])
+            print(f"{'':<36}{'speedup':<10}{linked / embedded if embedded else 0:>10.2f}x\n")
+
+        self.mongo_manager.close_connection()
+
+
+if __name__ == "__main__":
+    benchmark = CreditLayoutBenchmark(sample_size=200, rounds=3)
+    benchmark.run()
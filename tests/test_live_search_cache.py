@@ -0,0 +1,87 @@
+# test_live_search_cache.py
+from gui.live_search import SearchResultCache, fold_title
+
+NO_FILTERS = ("", (), None)
+DRAMA = ("", ("Drama",), None)
+
+TITLES = [
+    {"tmdbID": 1, "title": "The Matrix"},
+    {"tmdbID": 2, "title": "The Matrix Reloaded"},
+    {"tmdbID": 3, "title": "Matrimony"},
+    {"tmdbID": 4, "title": "Amélie"},
+]
+
+
+def test_fold_title_ignores_case_and_accents():
+    assert fold_title("AMÉLIE") == "amelie"
+    assert fold_title(None) == ""
+
+
+def test_exact_term_is_answered_from_the_cache():
+    cache = SearchResultCache()
+    cache.put_titles(NO_FILTERS, "Mat", TITLES[:3])
+    assert cache.lookup_ids(NO_FILTERS, "mat") == [1, 2, 3]
+    assert cache.lookup_ids(NO_FILTERS, "MAT") == [1, 2, 3]
+
+
+def test_longer_term_is_refined_locally_from_the_longest_cached_prefix():
+    cache = SearchResultCache()
+    cache.put_titles(NO_FILTERS, "a", TITLES)
+    cache.put_titles(NO_FILTERS, "matr", TITLES[:3])
+    assert cache.lookup_ids(NO_FILTERS, "matrix") == [1, 2]
+    assert cache.lookup_ids(NO_FILTERS, "matrix re") == [2]
+    assert cache.lookup_ids(NO_FILTERS, "ame") == [4]      # Accent-folded match, refined from "a"
+
+
+def test_refined_result_keeps_the_cached_order():
+    cache = SearchResultCache()
+    cache.put_titles(NO_FILTERS, "ma", list(reversed(TITLES[:3])))
+    assert cache.lookup_ids(NO_FILTERS, "matrix") == [2, 1]
+
+
+def test_unknown_term_needs_the_database():
+    cache = SearchResultCache()
+    cache.put_titles(NO_FILTERS, "matrix", TITLES[:2])
+    assert cache.lookup_ids(NO_FILTERS, "mat") is None       # Shorter than anything cached
+    assert cache.lookup_ids(NO_FILTERS, "amelie") is None
+
+
+def test_wildcard_terms_bypass_local_refinement():
+    cache = SearchResultCache()
+    cache.put_titles(NO_FILTERS, "mat", TITLES[:3])
+    assert cache.lookup_ids(NO_FILTERS, "mat%x") is None
+    assert cache.lookup_ids(NO_FILTERS, "mat_r") is None
+    # A wildcard term cached from MySQL is only reused for that exact term, never as a prefix
+    cache.put_titles(NO_FILTERS, "m_t", TITLES[:3])
+    assert cache.lookup_ids(NO_FILTERS, "m_t") == [1, 2, 3]
+    assert cache.lookup_ids(NO_FILTERS, "m_tr") is None
+
+
+def test_filter_keys_are_isolated():
+    cache = SearchResultCache()
+    cache.put_titles(NO_FILTERS, "mat", TITLES[:3])
+    assert cache.lookup_ids(DRAMA, "mat") is None
+    assert cache.lookup_ids(DRAMA, "matrix") is None
+    cache.put_titles(DRAMA, "mat", TITLES[2:3])
+    assert cache.lookup_ids(DRAMA, "matr") == [3]
+    assert cache.lookup_ids(NO_FILTERS, "matr") == [1, 2, 3]
+
+
+def test_least_recently_used_term_is_evicted():
+    cache = SearchResultCache(max_entries=2)
+    cache.put_titles(NO_FILTERS, "a", TITLES)
+    cache.put_titles(NO_FILTERS, "b", [])
+    cache.lookup_ids(NO_FILTERS, "a")
+    cache.put_titles(NO_FILTERS, "c", [])
+    assert cache.lookup_ids(NO_FILTERS, "b") is None
+    assert cache.lookup_ids(NO_FILTERS, "a") == [1, 2, 3, 4]
+
+
+def test_movie_rows_are_cached_bounded_and_cleared():
+    cache = SearchResultCache(max_movies=2)
+    cache.put_movies([{"tmdbID": 1}, {"tmdbID": 2}, {"tmdbID": 3}])
+    assert cache.get_movies([1, 2, 3]) == {2: {"tmdbID": 2}, 3: {"tmdbID": 3}}
+    cache.put_titles(NO_FILTERS, "mat", TITLES[:3])
+    cache.clear()
+    assert cache.get_movies([2, 3]) == {}
+    assert cache.lookup_ids(NO_FILTERS, "mat") is None
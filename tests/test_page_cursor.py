@@ -0,0 +1,55 @@
+# test_page_cursor.py
+import base64
+import datetime
+import json
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+from database.services.movie_service import _encode_page_cursor, _decode_page_cursor, SORT_BY_RATING
+
+
+def _token(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def test_round_trip_by_release_date():
+    movie = {"tmdbID": 603, "releaseDate": datetime.date(1999, 3, 31)}
+    token = _encode_page_cursor(movie, 4)
+    assert _decode_page_cursor(token) == (("1999-03-31", 603), 4, None)
+
+
+def test_round_trip_by_rating():
+    movie = {"tmdbID": 278, "avgRating": 4.5, "releaseDate": datetime.date(1994, 9, 23)}
+    token = _encode_page_cursor(movie, 2, SORT_BY_RATING)
+    assert _decode_page_cursor(token) == ((4.5, 278), 2, SORT_BY_RATING)
+
+
+def test_unrated_movie_encodes_a_zero_rating():
+    token = _encode_page_cursor({"tmdbID": 7, "avgRating": None}, 1, SORT_BY_RATING)
+    assert _decode_page_cursor(token) == ((0.0, 7), 1, SORT_BY_RATING)
+
+
+def test_null_release_date_round_trips_as_none():
+    token = _encode_page_cursor({"tmdbID": 11, "releaseDate": None}, 3)
+    assert _decode_page_cursor(token) == ((None, 11), 3, None)
+
+
+def test_page_number_is_clamped_to_one():
+    assert _decode_page_cursor(_token({"d": "2000-01-01", "id": 1, "p": -5, "s": None}))[1] == 1
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not base64!",
+    "bm90IGpzb24=",                                     # base64 of "not json"
+    "Zm9v" + "é",                                       # non-ASCII
+    _token([1, 2, 3]),                                  # not an object
+    _token({"d": "2000-01-01", "p": 1}),                # no tmdbID
+    _token({"d": "2000-01-01", "id": "abc", "p": 1}),   # tampered tmdbID
+    _token({"d": "2000-01-01", "id": 1, "p": "x"}),     # tampered page
+    None,
+])
+def test_invalid_or_tampered_cursor_decodes_to_none(cursor):
+    assert _decode_page_cursor(cursor) is None
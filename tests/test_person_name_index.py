@@ -0,0 +1,147 @@
+# test_person_name_index.py
+import threading
+
+import pytest
+
+from database.repositories.person_name_index import PersonNameIndex
+from database.repositories.person_names import (
+    NAME_SEARCH_TOKEN, NAME_SEARCH_PREFIX, normalize_person_name, person_name_fields
+)
+
+
+def test_normalize_person_name_folds_case_accents_and_punctuation():
+    assert normalize_person_name("Penélope Cruz") == "penelope cruz"
+    assert normalize_person_name("Jean-Luc  GODARD") == "jean luc godard"
+    assert normalize_person_name("  Zoë   Saldaña ") == "zoe saldana"
+    assert normalize_person_name(None) == ""
+    assert normalize_person_name("") == ""
+
+
+def test_person_name_fields():
+    assert person_name_fields("Jean-Luc Godard") == {
+        "name_norm": "jean luc godard", "name_tokens": ["jean", "luc", "godard"]
+    }
+
+
+def _cast_index():
+    index = PersonNameIndex()
+    index.load([
+        {"tmdbID": 13, "name": "Tom Hanks"},
+        {"tmdbID": 862, "name": "Tom Hanks"},
+        {"tmdbID": 862, "name": "Tim Allen"},
+        {"tmdbID": 1422, "name": "Tom Holland"},
+        {"tmdbID": 2, "name": "Penélope Cruz"},
+        {"tmdbID": 5, "name": ""},       # Skipped: no name
+        {"tmdbID": None, "name": "X"},   # Skipped: no movie
+    ])
+    return index
+
+
+def test_load_counts_distinct_credit_keys():
+    assert len(_cast_index()) == 4
+
+
+def test_token_mode_requires_every_word_to_prefix_a_name_word():
+    index = _cast_index()
+    assert index.find_tmdbids("tom han", NAME_SEARCH_TOKEN) == [13, 862]
+    assert index.find_tmdbids("han tom", NAME_SEARCH_TOKEN) == [13, 862]
+    assert index.find_tmdbids("tom", NAME_SEARCH_TOKEN) == [13, 862, 1422]
+    assert index.find_tmdbids("tom allen", NAME_SEARCH_TOKEN) == []
+    assert index.find_tmdbids("penelope", NAME_SEARCH_TOKEN) == [2]
+    assert index.find_tmdbids("PENÉLOPE", NAME_SEARCH_TOKEN) == [2]
+    assert index.find_tmdbids("  ", NAME_SEARCH_TOKEN) == []
+
+
+def test_prefix_mode_matches_the_start_of_the_full_name():
+    index = _cast_index()
+    assert index.find_tmdbids("tom h", NAME_SEARCH_PREFIX) == [13, 862, 1422]
+    assert index.find_tmdbids("tom hol", NAME_SEARCH_PREFIX) == [1422]
+    assert index.find_tmdbids("hanks", NAME_SEARCH_PREFIX) == []
+
+
+def test_add_and_remove_keep_postings_sorted_and_unique():
+    index = _cast_index()
+    index.add(500, "Tom Hanks")
+    index.add(500, "Tom Hanks")
+    index.add(7, "Tom Hanks")
+    assert index.find_tmdbids("hanks", NAME_SEARCH_TOKEN) == [7, 13, 500, 862]
+    index.remove(13, "Tom Hanks")
+    index.remove(999, "Tom Hanks")      # Not credited: no-op
+    index.remove(1, "Nobody")           # Unknown name: no-op
+    assert index.find_tmdbids("hanks", NAME_SEARCH_TOKEN) == [7, 500, 862]
+
+
+def test_add_new_name_is_searchable_by_token_and_prefix():
+    index = _cast_index()
+    index.add(99, "Zendaya")
+    assert index.find_tmdbids("zen", NAME_SEARCH_TOKEN) == [99]
+    assert index.find_tmdbids("zendaya", NAME_SEARCH_PREFIX) == [99]
+    # Tokens added after load() stay sorted, so ranges around them still work
+    assert index.find_tmdbids("tom", NAME_SEARCH_TOKEN) == [13, 862, 1422]
+
+
+def test_crew_index_filters_by_job():
+    index = PersonNameIndex(with_job=True)
+    index.load([
+        {"tmdbID": 1, "name": "Greta Gerwig", "job": "Director"},
+        {"tmdbID": 2, "name": "Greta Gerwig", "job": "Screenplay"},
+    ])
+    assert len(index) == 2
+    assert index.find_tmdbids("gerwig", NAME_SEARCH_TOKEN) == [1, 2]
+    assert index.find_tmdbids("gerwig", NAME_SEARCH_TOKEN, job="Director") == [1]
+    index.remove(1, "Greta Gerwig", "Director")
+    assert index.find_tmdbids("gerwig", NAME_SEARCH_TOKEN, job="Director") == []
+    assert index.find_tmdbids("gerwig", NAME_SEARCH_TOKEN) == [2]
+
+
+def test_load_replaces_previous_contents():
+    index = _cast_index()
+    index.load([{"tmdbID": 3, "name": "Tim Allen"}])
+    assert len(index) == 1
+    assert index.find_tmdbids("tom", NAME_SEARCH_TOKEN) == []
+    assert index.find_tmdbids("tim", NAME_SEARCH_TOKEN) == [3]
+
+
+def test_writes_during_a_load_are_replayed_from_the_journal(monkeypatch):
+    pytest.importorskip("pymongo")
+    from database.repositories.cast_crew_repository import CastCrewRepository
+    repo = CastCrewRepository()
+
+    def credits(kind):
+        # A write made through the repository while the load is streaming
+        repo._sync_index(kind, "add", 42, "Late Addition", "Director" if kind == "crew" else None)
+        return iter([{"tmdbID": 1, "name": "Early Credit", "job": "Director"}])
+
+    monkeypatch.setattr(repo, "_iter_index_credits", credits)
+    try:
+        assert repo.enable_name_index()
+        assert repo.cast_index.find_tmdbids("late", NAME_SEARCH_TOKEN) == [42]
+        assert repo.crew_index.find_tmdbids("late", NAME_SEARCH_TOKEN, job="Director") == [42]
+        assert repo.cast_index.find_tmdbids("early", NAME_SEARCH_TOKEN) == [1]
+        # After the load, writes go straight to the index
+        repo._sync_index("cast", "remove", 42, "Late Addition")
+        assert repo.cast_index.find_tmdbids("late", NAME_SEARCH_TOKEN) == []
+    finally:
+        repo.disable_name_index()
+
+
+def test_stale_index_falls_back_to_mongo_and_reloads(monkeypatch):
+    pytest.importorskip("pymongo")
+    from database.repositories.cast_crew_repository import CastCrewRepository
+    repo = CastCrewRepository()
+    reloads = []
+    monkeypatch.setattr(repo, "_iter_index_credits", lambda kind: iter([{"tmdbID": 1, "name": "Tom Hanks"}]))
+    monkeypatch.setattr(repo, "_reload_name_index", lambda: reloads.append(True))
+    try:
+        assert repo.enable_name_index()
+        assert repo._name_index("cast") is repo.cast_index
+        repo._index_loaded_at -= repo.name_index_max_age + 1
+        assert repo._name_index("cast") is None
+        assert repo._name_index("crew") is None  # One reload already pending
+        for thread in threading.enumerate():
+            if thread.name == "name-index-reloader":
+                thread.join(timeout=5)
+        assert reloads == [True]
+    finally:
+        repo._index_reloading = False
+        repo.disable_name_index()